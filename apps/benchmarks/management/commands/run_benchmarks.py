@@ -0,0 +1,102 @@
+import json
+import logging
+from dataclasses import asdict
+from functools import partial
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from apps.benchmarks.runner import METRICS, compare, load_baselines, measure, save_baselines
+from apps.benchmarks.scenarios import DATASETS, SCENARIOS, build_context, seed_dataset
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure views, services and repositories against seeded datasets in a separate test database, '
+        'and fail when a metric regresses past its baseline'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dataset', nargs='+', choices=tuple(DATASETS), default=['small'], help='Datasets to run')
+        parser.add_argument('--scenario', nargs='+', choices=tuple(SCENARIOS), help='Scenarios to run (default: all)')
+        parser.add_argument('--repeat', type=int, default=50, help='Timed runs per scenario')
+        parser.add_argument('--warmup', type=int, default=3, help='Untimed runs before measuring')
+        parser.add_argument(
+            '--threshold',
+            action='append',
+            default=[],
+            metavar='METRIC=RATIO',
+            help=f'Override an allowed growth ratio ({", ".join(METRICS)}), e.g. p95_ms=2',
+        )
+        parser.add_argument('--baselines', type=Path, default=settings.BENCHMARK_BASELINES_PATH, help='Baselines file')
+        parser.add_argument('--update-baselines', action='store_true', help='Store the results as the new baselines')
+        parser.add_argument('--output', type=Path, help='Also write the results to this JSON file')
+        parser.add_argument(
+            '--keepdb', action='store_true', help='Keep the test database and its datasets for the next run'
+        )
+
+    def handle(self, *args, **options):  # noqa: ARG002
+        thresholds = {**settings.BENCHMARK_THRESHOLDS, **self._parse_thresholds(options['threshold'])}
+        scenarios = options['scenario'] or list(SCENARIOS)
+
+        setup_test_environment()
+        # Thousands of runs would flood the output with the services' INFO lines
+        logging.disable(logging.INFO)
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=options['keepdb'])
+        try:
+            results = {
+                dataset: self._run_dataset(dataset, scenarios, options['repeat'], options['warmup'])
+                for dataset in options['dataset']
+            }
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=options['keepdb'])
+            logging.disable(logging.NOTSET)
+            teardown_test_environment()
+
+        if options['output']:
+            output = {dataset: {name: asdict(run) for name, run in runs.items()} for dataset, runs in results.items()}
+            with options['output'].open('w', encoding='utf-8') as file:
+                json.dump(output, file, indent=2)
+
+        if options['update_baselines']:
+            save_baselines(options['baselines'], results)
+            self.stdout.write(self.style.SUCCESS(f'Baselines written to {options["baselines"]}'))
+            return
+
+        regressions = compare(results, load_baselines(options['baselines']), thresholds)
+        for regression in regressions:
+            self.stderr.write(str(regression))
+        if regressions:
+            message = f'{len(regressions)} benchmark metric(s) regressed'
+            raise CommandError(message)
+        self.stdout.write(self.style.SUCCESS('All benchmarks are within their baselines'))
+
+    def _run_dataset(self, dataset: str, scenarios: list[str], repeat: int, warmup: int) -> dict:
+        if seed_dataset(dataset):
+            self.stdout.write(f'Seeded the {dataset} dataset')
+        context = build_context(dataset)
+
+        results = {}
+        self.stdout.write(f'{dataset:<8} {"scenario":<40} ' + ' '.join(f'{metric:>10}' for metric in METRICS))
+        for name in scenarios:
+            results[name] = measure(partial(SCENARIOS[name], context), repeat=repeat, warmup=warmup)
+            values = ' '.join(f'{getattr(results[name], metric):>10g}' for metric in METRICS)
+            self.stdout.write(f'{dataset:<8} {name:<40} {values}')
+        return results
+
+    def _parse_thresholds(self, values: list[str]) -> dict[str, float]:
+        thresholds = {}
+        for value in values:
+            metric, _, ratio = value.partition('=')
+            try:
+                thresholds[metric] = float(ratio)
+            except ValueError:
+                metric = None
+            if metric not in METRICS:
+                message = f'Invalid --threshold {value!r}, expected METRIC=RATIO for one of: {", ".join(METRICS)}'
+                raise CommandError(message)
+        return thresholds
@@ -0,0 +1,133 @@
+"""
+Measure benchmark scenarios and compare the results with stored baselines.
+
+Each scenario is timed over many untraced runs for its latency percentiles, and run once
+more under `tracemalloc` and a query capture for its query count, rows and peak memory,
+so the tracing overhead never leaks into the timings.
+"""
+import json
+import statistics
+import time
+import tracemalloc
+from collections.abc import Callable, Mapping
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+METRICS = ('p50_ms', 'p95_ms', 'queries', 'rows', 'peak_kib')
+
+
+@dataclass
+class Measurement:
+    p50_ms: float
+    p95_ms: float
+    queries: int
+    rows: int
+    peak_kib: float
+
+
+@dataclass
+class Regression:
+    dataset: str
+    scenario: str
+    metric: str
+    baseline: float
+    value: float
+    threshold: float
+
+    def __str__(self):
+        return (
+            f'{self.dataset}/{self.scenario}: {self.metric} {self.value:g} exceeds baseline '
+            f'{self.baseline:g} by more than x{self.threshold:g}'
+        )
+
+
+class RowCounter:
+    """`execute_wrapper` that sums the rows reported by the driver for `SELECT`s (Postgres reports them, SQLite not)."""
+
+    def __init__(self):
+        self.rows = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        result = execute(sql, params, many, context)
+        rowcount = context['cursor'].rowcount
+        if rowcount > 0 and sql.lstrip()[:6].upper() == 'SELECT':
+            self.rows += rowcount
+        return result
+
+
+def measure(run: Callable[[], Any], *, repeat: int, warmup: int = 3) -> Measurement:
+    """Measure `run`, which must leave the database in a state where it can run again."""
+    for _ in range(warmup):
+        run()
+
+    row_counter = RowCounter()
+    tracemalloc.start()
+    try:
+        with CaptureQueriesContext(connection) as queries, connection.execute_wrapper(row_counter):
+            run()
+        _, peak = tracemalloc.get_traced_memory()
+        # Count now: every request the client makes later clears `connection.queries`
+        query_count = len(queries)
+    finally:
+        tracemalloc.stop()
+
+    timings = []
+    for _ in range(max(repeat, 2)):
+        started = time.perf_counter()
+        run()
+        timings.append((time.perf_counter() - started) * 1000)
+    percentiles = statistics.quantiles(timings, n=100, method='inclusive')
+
+    return Measurement(
+        p50_ms=round(percentiles[49], 3),
+        p95_ms=round(percentiles[94], 3),
+        queries=query_count,
+        rows=row_counter.rows,
+        peak_kib=round(peak / 1024, 1),
+    )
+
+
+def compare(
+    results: Mapping[str, Mapping[str, Measurement]],
+    baselines: Mapping[str, Mapping[str, Mapping[str, float]]],
+    thresholds: Mapping[str, float],
+) -> list[Regression]:
+    """Get every metric that grew past `baseline * threshold`. Scenarios without a baseline are skipped."""
+    regressions = []
+    for dataset, scenarios in results.items():
+        for scenario, measurement in scenarios.items():
+            baseline = baselines.get(dataset, {}).get(scenario)
+            if baseline is None:
+                continue
+            for metric in METRICS:
+                if metric not in baseline or metric not in thresholds:
+                    continue
+                value = getattr(measurement, metric)
+                if value > baseline[metric] * thresholds[metric]:
+                    regressions.append(
+                        Regression(dataset, scenario, metric, baseline[metric], value, thresholds[metric])
+                    )
+    return regressions
+
+
+def load_baselines(path: Path) -> dict[str, dict[str, dict[str, float]]]:
+    if not path.exists():
+        return {}
+    with path.open(encoding='utf-8') as file:
+        return json.load(file)
+
+
+def save_baselines(path: Path, results: Mapping[str, Mapping[str, Measurement]]) -> None:
+    """Store `results` as the new baselines, keeping those of datasets and scenarios that were not run."""
+    baselines = load_baselines(path)
+    for dataset, scenarios in results.items():
+        baselines.setdefault(dataset, {}).update(
+            {scenario: asdict(measurement) for scenario, measurement in scenarios.items()}
+        )
+    with path.open('w', encoding='utf-8') as file:
+        json.dump(baselines, file, indent=2, sort_keys=True)
+        file.write('\n')
@@ -0,0 +1,120 @@
+"""
+Benchmark datasets and the scenarios measured against them.
+
+Datasets are generated by `seed_benchmark_data` under their own email prefix, so several
+sizes can live in one database. Scenarios act as the owner of the largest project, the
+worst case for every per-project query.
+"""
+from collections.abc import Callable
+from dataclasses import dataclass
+from io import StringIO
+from urllib.parse import urlencode
+
+from django.core.management import call_command
+from django.db.models import F
+from django.test import Client
+from django.urls import reverse
+
+from apps.accounts.models import User
+from apps.projects.models import Project
+from apps.projects.services import ProjectService
+from apps.tasks.dal import TaskRepository
+from apps.tasks.models import Task
+from apps.tasks.services import TaskService
+
+DATASET_SEED = 1
+DATASETS = {
+    'small': {'users': 10, 'projects_per_user': 5, 'tasks': 10_000},
+    'medium': {'users': 100, 'projects_per_user': 10, 'tasks': 1_000_000},
+    'large': {'users': 1000, 'projects_per_user': 10, 'tasks': 10_000_000},
+}
+
+
+@dataclass
+class BenchmarkContext:
+    user: User
+    client: Client
+    project_id: int
+    task_id: int
+
+
+def email_prefix(dataset: str) -> str:
+    return f'bench-{dataset}-'
+
+
+def seed_dataset(dataset: str, **overrides: int) -> bool:
+    """Generate `dataset` unless it already exists. Returns whether it was generated."""
+    prefix = email_prefix(dataset)
+    if User.objects.filter(email__startswith=prefix).exists():
+        return False
+
+    options = {**DATASETS[dataset], **overrides}
+    call_command('seed_benchmark_data', seed=DATASET_SEED, email_prefix=prefix, stdout=StringIO(), **options)
+    return True
+
+
+def build_context(dataset: str) -> BenchmarkContext:
+    project = (
+        Project.objects.filter(user__email__startswith=email_prefix(dataset))
+        .select_related('user')
+        .order_by((F('open_count') + F('done_count')).desc(), 'id')
+        .first()
+    )
+    task = Task.objects.filter(project=project).order_by(*Task.SORTED_ORDERING).first()
+
+    client = Client()
+    client.force_login(project.user)
+    return BenchmarkContext(user=project.user, client=client, project_id=project.id, task_id=task.id)
+
+
+def project_list_view(context: BenchmarkContext) -> None:
+    context.client.get(reverse('projects:list'))
+
+
+def task_toggle_view(context: BenchmarkContext) -> None:
+    # Toggling twice per run leaves the task as it was, so every run does the same work
+    url = reverse('tasks:toggle', args=[context.task_id])
+    context.client.post(url, {'render': 'row'})
+    context.client.post(url, {'render': 'row'})
+
+
+def task_patch_view(context: BenchmarkContext) -> None:
+    context.client.patch(
+        reverse('tasks:resource', args=[context.task_id]),
+        urlencode({'name': 'Benchmark task', 'priority': Task.Priority.HIGH, 'render': 'row'}),
+        content_type='application/x-www-form-urlencoded',
+    )
+
+
+def project_service_dashboard_page(context: BenchmarkContext) -> None:
+    ProjectService().get_dashboard_page(context.user)
+
+
+def project_service_count_user_projects(context: BenchmarkContext) -> None:
+    ProjectService().count_user_projects(context.user)
+
+
+def task_service_project_tasks_page(context: BenchmarkContext) -> None:
+    TaskService().get_project_tasks_page(context.user, context.project_id)
+
+
+def task_service_toggle_task_status(context: BenchmarkContext) -> None:
+    service = TaskService()
+    service.toggle_task_status(context.user, context.task_id)
+    service.toggle_task_status(context.user, context.task_id)
+
+
+def task_repository_open_tasks_by_priority(context: BenchmarkContext) -> None:
+    list(TaskRepository().get_by_status_and_user(Task.Status.IN_PROGRESS, context.user)[:50])
+
+
+SCENARIOS: dict[str, Callable[[BenchmarkContext], None]] = {
+    'project_list_view': project_list_view,
+    'task_toggle_view': task_toggle_view,
+    'task_patch_view': task_patch_view,
+    'project_service_dashboard_page': project_service_dashboard_page,
+    'project_service_count_user_projects': project_service_count_user_projects,
+    'task_service_project_tasks_page': task_service_project_tasks_page,
+    'task_service_toggle_task_status': task_service_toggle_task_status,
+    'task_repository_open_tasks_by_priority': task_repository_open_tasks_by_priority,
+}
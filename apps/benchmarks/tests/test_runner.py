@@ -0,0 +1,63 @@
+import json
+from functools import partial
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from django.test import TestCase
+
+from apps.benchmarks.runner import Measurement, compare, load_baselines, measure, save_baselines
+from apps.benchmarks.scenarios import SCENARIOS, build_context, seed_dataset
+from apps.tasks.models import Task
+
+
+class BenchmarkRunnerTestCase(TestCase):
+    def test_measure_reports_queries_latency_and_memory(self):
+        def run():
+            list(Task.objects.all())
+            list(Task.objects.all())
+
+        result = measure(run, repeat=5, warmup=1)
+
+        self.assertEqual(result.queries, 2)
+        self.assertGreaterEqual(result.p95_ms, result.p50_ms)
+        self.assertGreater(result.peak_kib, 0)
+
+    def test_compare_flags_metrics_past_their_threshold(self):
+        results = {'small': {
+            'fast': Measurement(p50_ms=1.0, p95_ms=2.0, queries=3, rows=10, peak_kib=50.0),
+            'new': Measurement(p50_ms=1.0, p95_ms=2.0, queries=30, rows=10, peak_kib=50.0),
+        }}
+        baselines = {'small': {'fast': {'p50_ms': 0.9, 'p95_ms': 1.0, 'queries': 2, 'rows': 10, 'peak_kib': 50.0}}}
+        thresholds = {'p50_ms': 1.25, 'p95_ms': 1.5, 'queries': 1.0, 'rows': 1.1, 'peak_kib': 1.25}
+
+        regressions = compare(results, baselines, thresholds)
+
+        self.assertEqual([(r.scenario, r.metric) for r in regressions], [('fast', 'p95_ms'), ('fast', 'queries')])
+
+    def test_save_baselines_keeps_scenarios_that_were_not_run(self):
+        with TemporaryDirectory() as directory:
+            path = Path(directory) / 'baselines.json'
+            path.write_text(json.dumps({'small': {'old': {'queries': 1}}, 'large': {'old': {'queries': 9}}}))
+
+            save_baselines(path, {'small': {'new': Measurement(1.0, 2.0, 3, 4, 5.0)}})
+
+            baselines = load_baselines(path)
+        self.assertEqual(baselines['small']['old'], {'queries': 1})
+        self.assertEqual(baselines['small']['new']['queries'], 3)
+        self.assertEqual(baselines['large'], {'old': {'queries': 9}})
+
+    def test_scenarios_run_against_a_seeded_dataset(self):
+        self.assertTrue(seed_dataset('small', users=2, projects_per_user=2, tasks=200))
+        self.assertFalse(seed_dataset('small'))
+        context = build_context('small')
+        task = Task.objects.get(id=context.task_id)
+        status = task.status
+
+        for name, scenario in SCENARIOS.items():
+            with self.subTest(scenario=name):
+                result = measure(partial(scenario, context), repeat=2, warmup=0)
+                self.assertGreater(result.queries, 0)
+
+        # Write scenarios leave the task they touch as they found it
+        task.refresh_from_db()
+        self.assertEqual(task.status, status)
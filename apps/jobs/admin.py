@@ -0,0 +1,28 @@
+from django.contrib import admin
+
+from apps.jobs.models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    """Read-only view of the job queue."""
+
+    list_display = ['id', 'kind', 'status', 'priority', 'attempts', 'run_after', 'locked_by', 'finished_at']
+    list_filter = ['status', 'kind', 'created_at']
+    search_fields = ['kind', 'locked_by', 'last_error']
+    ordering = ['-id']
+    raw_id_fields = ['user']
+
+    fieldsets = (
+        (None, {'fields': ('kind', 'status', 'priority', 'user', 'payload', 'result')}),
+        ('Execution', {'fields': (
+            'attempts', 'max_attempts', 'run_after', 'locked_by', 'lease_expires_at', 'last_error',
+            'created_at', 'started_at', 'finished_at',
+        )}),
+    )
+
+    def has_add_permission(self, request):  # noqa: ARG002
+        return False
+
+    def has_change_permission(self, request, obj=None):  # noqa: ARG002
+        return False
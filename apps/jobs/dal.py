@@ -0,0 +1,120 @@
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Any
+
+from django.db import connection, transaction
+from django.db.models import F, Q
+
+from apps.jobs.models import Job
+from apps.utils.dal import BaseRepository
+from apps.utils.decorators import handle_dal_exceptions
+
+
+class JobRepository(BaseRepository):
+    CLAIM_ORDERING = ('-priority', 'run_after', 'id')
+
+    def __init__(self):
+        super().__init__(Job)
+
+    @handle_dal_exceptions
+    def claim_next(self, worker: str, now: datetime, lease_until: datetime, limits: Mapping[str, int]) -> Job | None:
+        """
+        Claim the next due job for `worker` until `lease_until`, highest priority first.
+
+        Rows locked by other workers are skipped rather than waited for (`SKIP LOCKED`), so
+        concurrent workers never block on each other. Kinds with a concurrency limit in
+        `limits` are claimed under a per-kind advisory lock, so two workers cannot both
+        take the last free slot. Returns `None` when nothing can be claimed.
+        """
+        with transaction.atomic():
+            saturated = {kind for kind, limit in limits.items() if self.count_running(kind) >= limit}
+            while True:
+                job = (
+                    self.filter_by(status=Job.Status.QUEUED, run_after__lte=now)
+                    .exclude(kind__in=saturated)
+                    .order_by(*self.CLAIM_ORDERING)
+                    .select_for_update(skip_locked=True)
+                    .first()
+                )
+                if job is None:
+                    return None
+                if job.kind not in limits:
+                    break
+                # Held until commit, by when this claim is visible to the next worker's count
+                self._lock_kind(job.kind)
+                if self.count_running(job.kind) < limits[job.kind]:
+                    break
+                saturated.add(job.kind)
+
+            return self.update(
+                job,
+                status=Job.Status.RUNNING,
+                attempts=job.attempts + 1,
+                locked_by=worker,
+                lease_expires_at=lease_until,
+                started_at=now,
+            )
+
+    def get_queued(self, kind: str, payload: dict[str, Any]) -> Job | None:
+        """Get the oldest job of `kind` with exactly `payload` that no worker has claimed yet."""
+        return self.filter_by(status=Job.Status.QUEUED, kind=kind, payload=payload).order_by('id').first()
+
+    def count_running(self, kind: str) -> int:
+        """Read from the partial index `idx_job_running`."""
+        return self.filter_by(status=Job.Status.RUNNING, kind=kind).count()
+
+    @handle_dal_exceptions(retry=True)
+    def finish(self, job: Job, worker: str, result: Any, now: datetime) -> bool:
+        """Mark `job` succeeded. Returns `False` if `worker` no longer holds it (its lease expired)."""
+        return self._release(job, worker, status=Job.Status.SUCCEEDED, result=result, finished_at=now)
+
+    @handle_dal_exceptions(retry=True)
+    def fail(self, job: Job, worker: str, error: str, now: datetime, retry_at: datetime | None) -> bool:
+        """Queue `job` again at `retry_at`, or mark it failed when `None`. Returns `False` if `worker` lost it."""
+        if retry_at is not None:
+            return self._release(job, worker, status=Job.Status.QUEUED, run_after=retry_at, last_error=error)
+        return self._release(job, worker, status=Job.Status.FAILED, last_error=error, finished_at=now)
+
+    @handle_dal_exceptions(retry=True)
+    def extend_lease(self, job: Job, worker: str, lease_until: datetime) -> bool:
+        """Hold `job` for `worker` until `lease_until`. Returns `False` if `worker` no longer holds it."""
+        claim = {'id': job.id, 'status': Job.Status.RUNNING, 'locked_by': worker, 'attempts': job.attempts}
+        return self.update_where(claim, lease_expires_at=lease_until) == 1
+
+    @handle_dal_exceptions(retry=True)
+    def requeue_expired(self, now: datetime) -> int:
+        """
+        Take back the jobs whose worker let its lease expire, e.g. because it died mid-job.
+
+        They are queued again, or failed once out of attempts. Returns how many were taken back.
+        """
+        expired = Q(status=Job.Status.RUNNING, lease_expires_at__lt=now)
+        released = {'locked_by': '', 'lease_expires_at': None, 'last_error': 'Worker lease expired'}
+        requeued = self.update_where(expired & Q(attempts__lt=F('max_attempts')), status=Job.Status.QUEUED, **released)
+        failed = self.update_where(expired, status=Job.Status.FAILED, finished_at=now, **released)
+        return requeued + failed
+
+    @handle_dal_exceptions(retry=True)
+    def delete_finished_before(self, before: datetime) -> int:
+        """Delete succeeded and failed jobs that finished before `before`. Returns how many."""
+        count, _ = self.filter_by(
+            status__in=[Job.Status.SUCCEEDED, Job.Status.FAILED], finished_at__lt=before
+        ).delete()
+        return count
+
+    def _release(self, job: Job, worker: str, **values: Any) -> bool:
+        # Compare-and-set on the claim, so a worker whose job was taken back cannot overwrite the new run
+        claim = {'id': job.id, 'status': Job.Status.RUNNING, 'locked_by': worker, 'attempts': job.attempts}
+        values.update(locked_by='', lease_expires_at=None)
+        if self.update_where(claim, **values) != 1:
+            return False
+        for name, value in values.items():
+            setattr(job, name, value)
+        return True
+
+    def _lock_kind(self, kind: str) -> None:
+        if connection.vendor != 'postgresql':
+            # SQLite serializes writers already
+            return
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_advisory_xact_lock(hashtext(%s))', [f'jobs:{kind}'])
@@ -0,0 +1,66 @@
+import logging
+import os
+import signal
+import socket
+import threading
+import time
+
+from django.conf import settings
+from django.core.management import BaseCommand
+from django.db import close_old_connections
+
+from apps.jobs.services import JobService
+from apps.utils.exceptions import DALError
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Run queued background jobs, polling until stopped (SIGINT/SIGTERM). Several workers can run at once.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Run the jobs that are due now and exit')
+        parser.add_argument(
+            '--interval', type=float, default=None, help='Seconds between polls when idle (default: JOB_POLL_SECONDS)'
+        )
+        parser.add_argument('--worker-id', default=None, help='Name recorded on claimed jobs (default: host:pid)')
+
+    def handle(self, *args, **options):  # noqa: ARG002
+        service = JobService()
+        interval = options['interval'] if options['interval'] is not None else settings.JOB_POLL_SECONDS
+        worker = options['worker_id'] or f'{socket.gethostname()}:{os.getpid()}'
+        stop = threading.Event()
+        if not options['once']:
+            # The job in progress is finished first
+            for signum in (signal.SIGINT, signal.SIGTERM):
+                signal.signal(signum, lambda *_: stop.set())
+
+        self.next_requeue = 0.0
+        while True:
+            # Long-running: honour CONN_MAX_AGE and drop broken connections between jobs
+            close_old_connections()
+            idle = False
+            try:
+                self.requeue_expired_when_due(service)
+                job = service.run_next(worker)
+                if job is None:
+                    service.purge_finished()
+                    idle = True
+            except DALError:
+                if options['once']:
+                    raise
+                logger.exception('Job worker pass failed, retrying in %s s', interval)
+                idle = True
+            else:
+                if job is not None:
+                    self.stdout.write(f'{job}')
+            if stop.is_set() or (idle and (options['once'] or stop.wait(interval))):
+                break
+
+        self.stdout.write(self.style.SUCCESS('Job worker stopped'))
+
+    def requeue_expired_when_due(self, service: JobService) -> None:
+        # On a timer rather than when idle, so a busy queue does not hold up the jobs of dead workers
+        if time.monotonic() >= self.next_requeue:
+            service.requeue_expired()
+            self.next_requeue = time.monotonic() + settings.JOB_REQUEUE_INTERVAL_SECONDS
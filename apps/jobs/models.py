@@ -0,0 +1,56 @@
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+
+
+class Job(models.Model):
+    """A unit of background work, run by `run_job_worker` with the handler registered for its `kind`."""
+
+    class Status(models.TextChoices):
+        QUEUED = 'queued', 'Queued'
+        RUNNING = 'running', 'Running'
+        SUCCEEDED = 'succeeded', 'Succeeded'
+        FAILED = 'failed', 'Failed'
+
+    # Handler name, e.g. 'projects.purge_deleted'; `payload` holds its keyword arguments
+    kind = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.QUEUED)
+    # Higher runs first
+    priority = models.SmallIntegerField(default=0)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=3)
+    # Not claimed before then: delayed jobs and retry backoff
+    run_after = models.DateTimeField(default=timezone.now)
+    # Claiming worker, and when its claim lapses so that another worker takes the job over
+    locked_by = models.CharField(max_length=100, blank=True)
+    lease_expires_at = models.DateTimeField(null=True, blank=True)
+    # Who may poll the job's status
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='jobs', null=True, blank=True
+    )
+    result = models.JSONField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'jobs_job'
+        indexes = [
+            # Claim order, over waiting jobs only
+            models.Index(
+                fields=['-priority', 'run_after', 'id'], name='idx_job_queued', condition=models.Q(status='queued')
+            ),
+            # Running jobs per kind (concurrency limits) and expired leases
+            models.Index(
+                fields=['kind', 'lease_expires_at'], name='idx_job_running', condition=models.Q(status='running')
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.kind} #{self.id} ({self.get_status_display()})'
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in {self.Status.SUCCEEDED, self.Status.FAILED}
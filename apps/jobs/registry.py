@@ -0,0 +1,32 @@
+"""Job handlers by kind. Apps register theirs in a `jobs` module, imported once the jobs app is ready."""
+from collections.abc import Callable
+from typing import Any
+
+_handlers: dict[str, Callable[..., Any]] = {}
+_labels: dict[str, str] = {}
+
+
+def register(kind: str, *, label: str = 'Working'):
+    """
+    Register the decorated function as the handler of `kind` jobs.
+
+    It is called with the job's payload as keyword arguments; whatever JSON-serializable
+    value it returns is stored as the job's result. Handlers may run more than once for
+    one job (retries, a worker dying mid-job), so they must be safe to repeat. `label`
+    is shown while the job's status is polled, e.g. 'Deleting project'.
+    """
+
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        _handlers[kind] = func
+        _labels[kind] = label
+        return func
+
+    return decorator
+
+
+def get_handler(kind: str) -> Callable[..., Any] | None:
+    return _handlers.get(kind)
+
+
+def get_label(kind: str) -> str:
+    return _labels.get(kind, 'Working')
@@ -0,0 +1,165 @@
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+from apps.jobs.dal import JobRepository
+from apps.jobs.models import Job
+from apps.jobs.registry import get_handler
+from apps.jobs.validators import JobValidator
+from apps.utils.exceptions import (
+    BusinessRuleError,
+    DALError,
+    ObjectNotFoundError,
+    PermissionDeniedError,
+    ValidationError,
+)
+
+logger = logging.getLogger(__name__)
+
+if TYPE_CHECKING:
+    from apps.accounts.models import User
+
+# Raised by handlers for input that will not get better on a second try
+PERMANENT_ERRORS = (ValidationError, PermissionDeniedError, BusinessRuleError, ObjectNotFoundError)
+
+
+class JobService:
+    """
+    Hand long operations off to `run_job_worker` and follow them to completion.
+
+    Jobs are queued in the database, so one queued inside a transaction only becomes
+    visible to workers when it commits, and disappears if it rolls back. Failed runs are
+    retried with exponential backoff up to the job's `max_attempts`; `JOB_CONCURRENCY_LIMITS`
+    caps how many jobs of a kind run at once across all workers.
+    """
+
+    def __init__(self, job_dal=None, validator=None):
+        self.job_dal = job_dal or JobRepository()
+        self.validator = validator or JobValidator()
+
+    def enqueue(
+        self,
+        kind: str,
+        payload: dict[str, Any] | None = None,
+        *,
+        user: 'User | None' = None,
+        priority: int = 0,
+        max_attempts: int | None = None,
+        delay: timedelta | None = None,
+    ) -> Job:
+        """Queue a `kind` job, run with `payload` as keyword arguments. `user` may poll its status."""
+        self.validator.validate_kind(kind, get_handler(kind))
+        job = self.job_dal.create(
+            kind=kind,
+            payload=payload or {},
+            user=user,
+            priority=priority,
+            max_attempts=max_attempts or settings.JOB_MAX_ATTEMPTS,
+            run_after=timezone.now() + (delay or timedelta()),
+        )
+        logger.info('Job queued: %s %s', kind, job.id)
+        return job
+
+    def enqueue_once(self, kind: str, payload: dict[str, Any] | None = None, **options: Any) -> Job:
+        """
+        `enqueue`, unless a job of the same kind and payload is still waiting to run: that one is returned.
+
+        For repairs that may be asked for again and again before a worker gets to them.
+        """
+        queued = self.job_dal.get_queued(kind, payload or {})
+        if queued is not None:
+            return queued
+        return self.enqueue(kind, payload, **options)
+
+    def get_user_job(self, user: 'User', job_id: int) -> Job:
+        job = self.job_dal.get_by_id(job_id)
+        self.validator.validate_access_job(user, job)
+        return job
+
+    async def aget_user_job(self, user: 'User', job_id: int) -> Job:
+        """Async `get_user_job`, for status polling."""
+        job = await self.job_dal.aget_by_id(job_id)
+        self.validator.validate_access_job(user, job)
+        return job
+
+    def requeue_expired(self) -> int:
+        """Take back the jobs of workers that stopped without finishing them."""
+        count = self.job_dal.requeue_expired(timezone.now())
+        if count:
+            logger.warning('Took back %s jobs with an expired lease', count)
+        return count
+
+    def purge_finished(self) -> int:
+        """Delete finished jobs older than `JOB_RETENTION_HOURS`."""
+        return self.job_dal.delete_finished_before(timezone.now() - timedelta(hours=settings.JOB_RETENTION_HOURS))
+
+    def run_next(self, worker: str) -> Job | None:
+        """Claim and run the next due job as `worker`. Returns it, or `None` when none is due."""
+        now = timezone.now()
+        lease_until = now + timedelta(seconds=settings.JOB_LEASE_SECONDS)
+        job = self.job_dal.claim_next(worker, now, lease_until, settings.JOB_CONCURRENCY_LIMITS)
+        if job is None:
+            return None
+
+        logger.info('Job started: %s %s (attempt %s of %s)', job.kind, job.id, job.attempts, job.max_attempts)
+        try:
+            handler = get_handler(job.kind)
+            self.validator.validate_kind(job.kind, handler)
+            with self._lease_heartbeat(job, worker):
+                result = handler(**job.payload)
+        except Exception as error:  # noqa: BLE001 - any handler failure is recorded on the job
+            self._fail(job, worker, error)
+        else:
+            if self.job_dal.finish(job, worker, result, timezone.now()):
+                logger.info('Job succeeded: %s %s', job.kind, job.id)
+            else:
+                logger.warning('Job %s %s finished after its lease expired', job.kind, job.id)
+        return job
+
+    def _fail(self, job: Job, worker: str, error: Exception) -> None:
+        retry_at = None
+        if job.attempts < job.max_attempts and not isinstance(error, PERMANENT_ERRORS):
+            delay = settings.JOB_RETRY_BASE_DELAY_SECONDS * 2 ** (job.attempts - 1)
+            retry_at = timezone.now() + timedelta(seconds=delay)
+
+        if not self.job_dal.fail(job, worker, f'{type(error).__name__}: {error}', timezone.now(), retry_at):
+            logger.warning('Job %s %s failed after its lease expired', job.kind, job.id)
+        elif retry_at is not None:
+            logger.warning('Job %s %s failed, retrying at %s', job.kind, job.id, retry_at, exc_info=error)
+        else:
+            logger.error('Job %s %s failed', job.kind, job.id, exc_info=error)
+
+    @contextmanager
+    def _lease_heartbeat(self, job: Job, worker: str):
+        """Extend the lease of `job` from a background thread while the block runs."""
+        stop = threading.Event()
+        thread = threading.Thread(
+            target=self._extend_lease, args=(job, worker, stop), name=f'job-{job.id}-lease', daemon=True
+        )
+        thread.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            thread.join()
+
+    def _extend_lease(self, job: Job, worker: str, stop: threading.Event) -> None:
+        interval = settings.JOB_LEASE_SECONDS / 3
+        try:
+            while not stop.wait(interval):
+                lease_until = timezone.now() + timedelta(seconds=settings.JOB_LEASE_SECONDS)
+                try:
+                    if not self.job_dal.extend_lease(job, worker, lease_until):
+                        logger.warning('Job %s %s lost its lease while running', job.kind, job.id)
+                        return
+                except DALError:
+                    logger.warning('Could not extend the lease of job %s %s', job.kind, job.id, exc_info=True)
+        finally:
+            # The thread's own connection
+            connection.close()
@@ -0,0 +1,47 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.accounts.tests.factories import UserFactory
+from apps.jobs.models import Job
+from apps.jobs.services import JobService
+from apps.projects.models import Project
+from apps.tasks.models import Task
+
+
+class RunJobWorkerManageCommandTestCase(TestCase):
+    def test_once_runs_queued_jobs_and_exits(self):
+        user = UserFactory()
+        project = Project.objects.create(name='Old', user=user, deleted_at=timezone.now() - timedelta(days=10))
+        Task.objects.create(name='First', project=project)
+        Task.objects.create(name='Second', project=project)
+        job = JobService().enqueue('projects.purge_deleted', user=user)
+
+        out = StringIO()
+        call_command('run_job_worker', once=True, worker_id='worker-1', stdout=out)
+
+        self.assertIn(f'projects.purge_deleted #{job.id} (Succeeded)', out.getvalue())
+        self.assertIn('Job worker stopped', out.getvalue())
+        self.assertFalse(Project.objects.filter(id=project.id).exists())
+        self.assertFalse(Task.objects.filter(project_id=project.id).exists())
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.SUCCEEDED)
+        self.assertEqual(job.result, {'projects': 1, 'tasks': 0})
+
+    def test_takes_back_expired_jobs_while_the_queue_is_busy(self):
+        queued = JobService().enqueue('projects.purge_deleted')
+        expired = JobService().enqueue('projects.purge_deleted', priority=10)
+        lease_expires_at = timezone.now() - timedelta(minutes=1)
+        Job.objects.filter(id=expired.id).update(
+            status=Job.Status.RUNNING, attempts=1, locked_by='dead', lease_expires_at=lease_expires_at
+        )
+
+        out = StringIO()
+        call_command('run_job_worker', once=True, worker_id='worker-1', stdout=out)
+
+        # Taken back before the queued job ran, and run first for its priority
+        lines = out.getvalue().splitlines()
+        self.assertEqual(lines[:2], [f'projects.purge_deleted #{job.id} (Succeeded)' for job in (expired, queued)])
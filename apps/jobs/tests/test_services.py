@@ -0,0 +1,146 @@
+import time
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.test import TestCase
+from django.test import override_settings
+from django.utils import timezone
+
+from apps.accounts.tests.factories import UserFactory
+from apps.jobs.models import Job
+from apps.jobs.registry import register
+from apps.jobs.services import JobService
+from apps.utils.exceptions import ObjectNotFoundError, PermissionDeniedError, ValidationError
+
+calls = []
+
+
+@register('tests.record')
+def record(value: int) -> dict:
+    calls.append(value)
+    return {'value': value}
+
+
+@register('tests.flaky')
+def flaky() -> None:
+    message = 'flaky'
+    raise RuntimeError(message)
+
+
+@register('tests.slow')
+def slow() -> None:
+    time.sleep(0.2)
+
+
+@register('tests.missing')
+def missing() -> None:
+    model_name = 'Project'
+    raise ObjectNotFoundError(model_name, 1)
+
+
+@override_settings(JOB_RETRY_BASE_DELAY_SECONDS=10, JOB_CONCURRENCY_LIMITS={}, JOB_MAX_ATTEMPTS=3)
+class JobServiceTest(TestCase):
+    def setUp(self):
+        calls.clear()
+        self.service = JobService()
+
+    def test_runs_jobs_by_priority_then_age(self):
+        low = self.service.enqueue('tests.record', {'value': 1})
+        high = self.service.enqueue('tests.record', {'value': 2}, priority=5)
+        delayed = self.service.enqueue('tests.record', {'value': 3}, priority=9, delay=timedelta(hours=1))
+
+        self.assertEqual(self.service.run_next('worker-1').id, high.id)
+        self.assertEqual(self.service.run_next('worker-1').id, low.id)
+        self.assertIsNone(self.service.run_next('worker-1'))
+
+        self.assertEqual(calls, [2, 1])
+        high.refresh_from_db()
+        self.assertEqual(high.status, Job.Status.SUCCEEDED)
+        self.assertEqual(high.result, {'value': 2})
+        self.assertEqual((high.attempts, high.locked_by), (1, ''))
+        delayed.refresh_from_db()
+        self.assertEqual(delayed.status, Job.Status.QUEUED)
+
+    def test_unique_jobs_are_queued_once(self):
+        job = self.service.enqueue_once('tests.record', {'value': 1})
+
+        self.assertEqual(self.service.enqueue_once('tests.record', {'value': 1}).id, job.id)
+        self.assertNotEqual(self.service.enqueue_once('tests.record', {'value': 2}).id, job.id)
+        self.service.run_next('worker-1')
+        self.assertNotEqual(self.service.enqueue_once('tests.record', {'value': 1}).id, job.id)
+
+    def test_rejects_unknown_kinds(self):
+        with self.assertRaises(ValidationError):
+            self.service.enqueue('tests.unknown')
+
+    def test_retries_with_backoff_until_out_of_attempts(self):
+        job = self.service.enqueue('tests.flaky', max_attempts=2)
+
+        self.service.run_next('worker-1')
+
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.Status.QUEUED, 1))
+        self.assertIn('RuntimeError: flaky', job.last_error)
+        self.assertGreater(job.run_after, timezone.now() + timedelta(seconds=5))
+
+        Job.objects.filter(id=job.id).update(run_after=timezone.now())
+        self.service.run_next('worker-1')
+
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.Status.FAILED, 2))
+        self.assertIsNotNone(job.finished_at)
+
+    def test_does_not_retry_domain_errors(self):
+        job = self.service.enqueue('tests.missing')
+
+        self.service.run_next('worker-1')
+
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.Status.FAILED, 1))
+
+    def test_concurrency_limits_skip_saturated_kinds(self):
+        running = self.service.enqueue('tests.record', {'value': 1}, priority=5)
+        Job.objects.filter(id=running.id).update(status=Job.Status.RUNNING, locked_by='worker-2')
+        self.service.enqueue('tests.record', {'value': 2}, priority=5)
+        other = self.service.enqueue('tests.flaky')
+
+        with override_settings(JOB_CONCURRENCY_LIMITS={'tests.record': 1}):
+            self.assertEqual(self.service.run_next('worker-1').id, other.id)
+            self.assertIsNone(self.service.run_next('worker-1'))
+
+        self.assertEqual(calls, [])
+
+    def test_takes_back_jobs_with_an_expired_lease(self):
+        retried = self.service.enqueue('tests.record', {'value': 1})
+        exhausted = self.service.enqueue('tests.record', {'value': 2}, max_attempts=1)
+        expired = timezone.now() - timedelta(minutes=1)
+        Job.objects.update(status=Job.Status.RUNNING, attempts=1, locked_by='dead', lease_expires_at=expired)
+
+        self.assertEqual(self.service.requeue_expired(), 2)
+
+        retried.refresh_from_db()
+        self.assertEqual((retried.status, retried.locked_by), (Job.Status.QUEUED, ''))
+        exhausted.refresh_from_db()
+        self.assertEqual(exhausted.status, Job.Status.FAILED)
+        # The dead worker can no longer record an outcome
+        self.assertFalse(self.service.job_dal.finish(retried, 'dead', None, timezone.now()))
+
+    @override_settings(JOB_LEASE_SECONDS=0.06)
+    def test_extends_the_lease_while_the_handler_runs(self):
+        job = self.service.enqueue('tests.slow')
+
+        with patch.object(self.service.job_dal, 'extend_lease', return_value=True) as extend_lease:
+            self.service.run_next('worker-1')
+
+        self.assertGreaterEqual(extend_lease.call_count, 2)
+        self.assertEqual(extend_lease.call_args.args[:2], (job, 'worker-1'))
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.SUCCEEDED)
+
+    def test_only_the_owner_can_read_a_job(self):
+        user = UserFactory()
+        job = self.service.enqueue('tests.record', {'value': 1}, user=user)
+
+        self.assertEqual(self.service.get_user_job(user, job.id), job)
+        with self.assertRaises(PermissionDeniedError):
+            self.service.get_user_job(UserFactory(), job.id)
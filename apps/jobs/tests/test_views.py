@@ -0,0 +1,42 @@
+from django.test import TestCase
+from django.test import override_settings
+from django.urls import reverse
+
+from apps.accounts.tests.factories import UserFactory
+from apps.jobs.models import Job
+
+
+@override_settings(JOB_STATUS_POLL_SECONDS=3)
+class JobStatusViewTest(TestCase):
+    def setUp(self):
+        self.user = UserFactory()
+        self.client.force_login(self.user)
+
+    def test_pending_jobs_are_polled(self):
+        job = Job.objects.create(kind='projects.purge_deleted', user=self.user)
+
+        response = self.client.get(reverse('jobs:status', args=[job.id]), HTTP_HX_REQUEST='true')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, reverse('jobs:status', args=[job.id]))
+        self.assertContains(response, 'every 3s')
+        self.assertContains(response, 'Purging deleted items')
+
+    def test_finished_jobs_stop_polling(self):
+        job = Job.objects.create(kind='projects.purge_deleted', user=self.user, status=Job.Status.SUCCEEDED)
+        failed = Job.objects.create(kind='projects.purge_deleted', user=self.user, status=Job.Status.FAILED)
+
+        response = self.client.get(reverse('jobs:status', args=[job.id]))
+        self.assertEqual(response.status_code, 286)
+        self.assertEqual(response.content.strip(), b'')
+
+        response = self.client.get(reverse('jobs:status', args=[failed.id]))
+        self.assertEqual(response.status_code, 286)
+        self.assertContains(response, 'Purging deleted items failed', status_code=286)
+
+    def test_other_users_jobs_are_forbidden(self):
+        job = Job.objects.create(kind='projects.purge_deleted', user=UserFactory())
+
+        response = self.client.get(reverse('jobs:status', args=[job.id]), HTTP_HX_REQUEST='true')
+
+        self.assertEqual(response.status_code, 403)
@@ -0,0 +1,9 @@
+from django.urls import path
+
+from apps.jobs import views
+
+app_name = 'jobs'
+
+urlpatterns = [
+    path('<int:job_id>/', views.JobStatusView.as_view(), name='status'),
+]
@@ -0,0 +1,23 @@
+from typing import TYPE_CHECKING
+
+from apps.utils.exceptions import PermissionDeniedError, ValidationError
+
+if TYPE_CHECKING:
+    from apps.accounts.models import User
+    from apps.jobs.models import Job
+
+
+class JobValidator:
+    """Handles job validation and access rules."""
+
+    def validate_kind(self, kind: str, handler):
+        if handler is None:
+            field = 'kind'
+            message = f'No handler registered for job kind "{kind}"'
+            raise ValidationError(field, message)
+
+    def validate_access_job(self, user: 'User', job: 'Job'):
+        # Compare ids, so the check never loads the owner
+        if job.user_id != user.id:
+            message = 'You can only access your own jobs'
+            raise PermissionDeniedError(message)
@@ -0,0 +1,32 @@
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse
+from django.shortcuts import render
+from django.views import View
+
+from apps.jobs.models import Job
+from apps.jobs.registry import get_label
+from apps.jobs.services import JobService
+from apps.utils.mixins import AsyncLoginRequiredMixin
+
+# Tells HTMX to stop polling
+HTMX_STOP_POLLING = 286
+
+
+def render_job_status(request: HttpRequest, job: Job) -> HttpResponse:
+    """
+    Render the status of `job` as an HTMX fragment that polls itself until the job is finished.
+
+    A succeeded job renders nothing, so the fragment disappears; a failed one leaves an error.
+    """
+    return render(
+        request,
+        'partials/job_status.html',
+        {'job': job, 'label': get_label(job.kind), 'poll_seconds': settings.JOB_STATUS_POLL_SECONDS},
+        status=HTMX_STOP_POLLING if job.is_finished else 200,
+    )
+
+
+class JobStatusView(AsyncLoginRequiredMixin, View):
+    async def get(self, request: HttpRequest, job_id: int) -> HttpResponse:
+        job = await JobService().aget_user_job(request.user, job_id)
+        return render_job_status(request, job)
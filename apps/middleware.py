@@ -1,14 +1,25 @@
 import logging
+import time
+from collections import Counter
+from contextlib import ExitStack
+from contextvars import ContextVar
 from http import HTTPStatus
 
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
 from django.http import HttpResponse, JsonResponse
+from django.template.backends.django import Template
+from django.utils.deprecation import MiddlewareMixin
 
+from apps.utils.db_router import RoutingState, routing_state
 from apps.utils.exceptions import BusinessRuleError, PermissionDeniedError, ValidationError
 
 logger = logging.getLogger(__name__)
 
 
-class ExceptionHandlerMiddleware:
+class ExceptionHandlerMiddleware(MiddlewareMixin):
     """
     Centralized exception handling middleware.
 
@@ -16,12 +27,7 @@ class ExceptionHandlerMiddleware:
     Views should not handle these exceptions - let them bubble up here.
     """
 
-    def __init__(self, get_response):
-        self.get_response = get_response
-
-    def __call__(self, request):
-        response = self.get_response(request)
-
+    def process_response(self, request, response):
         if (HTTPStatus.OK <= response.status_code < HTTPStatus.MULTIPLE_CHOICES
             and request.method in ['POST', 'PUT', 'PATCH', 'DELETE']):
             logger.info('%s %s -> %s', request.method, request.path, response.status_code)
@@ -59,19 +65,204 @@ class ExceptionHandlerMiddleware:
         return None
 
 
-class HTTPMethodOverrideMiddleware:
+class HTTPMethodOverrideMiddleware(MiddlewareMixin):
     """
     Middleware to support HTTP method override for HTMX requests.
     Allows PATCH and DELETE methods via POST with X-HTTP-Method-Override header.
     """
 
-    def __init__(self, get_response):
-        self.get_response = get_response
-
-    def __call__(self, request):
+    def process_request(self, request):
         if request.method == 'POST':
             method = request.META.get('HTTP_X_HTTP_METHOD_OVERRIDE', '').upper()
             if method in ['PUT', 'PATCH', 'DELETE']:
                 request.method = method
 
-        return self.get_response(request)
+
+class RequestProfile:
+    """SQL and template timings collected while one request is handled."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.sql_seconds = 0.0
+        self.template_seconds = 0.0
+        # Parametrized SQL -> executions: the same statement run many times is an N+1 pattern
+        self.statements = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_seconds += time.perf_counter() - started
+            self.queries += 1
+            self.statements[sql] += 1
+
+    def repeated_statements(self, threshold: int) -> list[tuple[str, int]]:
+        return [(sql, count) for sql, count in self.statements.most_common() if count >= threshold]
+
+
+_current_profile: ContextVar[RequestProfile | None] = ContextVar('request_profile', default=None)
+
+
+def _profiled_render(render):
+    # Wraps the backend template, which only views render: included templates go through
+    # `django.template.base.Template` directly, so nested renders are not counted twice
+    def wrapper(self, context=None, request=None):
+        profile = _current_profile.get()
+        if profile is None:
+            return render(self, context, request)
+        started = time.perf_counter()
+        try:
+            return render(self, context, request)
+        finally:
+            profile.template_seconds += time.perf_counter() - started
+
+    wrapper.profiled = True
+    return wrapper
+
+
+class RequestProfilingMiddleware:
+    """
+    Time SQL, template rendering and the rest of each request.
+
+    Adds a `Server-Timing` header (shown by browser dev tools), logs one line per request and
+    warns about statements repeated `REQUEST_PROFILING_DUPLICATE_THRESHOLD` times or more.
+    Disabled unless `REQUEST_PROFILING_ENABLED` is set, in which case Django drops it from the
+    middleware chain at startup and it costs nothing. Streamed response bodies are not timed.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.REQUEST_PROFILING_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+        if not getattr(Template.render, 'profiled', False):
+            Template.render = _profiled_render(Template.render)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        profile = RequestProfile()
+        token = _current_profile.set(profile)
+        try:
+            with ExitStack() as stack:
+                self._wrap_connections(stack, profile)
+                response = self.get_response(request)
+        finally:
+            _current_profile.reset(token)
+        return self._report(request, response, profile)
+
+    async def __acall__(self, request):
+        profile = RequestProfile()
+        token = _current_profile.set(profile)
+        stack = ExitStack()
+        try:
+            # Connections are per thread: wrap the ones of the thread the async ORM runs this request's queries in
+            await sync_to_async(self._wrap_connections)(stack, profile)
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+            _current_profile.reset(token)
+        return self._report(request, response, profile)
+
+    def _wrap_connections(self, stack: ExitStack, profile: RequestProfile) -> None:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(profile))
+
+    def _report(self, request, response, profile: RequestProfile):
+        total_ms = (time.perf_counter() - profile.started) * 1000
+        sql_ms = profile.sql_seconds * 1000
+        template_ms = profile.template_seconds * 1000
+        repeated = profile.repeated_statements(settings.REQUEST_PROFILING_DUPLICATE_THRESHOLD)
+
+        response['Server-Timing'] = ', '.join([
+            f'sql;dur={sql_ms:.1f};desc="{profile.queries} queries"',
+            f'template;dur={template_ms:.1f}',
+            f'python;dur={max(total_ms - sql_ms - template_ms, 0):.1f}',
+            f'total;dur={total_ms:.1f}',
+        ])
+        logger.info(
+            'profile method=%s path=%s status=%s total_ms=%.1f sql_ms=%.1f queries=%d template_ms=%.1f repeated=%d',
+            request.method,
+            request.path,
+            response.status_code,
+            total_ms,
+            sql_ms,
+            profile.queries,
+            template_ms,
+            len(repeated),
+        )
+        for sql, count in repeated:
+            logger.warning(
+                'Possible N+1: statement ran %d times in %s %s: %s', count, request.method, request.path, sql
+            )
+
+        return response
+
+
+class ReplicaStickinessMiddleware:
+    """
+    Keep a user's reads on the primary database for `REPLICA_STICKY_SECONDS` after they write.
+
+    Requests with unsafe methods read from the primary throughout. A request that writes sets
+    a cookie pinning the user's next requests to the primary until replicas have caught up,
+    so an HTMX refresh right after a change never shows stale data. Dropped from the
+    middleware chain when no replica is configured.
+    """
+
+    COOKIE_NAME = 'primary_until'
+    SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.DATABASE_REPLICAS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        state = self._routing_state(request)
+        token = routing_state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            routing_state.reset(token)
+        return self._stick(state, response)
+
+    async def __acall__(self, request):
+        # Copied into the threads the async ORM runs queries in, which record writes on the same state
+        state = self._routing_state(request)
+        token = routing_state.set(state)
+        try:
+            response = await self.get_response(request)
+        finally:
+            routing_state.reset(token)
+        return self._stick(state, response)
+
+    def _routing_state(self, request) -> RoutingState:
+        return RoutingState(pinned=request.method not in self.SAFE_METHODS or self._is_sticky(request))
+
+    def _stick(self, state: RoutingState, response):
+        if state.wrote:
+            seconds = settings.REPLICA_STICKY_SECONDS
+            response.set_cookie(
+                self.COOKIE_NAME, str(int(time.time()) + seconds), max_age=seconds, httponly=True, samesite='Lax'
+            )
+        return response
+
+    def _is_sticky(self, request) -> bool:
+        try:
+            return float(request.COOKIES.get(self.COOKIE_NAME, 0)) > time.time()
+        except ValueError:
+            return False
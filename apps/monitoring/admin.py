@@ -0,0 +1,24 @@
+from django.contrib import admin
+
+from apps.monitoring.models import SlowOperation
+
+
+@admin.register(SlowOperation)
+class SlowOperationAdmin(admin.ModelAdmin):
+    """Read-only view of the slow-operation buffer."""
+
+    list_display = ['created_at', 'kind', 'duration_ms', 'repository_call', 'call_site', 'request']
+    list_filter = ['kind', 'created_at']
+    search_fields = ['sql', 'repository_call', 'call_site', 'request']
+    ordering = ['-id']
+
+    fieldsets = (
+        (None, {'fields': ('kind', 'duration_ms', 'request', 'repository_call', 'call_site', 'created_at')}),
+        ('Statement', {'fields': ('sql', 'params', 'explain')}),
+    )
+
+    def has_add_permission(self, request):  # noqa: ARG002
+        return False
+
+    def has_change_permission(self, request, obj=None):  # noqa: ARG002
+        return False
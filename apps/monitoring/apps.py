@@ -0,0 +1,19 @@
+from django.apps import AppConfig
+from django.conf import settings
+from django.db.backends.signals import connection_created
+
+
+class MonitoringConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.monitoring'
+    label = 'monitoring'
+
+    def ready(self):
+        from apps.monitoring.recorder import attach_statement_recorder, record_slow_dal_call  # noqa: PLC0415
+        from apps.utils.decorators import slow_dal_call  # noqa: PLC0415
+
+        # Nothing is hooked in unless a threshold is configured
+        if settings.SLOW_QUERY_THRESHOLD_MS is not None:
+            connection_created.connect(attach_statement_recorder, dispatch_uid='monitoring.statement_recorder')
+        if settings.SLOW_DAL_CALL_THRESHOLD_MS is not None:
+            slow_dal_call.connect(record_slow_dal_call, dispatch_uid='monitoring.slow_dal_call')
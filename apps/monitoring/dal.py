@@ -0,0 +1,21 @@
+from apps.monitoring.models import SlowOperation
+from apps.utils.dal import BaseRepository
+from apps.utils.decorators import handle_dal_exceptions
+
+
+class SlowOperationRepository(BaseRepository):
+    def __init__(self):
+        super().__init__(SlowOperation)
+
+    @handle_dal_exceptions
+    def record(self, buffer_size: int, **fields) -> SlowOperation:
+        """
+        Store a slow operation, dropping the records that fell out of the last `buffer_size` now and then.
+
+        Pruning runs on every tenth of `buffer_size` inserts rather than on each one, so concurrent
+        writers seldom delete the same rows; up to that many extra records may be kept meanwhile.
+        """
+        operation = self.model.objects.create(**fields)
+        if operation.id % max(buffer_size // 10, 1) == 0:
+            self.filter_by(id__lte=operation.id - buffer_size).delete()
+        return operation
@@ -0,0 +1,64 @@
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from apps.monitoring.models import SlowOperation
+from apps.monitoring.recorder import MAX_FIELD_LENGTH, current_request, record
+
+
+class SlowRequestMiddleware:
+    """
+    Record requests taking `SLOW_REQUEST_THRESHOLD_MS` or longer, and tag slow statements
+    and repository calls with the request they ran in.
+
+    Dropped from the middleware chain when no slow-operation threshold is configured.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        thresholds = (
+            settings.SLOW_QUERY_THRESHOLD_MS,
+            settings.SLOW_DAL_CALL_THRESHOLD_MS,
+            settings.SLOW_REQUEST_THRESHOLD_MS,
+        )
+        if all(threshold is None for threshold in thresholds):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        token = current_request.set(f'{request.method} {request.path}'[:MAX_FIELD_LENGTH])
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+            duration_ms = (time.perf_counter() - started) * 1000
+            if self._is_slow(duration_ms):
+                record(SlowOperation.Kind.REQUEST, duration_ms)
+        finally:
+            current_request.reset(token)
+        return response
+
+    async def __acall__(self, request):
+        token = current_request.set(f'{request.method} {request.path}'[:MAX_FIELD_LENGTH])
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+            duration_ms = (time.perf_counter() - started) * 1000
+            if self._is_slow(duration_ms):
+                # Recording writes to the database, which must not be done from the event loop
+                await sync_to_async(record)(SlowOperation.Kind.REQUEST, duration_ms)
+        finally:
+            current_request.reset(token)
+        return response
+
+    def _is_slow(self, duration_ms: float) -> bool:
+        threshold = settings.SLOW_REQUEST_THRESHOLD_MS
+        return threshold is not None and duration_ms >= threshold
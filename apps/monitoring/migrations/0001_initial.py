@@ -0,0 +1,33 @@
+# Generated by Django 5.2 on 2026-10-18 04:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SlowOperation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('statement', 'SQL statement'), ('repository', 'Repository call'), ('request', 'Request')], db_index=True, max_length=20)),
+                ('duration_ms', models.FloatField()),
+                ('sql', models.TextField(blank=True)),
+                ('params', models.TextField(blank=True)),
+                ('repository_call', models.CharField(blank=True, max_length=255)),
+                ('call_site', models.CharField(blank=True, max_length=255)),
+                ('request', models.CharField(blank=True, max_length=255)),
+                ('explain', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+            options={
+                'db_table': 'monitoring_slow_operation',
+                'ordering': ['-id'],
+            },
+        ),
+    ]
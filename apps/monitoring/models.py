@@ -0,0 +1,29 @@
+from django.db import models
+
+
+class SlowOperation(models.Model):
+    """A slow statement, repository call or request, kept in a bounded buffer (see `SLOW_QUERY_BUFFER_SIZE`)."""
+
+    class Kind(models.TextChoices):
+        STATEMENT = 'statement', 'SQL statement'
+        REPOSITORY = 'repository', 'Repository call'
+        REQUEST = 'request', 'Request'
+
+    kind = models.CharField(max_length=20, choices=Kind.choices, db_index=True)
+    duration_ms = models.FloatField()
+    sql = models.TextField(blank=True)
+    params = models.TextField(blank=True)
+    # Repository method running at the time, e.g. 'TaskRepository.lock_owned'
+    repository_call = models.CharField(max_length=255, blank=True)
+    # Innermost application frame, e.g. 'apps/tasks/dal.py:87 in lock_owned'
+    call_site = models.CharField(max_length=255, blank=True)
+    request = models.CharField(max_length=255, blank=True)
+    explain = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        db_table = 'monitoring_slow_operation'
+        ordering = ['-id']
+
+    def __str__(self):
+        return f'{self.get_kind_display()} {self.duration_ms:.0f} ms'
@@ -0,0 +1,126 @@
+"""
+Capture slow statements, repository calls and requests as `SlowOperation` records.
+
+Records are written once the open transaction commits, in autocommit, so the insert never
+holds locks in the caller's transaction nor makes concurrent slow requests wait for each
+other; one made inside a transaction that rolls back is lost with it. Outside a transaction
+the record is written at once, which needs a driver that has buffered the slow statement's
+rows by the time it returns, as the Postgres ones do; where it cannot (SQLite, for
+statements returning rows), the record is skipped with a warning. The recorder never
+records its own statements, nor the ones it runs for EXPLAIN.
+"""
+import logging
+import random
+import time
+import traceback
+from contextvars import ContextVar
+from functools import partial
+from pathlib import Path
+
+from django.conf import settings
+from django.db import DatabaseError, transaction
+
+from apps.monitoring.dal import SlowOperationRepository
+from apps.monitoring.models import SlowOperation
+from apps.utils.decorators import current_dal_call
+from apps.utils.exceptions import DALError
+
+logger = logging.getLogger(__name__)
+
+APPS_DIR = Path(__file__).resolve().parent.parent
+# Frames of the instrumentation itself are skipped when looking for the call site
+IGNORED_PATHS = (Path(__file__).resolve().parent, APPS_DIR / 'utils' / 'decorators.py', APPS_DIR / 'middleware.py')
+MAX_PARAMS_LENGTH = 2000
+MAX_FIELD_LENGTH = 255
+
+# Request being handled, e.g. 'GET /projects/', set by `SlowRequestMiddleware`
+current_request: ContextVar[str] = ContextVar('current_request', default='')
+_recording: ContextVar[bool] = ContextVar('slow_operation_recording', default=False)
+
+
+def record(kind: str, duration_ms: float, **fields: str) -> None:
+    """Store one slow operation, tagged with the current request, after commit. Failures are logged, never raised."""
+    if _recording.get():
+        return
+
+    fields = {'kind': kind, 'duration_ms': round(duration_ms, 3), 'request': current_request.get(), **fields}
+    transaction.on_commit(partial(_write, fields))
+
+
+def _write(fields: dict) -> None:
+    token = _recording.set(True)
+    try:
+        SlowOperationRepository().record(settings.SLOW_QUERY_BUFFER_SIZE, **fields)
+    except (DALError, DatabaseError):
+        logger.warning('Could not record a slow %s', fields['kind'], exc_info=True)
+    finally:
+        _recording.reset(token)
+
+
+def call_site() -> str:
+    """Get the innermost frame of application code, e.g. 'apps/tasks/dal.py:87 in lock_owned'."""
+    for frame in traceback.StackSummary.extract(traceback.walk_stack(None), lookup_lines=False):
+        path = Path(frame.filename)
+        if path.is_relative_to(APPS_DIR) and not any(path.is_relative_to(ignored) for ignored in IGNORED_PATHS):
+            return f'{path.relative_to(APPS_DIR.parent)}:{frame.lineno} in {frame.name}'[:MAX_FIELD_LENGTH]
+    return ''
+
+
+class StatementRecorder:
+    """`execute_wrapper` recording statements that take `SLOW_QUERY_THRESHOLD_MS` or longer."""
+
+    def __call__(self, execute, sql, params, many, context):
+        if _recording.get():
+            return execute(sql, params, many, context)
+
+        started = time.perf_counter()
+        result = execute(sql, params, many, context)
+        duration_ms = (time.perf_counter() - started) * 1000
+
+        threshold = settings.SLOW_QUERY_THRESHOLD_MS
+        if threshold is not None and duration_ms >= threshold:
+            token = _recording.set(True)
+            try:
+                plan = self.explain(context['connection'], sql, params, many=many)
+            finally:
+                _recording.reset(token)
+            record(
+                SlowOperation.Kind.STATEMENT,
+                duration_ms,
+                sql=sql,
+                params=repr(params)[:MAX_PARAMS_LENGTH] if params else '',
+                repository_call=current_dal_call.get() or '',
+                call_site=call_site(),
+                explain=plan,
+            )
+        return result
+
+    def explain(self, connection, sql: str, params, *, many: bool) -> str:
+        """Get the plan of a sampled share of slow statements. Only reads are re-run with ANALYZE."""
+        sample_rate = settings.SLOW_QUERY_EXPLAIN_SAMPLE_RATE
+        if many or connection.vendor != 'postgresql' or random.random() >= sample_rate:  # noqa: S311
+            return ''
+
+        options = '(ANALYZE, BUFFERS) ' if sql.lstrip()[:6].upper() == 'SELECT' else ''
+        try:
+            with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+                cursor.execute(f'EXPLAIN {options}{sql}', params)
+                return '\n'.join(row[0] for row in cursor.fetchall())
+        except DatabaseError:
+            logger.warning('Could not explain a slow statement', exc_info=True)
+            return ''
+
+
+statement_recorder = StatementRecorder()
+
+
+def attach_statement_recorder(sender, connection, **kwargs):  # noqa: ARG001
+    """`connection_created` receiver adding the recorder to every new database connection."""
+    if statement_recorder not in connection.execute_wrappers:
+        # Outermost, so `execute_wrapper()` blocks that pop their own wrapper on exit leave it in place
+        connection.execute_wrappers.insert(0, statement_recorder)
+
+
+def record_slow_dal_call(sender, name: str, duration_ms: float, **kwargs):  # noqa: ARG001
+    """`slow_dal_call` receiver."""
+    record(SlowOperation.Kind.REPOSITORY, duration_ms, repository_call=name, call_site=call_site())
@@ -0,0 +1,24 @@
+from django.db import connections
+
+from apps.utils import metrics
+
+
+class MonitoringService:
+    def get_database_stats(self) -> dict[str, dict]:
+        """Get each database alias's connection settings and, when pooled, its pool usage in this process."""
+        stats = {}
+        for connection in connections.all():
+            settings_dict = connection.settings_dict
+            pooled = bool(settings_dict.get('OPTIONS', {}).get('pool'))
+            stats[connection.alias] = {
+                'vendor': connection.vendor,
+                'conn_max_age': settings_dict['CONN_MAX_AGE'],
+                'conn_health_checks': settings_dict['CONN_HEALTH_CHECKS'],
+                'connected': connection.connection is not None,
+                # psycopg_pool counters: pool_size, pool_available, requests_waiting, requests_num, ...
+                'pool': connection.pool.get_stats() if pooled else None,
+            }
+        return stats
+
+    def get_metrics(self) -> list[dict]:
+        return metrics.snapshot()
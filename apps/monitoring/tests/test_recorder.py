@@ -0,0 +1,127 @@
+from unittest.mock import patch
+
+from asgiref.sync import iscoroutinefunction
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.test import TestCase
+from django.test import override_settings
+from django.urls import reverse
+
+from apps.monitoring.middleware import SlowRequestMiddleware
+from apps.monitoring.models import SlowOperation
+from apps.monitoring.recorder import StatementRecorder, current_request, record_slow_dal_call
+from apps.projects.dal import ProjectRepository
+from apps.projects.models import Project
+from apps.utils.decorators import slow_dal_call
+
+User = get_user_model()
+
+
+class SlowOperationRecorderTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='test@example.com', password='testpass123')
+
+    @override_settings(SLOW_QUERY_THRESHOLD_MS=0)
+    def test_records_slow_statements_with_their_repository_call(self):
+        project = Project.objects.create(name='Project A', user=self.user)
+
+        with self.captureOnCommitCallbacks() as callbacks, connection.execute_wrapper(StatementRecorder()):
+            ProjectRepository().adjust_counters(project.id, open_count=1)
+
+        # Written once the transaction commits, outside of it
+        self.assertFalse(SlowOperation.objects.exists())
+        for callback in callbacks:
+            callback()
+
+        # The counter update is recorded, the recorder's own writes are not
+        operation = SlowOperation.objects.get()
+        self.assertEqual(operation.kind, SlowOperation.Kind.STATEMENT)
+        self.assertIn('UPDATE', operation.sql)
+        self.assertIn(str(project.id), operation.params)
+        self.assertEqual(operation.repository_call, 'ProjectRepository.adjust_counters')
+        self.assertTrue(operation.call_site.startswith('apps/projects/dal.py:'))
+        self.assertEqual(operation.explain, '')
+
+    @override_settings(SLOW_QUERY_THRESHOLD_MS=1000)
+    def test_ignores_fast_statements(self):
+        project = Project.objects.create(name='Project A', user=self.user)
+
+        with connection.execute_wrapper(StatementRecorder()):
+            ProjectRepository().adjust_counters(project.id, open_count=1)
+
+        self.assertFalse(SlowOperation.objects.exists())
+
+    @override_settings(SLOW_QUERY_THRESHOLD_MS=0, SLOW_QUERY_BUFFER_SIZE=3)
+    def test_keeps_only_the_latest_records(self):
+        with self.captureOnCommitCallbacks(execute=True), connection.execute_wrapper(StatementRecorder()):
+            for index in range(5):
+                Project.objects.filter(user=self.user).update(name=f'Renamed {index}')
+
+        self.assertEqual(
+            [operation.params for operation in SlowOperation.objects.all()],
+            [f"('Renamed {index}', {self.user.id})" for index in (4, 3, 2)],
+        )
+
+    @override_settings(SLOW_QUERY_THRESHOLD_MS=0, SLOW_QUERY_BUFFER_SIZE=20)
+    def test_prunes_every_tenth_of_the_buffer(self):
+        with self.captureOnCommitCallbacks(execute=True), connection.execute_wrapper(StatementRecorder()):
+            for index in range(25):
+                Project.objects.filter(user=self.user).update(name=f'Renamed {index}')
+
+        operations = list(SlowOperation.objects.all())
+        self.assertLess(len(operations), 22)
+        self.assertEqual(operations[0].params, f"('Renamed 24', {self.user.id})")
+
+    @override_settings(SLOW_DAL_CALL_THRESHOLD_MS=0)
+    def test_records_slow_repository_calls(self):
+        slow_dal_call.connect(record_slow_dal_call)
+        self.addCleanup(slow_dal_call.disconnect, record_slow_dal_call)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ProjectRepository().create(name='Project A', user=self.user)
+
+        operation = SlowOperation.objects.get(kind=SlowOperation.Kind.REPOSITORY)
+        self.assertEqual(operation.repository_call, 'ProjectRepository.create')
+        self.assertEqual(operation.sql, '')
+
+    @override_settings(SLOW_REQUEST_THRESHOLD_MS=0)
+    def test_middleware_records_slow_requests(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = SlowRequestMiddleware(lambda _request: HttpResponse(''))(RequestFactory().get('/projects/'))
+
+        self.assertEqual(response.status_code, 200)
+        operation = SlowOperation.objects.get(kind=SlowOperation.Kind.REQUEST)
+        self.assertEqual(operation.request, 'GET /projects/')
+
+    @override_settings(SLOW_REQUEST_THRESHOLD_MS=0)
+    async def test_middleware_records_slow_async_requests(self):
+        async def view(_request):
+            return HttpResponse('')
+
+        # Run in a worker thread, which must still see the request's tag
+        def record(kind, _duration_ms):
+            requests.append((kind, current_request.get()))
+
+        middleware = SlowRequestMiddleware(view)
+        self.assertTrue(iscoroutinefunction(middleware))
+        requests = []
+        with patch('apps.monitoring.middleware.record', record):
+            response = await middleware(RequestFactory().get('/projects/'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(requests, [(SlowOperation.Kind.REQUEST, 'GET /projects/')])
+
+    def test_admin_lists_records_read_only(self):
+        SlowOperation.objects.create(kind=SlowOperation.Kind.REQUEST, duration_ms=1234.5, request='GET /')
+        admin = User.objects.create_superuser(email='admin@example.com', password='adminpass123')
+        admin.is_superuser = True
+        admin.save()
+        self.client.force_login(admin)
+
+        response = self.client.get(reverse('admin:monitoring_slowoperation_changelist'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'GET /')
+        self.assertNotContains(response, reverse('admin:monitoring_slowoperation_add'))
@@ -0,0 +1,44 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from apps.utils import metrics
+
+User = get_user_model()
+
+
+class DatabaseStatsViewTest(TestCase):
+    def setUp(self):
+        self.url = reverse('monitoring:database')
+        self.user = User.objects.create_user(email='test@example.com', password='testpass123')
+        metrics.reset()
+        self.addCleanup(metrics.reset)
+
+    def test_staff_get_connection_stats_and_metrics(self):
+        self.user.is_staff = True
+        self.user.save()
+        self.client.force_login(self.user)
+        metrics.increment('dal_retry_attempts_total', operation='TaskRepository.get_owned', reason='deadlock')
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        default = response.json()['databases']['default']
+        self.assertTrue(default['connected'])
+        self.assertIn('conn_max_age', default)
+        self.assertIsNone(default['pool'])
+        self.assertEqual(
+            response.json()['metrics'],
+            [{
+                'name': 'dal_retry_attempts_total',
+                'labels': {'operation': 'TaskRepository.get_owned', 'reason': 'deadlock'},
+                'value': 1,
+            }],
+        )
+
+    def test_other_users_are_refused(self):
+        self.client.force_login(self.user)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 403)
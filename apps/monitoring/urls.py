@@ -0,0 +1,9 @@
+from django.urls import path
+
+from apps.monitoring import views
+
+app_name = 'monitoring'
+
+urlpatterns = [
+    path('database/', views.DatabaseStatsView.as_view(), name='database'),
+]
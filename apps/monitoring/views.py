@@ -0,0 +1,23 @@
+from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
+from django.http import HttpRequest, JsonResponse
+from django.views import View
+
+from apps.monitoring.services import MonitoringService
+
+
+class BaseMonitoringView(LoginRequiredMixin, UserPassesTestMixin, View):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.service = MonitoringService()
+
+    def test_func(self) -> bool:
+        return self.request.user.is_staff
+
+
+class DatabaseStatsView(BaseMonitoringView):
+    def get(self, request: HttpRequest) -> JsonResponse:  # noqa: ARG002
+        """Connection and pool usage of the worker process that answers, plus its in-process metrics."""
+        return JsonResponse({
+            'databases': self.service.get_database_stats(),
+            'metrics': self.service.get_metrics(),
+        })
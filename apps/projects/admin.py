@@ -5,14 +5,15 @@ from apps.projects.models import Project
 
 @admin.register(Project)
 class ProjectAdmin(admin.ModelAdmin):
-    list_display = ['name', 'user', 'created_at', 'updated_at']
+    list_display = ['name', 'user', 'open_count', 'done_count', 'overdue_count', 'created_at', 'updated_at']
     list_filter = ['created_at', 'updated_at', 'user']
     search_fields = ['name', 'user__email']
-    readonly_fields = ['created_at', 'updated_at']
+    readonly_fields = ['open_count', 'done_count', 'overdue_count', 'overdue_as_of', 'created_at', 'updated_at']
     ordering = ['-created_at']
 
     fieldsets = (
         (None, {'fields': ('name', 'user')}),
+        ('Task counters', {'fields': ('open_count', 'done_count', 'overdue_count', 'overdue_as_of')}),
         (
             'Timestamps',
             {
@@ -1,34 +1,253 @@
+from collections.abc import Iterable, Mapping
+from datetime import datetime
 from typing import TYPE_CHECKING
 
 from django.apps import apps
-from django.db.models import Case, IntegerField, Prefetch, QuerySet, When
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import Case, Count, F, Prefetch, Q, QuerySet, Value, When
 
 from apps.projects.models import Project
 from apps.utils.dal import BaseRepository
+from apps.utils.decorators import handle_dal_exceptions
+from apps.utils.fragment_cache import FragmentCache
+from apps.utils.pagination import keyset_filter
+from apps.utils.search import SEARCH_ORDERING, search_by_name
 
 if TYPE_CHECKING:
     from apps.accounts.models import User
 
 
 class ProjectRepository(BaseRepository):
+    PAGE_ORDERING = ('-created_at', '-id')
+    COUNTER_FIELDS = ('open_count', 'done_count', 'overdue_count')
+    EXPORT_FIELDS = ('id', 'name', 'created_at', 'updated_at')
+
     def __init__(self):
         super().__init__(Project)
 
+    def get_queryset(self) -> QuerySet:
+        # Deleted projects are hidden from every read and write until restored or purged
+        return self.model.objects.live()
+
+    def invalidate_cache(self, instance: Project) -> None:
+        FragmentCache().bump_project_version(instance.id)
+
     def get_by_user(self, user: 'User') -> QuerySet:
         return self.filter_by(user=user)
 
+    def get_choices_by_user(self, user: 'User') -> QuerySet:
+        """Get `(id, name)` of every project of the user, by name, e.g. for a select."""
+        return self.filter_by(user=user).order_by('name', 'id').values_list('id', 'name')
+
     def get_by_user_with_tasks(self, user: 'User') -> QuerySet:
         """Get projects with tasks prefetched and sorted."""
         Task = apps.get_model('tasks', 'Task')
 
-        tasks_prefetch = Prefetch(
-            'tasks',
-            queryset=Task.objects.order_by(
-                Case(When(status='done', then=1), default=0, output_field=IntegerField()), '-priority', '-created_at'
-            ),
-        )
+        tasks_prefetch = Prefetch('tasks', queryset=Task.objects.live().order_by(*Task.SORTED_ORDERING))
 
         return self.filter_by(user=user).prefetch_related(tasks_prefetch).order_by('-created_at')
 
+    def get_page_by_user(self, user: 'User', after: list | None, limit: int, tasks_limit: int) -> QuerySet:
+        """
+        Get one keyset page of the user's projects, newest first.
+
+        Each project carries at most `tasks_limit` sorted tasks in `task_page`,
+        fetched with a single windowed prefetch query. Read from the primary, like
+        `get_by_id_with_task_page`: the page is rendered as cached project cards.
+        """
+        projects = self.filter_by(user=user).using(DEFAULT_DB_ALIAS)
+        if after is not None:
+            projects = projects.filter(keyset_filter(self.PAGE_ORDERING, after))
+
+        return self._with_task_page(projects, tasks_limit).order_by(*self.PAGE_ORDERING)[:limit]
+
+    @handle_dal_exceptions(retry=True)
+    def get_by_id_with_task_page(self, project_id: int, tasks_limit: int) -> Project:
+        """
+        Get a single project with the first `tasks_limit` sorted tasks in `task_page`.
+
+        Read from the primary: the card rendered from it is cached under the project's current
+        version, which a replica lagging behind the last write would fill with the old rows.
+        """
+        return self._with_task_page(self.get_all().using(DEFAULT_DB_ALIAS), tasks_limit).get(id=project_id)
+
+    @handle_dal_exceptions(retry=True)
+    async def aget_by_id_with_task_page(self, project_id: int, tasks_limit: int) -> Project:
+        """Async `get_by_id_with_task_page`."""
+        return await self._with_task_page(self.get_all().using(DEFAULT_DB_ALIAS), tasks_limit).aget(id=project_id)
+
+    def count_by_user(self, user: 'User') -> int:
+        return self.filter_by(user=user).count()
+
+    async def acount_by_user(self, user: 'User') -> int:
+        return await self.filter_by(user=user).acount()
+
+    def get_export_rows(self, user: 'User') -> QuerySet:
+        """Get the user's projects as plain dicts in primary key order, for streaming with `.iterator()`."""
+        return self.filter_by(user=user).order_by('id').values(*self.EXPORT_FIELDS)
+
     def get_by_name(self, name: str, user: 'User') -> QuerySet:
-        return self.filter_by(name__icontains=name, user=user)
+        """Get the user's projects matching `name`, most relevant first (see `apps.utils.search`)."""
+        return search_by_name(self.filter_by(user=user), name).order_by(*SEARCH_ORDERING)
+
+    def search_by_user(self, user: 'User', text: str, after: list | None, limit: int) -> QuerySet:
+        """Get one keyset page of the user's projects whose name matches `text`, annotated with `rank`."""
+        projects = search_by_name(self.filter_by(user=user), text).only('id', 'name')
+        if after is not None:
+            projects = projects.filter(keyset_filter(SEARCH_ORDERING, after))
+        return projects.order_by(*SEARCH_ORDERING)[:limit]
+
+    @handle_dal_exceptions
+    def adjust_counters(
+        self, project_id: int, overdue_deadlines: Mapping[datetime, int] | None = None, **deltas: int
+    ) -> None:
+        """
+        Atomically add `deltas` (e.g. `open_count=-1`) to a project's cached task counters.
+
+        `overdue_deadlines` maps the deadlines of active tasks added (positive) or removed
+        (negative) to how many; only those before the project's `overdue_as_of` move `overdue_count`.
+        """
+        changes = {field: F(field) + delta for field, delta in deltas.items() if delta}
+        counted = [
+            Case(When(overdue_as_of__gt=deadline, then=Value(weight)), default=Value(0))
+            for deadline, weight in (overdue_deadlines or {}).items()
+            if weight
+        ]
+        if counted:
+            changes['overdue_count'] = sum(counted, F('overdue_count'))
+        if changes:
+            self.filter_by(id=project_id).update(**changes)
+            FragmentCache().bump_project_version(project_id)
+
+    def get_counters_by_user(self, user: 'User', project_ids: Iterable[int]) -> QuerySet:
+        """Get the user's projects among `project_ids` with only their task counters loaded."""
+        return self.filter_by(id__in=project_ids, user=user).only('id', *self.COUNTER_FIELDS)
+
+    @handle_dal_exceptions(retry=True)
+    def reconcile_counters(self, after_id: int, batch_size: int, now: datetime) -> tuple[int | None, int]:
+        """
+        Recount the tasks of the next batch of projects above `after_id` and repair drifted counters.
+
+        The batch is locked while it is recounted, so concurrent counter adjustments
+        queue up behind it and apply on top of the corrected values.
+        Returns the last project id of the batch (`None` when done) and the number repaired.
+        """
+        Task = apps.get_model('tasks', 'Task')
+
+        with transaction.atomic():
+            projects = list(
+                self.filter_by(id__gt=after_id)
+                .order_by('id')
+                .select_for_update()
+                .values('id', *self.COUNTER_FIELDS)[:batch_size]
+            )
+            if not projects:
+                return None, 0
+
+            active = ~Q(status=Task.Status.DONE)
+            recounted = {
+                row['project_id']: row
+                for row in Task.objects.live().filter(project_id__in=[project['id'] for project in projects])
+                .values('project_id')
+                .annotate(
+                    open_count=Count('id', filter=active),
+                    done_count=Count('id', filter=Q(status=Task.Status.DONE)),
+                    overdue_count=Count('id', filter=active & Q(deadline__lt=now)),
+                )
+            }
+
+            repaired = 0
+            for project in projects:
+                counts = recounted.get(project['id'], dict.fromkeys(self.COUNTER_FIELDS, 0))
+                # Equal counts mean no active deadline fell between `overdue_as_of` and now, so it can stay
+                if any(project[field] != counts[field] for field in self.COUNTER_FIELDS):
+                    self.filter_by(id=project['id']).update(
+                        overdue_as_of=now, **{field: counts[field] for field in self.COUNTER_FIELDS}
+                    )
+                    FragmentCache().bump_project_version(project['id'])
+                    repaired += 1
+
+        return projects[-1]['id'], repaired
+
+    @handle_dal_exceptions(retry=True)
+    def tombstone(self, project: Project, now: datetime) -> None:
+        """Mark a project deleted, hiding it and its tasks at once with a single-row `UPDATE`."""
+        self.model.objects.filter(id=project.id).update(deleted_at=now)
+        project.deleted_at = now
+        self.invalidate_cache(project)
+
+    @handle_dal_exceptions(retry=True)
+    def restore_owned(self, user: 'User', project_id: int, deleted_since: datetime) -> Project | None:
+        """
+        Undo the deletion of one of the user's projects, if it was deleted at `deleted_since` or later.
+
+        Older deletions may already be under purge. Returns the project, or `None` if none matched.
+        """
+        restorable = self.model.objects.deleted().filter(id=project_id, user=user, deleted_at__gte=deleted_since)
+        if not restorable.update(deleted_at=None):
+            return None
+        project = self.get_by_id(project_id)
+        self.invalidate_cache(project)
+        return project
+
+    @handle_dal_exceptions(retry=True)
+    def get_deleted_before(self, before: datetime, after: list | None, limit: int) -> list[tuple]:
+        """Get the `(deleted_at, id)` keys of the next `limit` projects deleted before `before` (`idx_proj_deleted`)."""
+        projects = self.model.objects.deleted().filter(deleted_at__lt=before)
+        if after is not None:
+            projects = projects.filter(keyset_filter(('deleted_at', 'id'), after))
+        return list(projects.order_by('deleted_at', 'id').values_list('deleted_at', 'id')[:limit])
+
+    @handle_dal_exceptions(retry=True)
+    def delete_task_batch(
+        self, project_id: int, after: list | None, batch_size: int, *, deleted: bool = False
+    ) -> list | None:
+        """
+        Delete the next `batch_size` live tasks of a project after the sort key `after`, in one transaction.
+
+        Batches walk `idx_task_live_position` from the last deleted key, or with `deleted` the
+        project's deleted tasks along `idx_task_deleted`, so none rescans the index entries the
+        previous ones left behind, and Django's collector only ever loads one batch of tasks to
+        cascade to their reminders.
+        Returns the key of the last deleted task, or `None` once none is left after `after`.
+        """
+        Task = apps.get_model('tasks', 'Task')
+
+        # Only ever the tasks of a deleted project, whatever the caller passes
+        tasks = Task.objects.filter(project_id=project_id, project__deleted_at__isnull=False)
+        tasks, ordering = (tasks.deleted(), ('deleted_at', 'id')) if deleted else (tasks.live(), Task.SORTED_ORDERING)
+        if after is not None:
+            tasks = tasks.filter(keyset_filter(ordering, after))
+        with transaction.atomic():
+            keys = list(tasks.order_by(*ordering).values_list(*ordering)[:batch_size])
+            if not keys:
+                return None
+            Task.objects.filter(project_id=project_id, id__in=[key[-1] for key in keys]).delete()
+        return list(keys[-1])
+
+    @handle_dal_exceptions(retry=True)
+    def delete_tombstoned(self, project_id: int) -> bool:
+        """
+        Delete a deleted project once `delete_task_batch` has deleted its live and deleted tasks.
+
+        The project row is locked first, which holds off new tasks. Returns `False` if there
+        was no such project (already purged, or restored).
+        """
+        with transaction.atomic():
+            projects = self.model.objects.deleted().filter(id=project_id)
+            if not projects.select_for_update().exists():
+                return False
+            # No task is left to cascade to: the collector only checks
+            projects.delete()
+        return True
+
+    def _with_task_page(self, projects: QuerySet, tasks_limit: int) -> QuerySet:
+        Task = apps.get_model('tasks', 'Task')
+
+        tasks_prefetch = Prefetch(
+            'tasks',
+            # From the projects' database, not wherever the router would send a read of tasks
+            queryset=Task.objects.live().using(projects.db).order_by(*Task.SORTED_ORDERING)[:tasks_limit],
+            to_attr='task_page',
+        )
+        return projects.prefetch_related(tasks_prefetch)
@@ -0,0 +1,20 @@
+"""Background job handlers of the projects app, run by `run_job_worker`."""
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from apps.jobs.registry import register
+from apps.projects.services import ProjectService, PurgeService
+
+
+@register('projects.purge_deleted', label='Purging deleted items')
+def purge_deleted() -> dict[str, int]:
+    before = timezone.now() - timedelta(hours=settings.SOFT_DELETE_RETENTION_HOURS)
+    projects, tasks = PurgeService().purge_deleted(before)
+    return {'projects': projects, 'tasks': tasks}
+
+
+@register('projects.reconcile_counters', label='Reconciling project counters')
+def reconcile_counters(batch_size: int) -> dict[str, int]:
+    return {'repaired': ProjectService().reconcile_counters(batch_size)}
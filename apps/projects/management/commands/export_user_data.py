@@ -0,0 +1,38 @@
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.management import BaseCommand, CommandError
+
+from apps.projects.services import ExportService
+from apps.projects.validators import EXPORT_FORMATS
+from apps.utils.streaming import NDJSON
+
+
+class Command(BaseCommand):
+    help = "Stream a user's projects and tasks as NDJSON or CSV"
+
+    def add_arguments(self, parser):
+        parser.add_argument('email', help='Email of the user to export')
+        parser.add_argument('--format', choices=EXPORT_FORMATS, default=NDJSON, help='Output format')
+        parser.add_argument('--output', default='-', help='File to write, or - for stdout')
+
+    def handle(self, *args, **options):  # noqa: ARG002
+        user_class = get_user_model()
+        try:
+            user = user_class.objects.get(email=options['email'])
+        except user_class.DoesNotExist as error:
+            message = f'No user with email {options["email"]}'
+            raise CommandError(message) from error
+
+        lines = ExportService().export_user_data(user, options['format'])
+        if options['output'] == '-':
+            for line in lines:
+                self.stdout.write(line, ending='')
+            return
+
+        line_count = 0
+        with Path(options['output']).open('w', newline='', encoding='utf-8') as output:
+            for line in lines:
+                output.write(line)
+                line_count += 1
+        self.stdout.write(self.style.SUCCESS(f'Wrote {line_count} line(s) to {options["output"]}'))
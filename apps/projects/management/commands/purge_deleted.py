@@ -0,0 +1,37 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management import BaseCommand
+from django.utils import timezone
+
+from apps.jobs.services import JobService
+from apps.projects.services import PurgeService
+
+
+class Command(BaseCommand):
+    help = 'Delete for good the projects and tasks soft-deleted longer ago than the retention period'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--older-than-hours',
+            type=int,
+            default=None,
+            help='Purge rows deleted at least this long ago (default: SOFT_DELETE_RETENTION_HOURS)',
+        )
+        parser.add_argument('--pause', type=float, default=0, help='Seconds to sleep between batches')
+        parser.add_argument(
+            '--background', action='store_true', help='Queue the purge for `run_job_worker` and return at once'
+        )
+
+    def handle(self, *args, **options):  # noqa: ARG002
+        if options['background']:
+            job = JobService().enqueue('projects.purge_deleted', {})
+            self.stdout.write(self.style.SUCCESS(f'Purge of deleted items queued as job {job.id}'))
+            return
+
+        hours = options['older_than_hours']
+        if hours is None:
+            hours = settings.SOFT_DELETE_RETENTION_HOURS
+        before = timezone.now() - timedelta(hours=hours)
+        projects, tasks = PurgeService().purge_deleted(before, pause=options['pause'])
+        self.stdout.write(self.style.SUCCESS(f'Purged {projects} projects and {tasks} tasks deleted before {before}'))
@@ -0,0 +1,29 @@
+from django.core.management import BaseCommand
+
+from apps.jobs.services import JobService
+from apps.projects.services import ProjectService
+
+
+class Command(BaseCommand):
+    help = 'Recount the cached open/done/overdue task counters of every project and repair any drift'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Projects recounted per transaction')
+        parser.add_argument(
+            '--background', action='store_true', help='Queue the recount for `run_job_worker` and return at once'
+        )
+
+    def handle(self, *args, **options):  # noqa: ARG002
+        batch_size = options['batch_size']
+        if options['background']:
+            job = JobService().enqueue('projects.reconcile_counters', {'batch_size': batch_size})
+            self.stdout.write(self.style.SUCCESS(f'Project counter reconciliation queued as job {job.id}'))
+            return
+
+        repaired = ProjectService().reconcile_counters(
+            batch_size,
+            progress=lambda last_id, batch_repaired: self.stdout.write(
+                f'Recounted projects up to id {last_id}: {batch_repaired} repaired'
+            ),
+        )
+        self.stdout.write(self.style.SUCCESS(f'Project counters reconciled: {repaired} repaired'))
@@ -0,0 +1,38 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.operations import TrigramExtension
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+
+# Postgres only, so they are not declared on the model: elsewhere `apps.utils.search` uses `icontains`
+INDEXES = [
+    GinIndex(SearchVector('name', config='simple'), name='idx_proj_name_tsv'),
+    GinIndex(fields=['name'], opclasses=['gin_trgm_ops'], name='idx_proj_name_trgm'),
+]
+
+
+def add_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        Project = apps.get_model('projects', 'Project')
+        for index in INDEXES:
+            schema_editor.add_index(Project, index, concurrently=True)
+
+
+def remove_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        Project = apps.get_model('projects', 'Project')
+        for index in INDEXES:
+            schema_editor.remove_index(Project, index, concurrently=True)
+
+
+class Migration(migrations.Migration):
+    # Not atomic: add_indexes uses CREATE INDEX CONCURRENTLY
+    atomic = False
+
+    dependencies = [
+        ('projects', '0002_project_task_counters'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.RunPython(add_indexes, remove_indexes),
+    ]
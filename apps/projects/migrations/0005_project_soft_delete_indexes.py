@@ -0,0 +1,36 @@
+# Generated by Django 5.2 on 2026-10-18 05:16
+
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently, RemoveIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Not atomic, for the CONCURRENTLY index operations; the partial index is in place before the full one goes
+    atomic = False
+
+    dependencies = [
+        ('projects', '0004_project_deleted_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='project',
+            index=models.Index(
+                condition=models.Q(('deleted_at', None)),
+                fields=['user', '-created_at'],
+                name='idx_proj_live_user_created',
+            ),
+        ),
+        RemoveIndexConcurrently(
+            model_name='project',
+            name='idx_proj_user_created',
+        ),
+        AddIndexConcurrently(
+            model_name='project',
+            index=models.Index(
+                condition=models.Q(('deleted_at__isnull', False)), fields=['deleted_at', 'id'], name='idx_proj_deleted'
+            ),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2 on 2026-10-18 05:32
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0005_project_soft_delete_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='overdue_as_of',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
@@ -1,18 +1,38 @@
 from django.conf import settings
 from django.db import models
+from django.utils import timezone
+
+from apps.utils.soft_delete import SoftDeleteQuerySet
 
 
 class Project(models.Model):
     name = models.CharField(max_length=255)
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='projects')
+    # Cached task counters, kept in sync by TaskService and repaired by `reconcile_project_counters`
+    open_count = models.IntegerField(default=0)
+    done_count = models.IntegerField(default=0)
+    # Active tasks whose deadline had passed at `overdue_as_of`, when they were last recounted: a deadline
+    # passing later only counts from the next recount, so changes never take back what was not counted
+    overdue_count = models.IntegerField(default=0)
+    overdue_as_of = models.DateTimeField(default=timezone.now)
+    # Tombstone: set when the project is deleted, hiding it until `purge_deleted` removes it with its tasks
+    deleted_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True, db_index=True)
     updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
+    objects = SoftDeleteQuerySet.as_manager()
+
     class Meta:
         db_table = 'tasks_project'
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['user', '-created_at'], name='idx_proj_user_created'),
+            models.Index(
+                fields=['user', '-created_at'], name='idx_proj_live_user_created', condition=models.Q(deleted_at=None)
+            ),
+            # Purge order, over tombstones only
+            models.Index(
+                fields=['deleted_at', 'id'], name='idx_proj_deleted', condition=models.Q(deleted_at__isnull=False)
+            ),
             models.Index(fields=['-updated_at'], name='idx_proj_updated'),
         ]
 
@@ -1,16 +1,28 @@
 import logging
-from typing import TYPE_CHECKING
+import time
+from collections.abc import Iterable, Iterator, Mapping
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any
 
-from django.db.models import QuerySet
+from django.conf import settings
+from django.db import transaction
+from django.db.models import FloatField, QuerySet
+from django.utils import timezone
 
 from apps.projects.dal import ProjectRepository
-from apps.projects.validators import ProjectValidator
+from apps.projects.models import Project
+from apps.projects.validators import SEARCH_KINDS, ProjectValidator
+from apps.tasks.dal import TaskRepository
+from apps.tasks.models import Task
+from apps.utils.exceptions import ObjectNotFoundError
+from apps.utils.pagination import decode_cursor, split_page
+from apps.utils.search import SEARCH_ORDERING
+from apps.utils.streaming import CONTENT_TYPES, encode_lines
 
 logger = logging.getLogger(__name__)
 
 if TYPE_CHECKING:
     from apps.accounts.models import User
-    from apps.projects.models import Project
 
 
 class ProjectService:
@@ -25,6 +37,11 @@ class ProjectService:
         logger.info(r"Project created: %s \%s' by user %s", project.id, clean_name, user.id)
         return project
 
+    def get_or_create_user_project(self, user: 'User', name: str) -> 'Project':
+        """Get the user's project called `name` (case-insensitively), creating it if there is none."""
+        project = self.project_dal.filter_by(user=user, name__iexact=name.strip()).first()
+        return project or self.create_project(user, name)
+
     def update_project(self, user: 'User', project_id: int, **kwargs) -> 'Project':
         project = self.project_dal.get_by_id(project_id)
 
@@ -40,19 +57,227 @@ class ProjectService:
 
         return self.project_dal.update(project, **kwargs)
 
-    def delete_project(self, user: 'User', project_id: int) -> None:
+    def delete_project(self, user: 'User', project_id: int) -> 'Project':
+        """
+        Soft-delete a project: it disappears with its tasks at once, with one single-row `UPDATE`.
+
+        It can be restored until `purge_deleted` removes its rows, `SOFT_DELETE_RETENTION_HOURS` later.
+        """
         project = self.project_dal.get_by_id(project_id)
         self.validator.validate_delete_project(user, project)
-        self.project_dal.delete(project)
+        self.project_dal.tombstone(project, timezone.now())
         logger.info('Project deleted: %s by user %s', project_id, user.id)
+        return project
+
+    def restore_project(self, user: 'User', project_id: int) -> None:
+        """Undo `delete_project`, unless the user has since created another project with the same name."""
+        deleted_since = timezone.now() - timedelta(hours=settings.SOFT_DELETE_RETENTION_HOURS)
+        with transaction.atomic():
+            project = self.project_dal.restore_owned(user, project_id, deleted_since)
+            if project is None:
+                raise ObjectNotFoundError(Project.__name__, project_id)
+            existing_projects = self.project_dal.filter_by(user=user, name__iexact=project.name).exclude(id=project.id)
+            self.validator.validate_restore_project(existing_projects)
+        logger.info('Project restored: %s by user %s', project_id, user.id)
+
+    def reconcile_counters(self, batch_size: int, progress=None) -> int:
+        """
+        Recount the task counters of every project and repair any drift. Returns how many were repaired.
+
+        `progress` is called with the last project id and the number repaired after each batch.
+        """
+        last_id = 0
+        repaired = 0
+        while True:
+            # Re-read the clock per batch so overdue counts match the moment they are written
+            last_id, batch_repaired = self.project_dal.reconcile_counters(last_id, batch_size, timezone.now())
+            if last_id is None:
+                return repaired
+            repaired += batch_repaired
+            if progress is not None:
+                progress(last_id, batch_repaired)
 
     def get_user_projects(self, user: 'User') -> QuerySet:
         return self.project_dal.get_by_user(user)
 
+    async def aget_user_project_choices(self, user: 'User') -> list[tuple[int, str]]:
+        """Get `(id, name)` of all the user's projects, not just the dashboard page shown."""
+        return [choice async for choice in self.project_dal.get_choices_by_user(user)]
+
     def get_user_projects_with_tasks(self, user: 'User') -> QuerySet:
         return self.project_dal.get_by_user_with_tasks(user)
 
+    def get_dashboard_page(self, user: 'User', cursor: str | None = None) -> tuple[list['Project'], str | None]:
+        """Get one page of project cards and the cursor of the next page."""
+        after = decode_cursor(cursor, ProjectRepository.PAGE_ORDERING, Project) if cursor else None
+        limit = settings.DASHBOARD_PROJECTS_PAGE_SIZE
+
+        projects = self.project_dal.get_page_by_user(user, after, limit + 1, settings.PROJECT_TASKS_PAGE_SIZE + 1)
+        page, next_cursor = split_page(projects, limit, ProjectRepository.PAGE_ORDERING)
+        for project in page:
+            self._split_task_page(project)
+        return page, next_cursor
+
+    async def aget_dashboard_page(self, user: 'User', cursor: str | None = None) -> tuple[list['Project'], str | None]:
+        """Async `get_dashboard_page`."""
+        after = decode_cursor(cursor, ProjectRepository.PAGE_ORDERING, Project) if cursor else None
+        limit = settings.DASHBOARD_PROJECTS_PAGE_SIZE
+
+        projects = self.project_dal.get_page_by_user(user, after, limit + 1, settings.PROJECT_TASKS_PAGE_SIZE + 1)
+        page, next_cursor = split_page([project async for project in projects], limit, ProjectRepository.PAGE_ORDERING)
+        for project in page:
+            self._split_task_page(project)
+        return page, next_cursor
+
+    def get_user_project_card(self, user: 'User', project_id: int) -> 'Project':
+        """Get a project with the first page of its tasks attached for card rendering."""
+        project = self.project_dal.get_by_id_with_task_page(project_id, settings.PROJECT_TASKS_PAGE_SIZE + 1)
+        self.validator.validate_access_project(user, project)
+        self._split_task_page(project)
+        return project
+
+    async def aget_user_project_card(self, user: 'User', project_id: int) -> 'Project':
+        """Async `get_user_project_card`."""
+        project = await self.project_dal.aget_by_id_with_task_page(project_id, settings.PROJECT_TASKS_PAGE_SIZE + 1)
+        self.validator.validate_access_project(user, project)
+        self._split_task_page(project)
+        return project
+
+    def adjust_task_counters(
+        self, project_id: int, overdue_deadlines: Mapping[datetime, int] | None = None, **deltas: int
+    ) -> None:
+        self.project_dal.adjust_counters(project_id, overdue_deadlines, **deltas)
+
+    def get_user_project_counters(self, user: 'User', project_ids: Iterable[int]) -> QuerySet:
+        return self.project_dal.get_counters_by_user(user, project_ids)
+
+    def count_user_projects(self, user: 'User') -> int:
+        return self.project_dal.count_by_user(user)
+
+    async def acount_user_projects(self, user: 'User') -> int:
+        return await self.project_dal.acount_by_user(user)
+
     def get_user_project(self, user: 'User', project_id: int) -> 'Project':
         project = self.project_dal.get_by_id(project_id)
         self.validator.validate_access_project(user, project)
         return project
+
+    def _split_task_page(self, project: 'Project') -> None:
+        project.task_page, project.next_task_cursor = split_page(
+            project.task_page, settings.PROJECT_TASKS_PAGE_SIZE, Task.SORTED_ORDERING
+        )
+
+
+class ExportService:
+    """
+    Stream a user's projects and tasks as NDJSON or CSV.
+
+    Rows come from server-side cursors (`QuerySet.iterator`) and are encoded one line at a
+    time, so memory use does not depend on the size of the account. Projects come first,
+    then tasks; every row carries its `type`, so both fit in one file and can be re-imported.
+    """
+
+    FIELDS = (
+        'type', 'id', 'project_id', 'name', 'status', 'priority', 'deadline', 'position', 'created_at', 'updated_at'
+    )
+
+    def __init__(self, project_dal=None, task_dal=None, validator=None):
+        self.project_dal = project_dal or ProjectRepository()
+        self.task_dal = task_dal or TaskRepository()
+        self.validator = validator or ProjectValidator()
+
+    def export_user_data(self, user: 'User', fmt: str) -> Iterator[str]:
+        """Get the export of `user` in `fmt` as an iterator of lines. Validation happens before the first line."""
+        self.validator.validate_export_format(fmt)
+        logger.info('Export started: %s for user %s', fmt, user.id)
+        return encode_lines(self._records(user), fmt, self.FIELDS)
+
+    def get_content_type(self, fmt: str) -> str:
+        return CONTENT_TYPES[fmt]
+
+    def _records(self, user: 'User') -> Iterator[dict[str, Any]]:
+        chunk_size = settings.EXPORT_CHUNK_SIZE
+        for project in self.project_dal.get_export_rows(user).iterator(chunk_size=chunk_size):
+            yield {'type': 'project', **project}
+        for task in self.task_dal.get_export_rows(user).iterator(chunk_size=chunk_size):
+            yield {'type': 'task', **task}
+
+
+class SearchService:
+    """
+    Search-as-you-type over the names of a user's projects and tasks.
+
+    Each kind is ranked and keyset-paginated on its own, so the first results of both
+    can be shown together and each list extended independently.
+    """
+
+    KINDS = SEARCH_KINDS
+
+    def __init__(self, project_dal=None, task_dal=None, validator=None):
+        self.project_dal = project_dal or ProjectRepository()
+        self.task_dal = task_dal or TaskRepository()
+        self.validator = validator or ProjectValidator()
+
+    async def asearch(
+        self, user: 'User', text: str, kind: str, cursor: str | None = None
+    ) -> tuple[list['Project'] | list[Task], str | None]:
+        """Get one page of the user's projects or tasks (`kind`) matching `text`, and the next page's cursor."""
+        self.validator.validate_search_kind(kind)
+        dal = self.project_dal if kind == 'projects' else self.task_dal
+        after = decode_cursor(cursor, SEARCH_ORDERING, dal.model, rank=FloatField()) if cursor else None
+        if not self.can_search(text):
+            return [], None
+
+        limit = settings.SEARCH_PAGE_SIZE
+        rows = dal.search_by_user(user, text, after, limit + 1)
+        return split_page([row async for row in rows], limit, SEARCH_ORDERING)
+
+    def can_search(self, text: str) -> bool:
+        """Whether `text` is long enough to be searched; shorter ones would match nearly everything."""
+        return len(text.strip()) >= settings.SEARCH_MIN_QUERY_LENGTH
+
+
+class PurgeService:
+    """
+    Delete for good the projects and tasks soft-deleted before a cutoff.
+
+    Projects go first, each with all its tasks, deleted or not; then the remaining deleted tasks. Rows are
+    deleted in short batches of `PURGE_BATCH_SIZE`, walking partial indexes in key order,
+    with an optional pause between batches so autovacuum and replicas keep up.
+    """
+
+    def __init__(self, project_dal=None, task_dal=None):
+        self.project_dal = project_dal or ProjectRepository()
+        self.task_dal = task_dal or TaskRepository()
+
+    def purge_deleted(self, before: datetime, pause: float = 0) -> tuple[int, int]:
+        """Purge everything deleted before `before`. Returns how many projects and (other) tasks were purged."""
+        batch_size = settings.PURGE_BATCH_SIZE
+        projects = 0
+        after = None
+        while keys := self.project_dal.get_deleted_before(before, after, batch_size):
+            for _, project_id in keys:
+                projects += self.purge_project(project_id, pause)
+            after = list(keys[-1])
+
+        tasks = 0
+        after = None
+        while True:
+            after, purged = self.task_dal.purge_deleted_batch(before, after, batch_size)
+            if after is None:
+                break
+            tasks += purged
+            time.sleep(pause)
+
+        logger.info('Purged %s projects and %s tasks deleted before %s', projects, tasks, before)
+        return projects, tasks
+
+    def purge_project(self, project_id: int, pause: float = 0) -> bool:
+        """Delete a deleted project and its tasks. Returns `False` if it was not deleted, or is gone already."""
+        batch_size = settings.PURGE_BATCH_SIZE
+        for deleted in (False, True):
+            after = self.project_dal.delete_task_batch(project_id, None, batch_size, deleted=deleted)
+            while after is not None:
+                time.sleep(pause)
+                after = self.project_dal.delete_task_batch(project_id, after, batch_size, deleted=deleted)
+        return self.project_dal.delete_tombstoned(project_id)
@@ -0,0 +1,16 @@
+from django import template
+from django.utils.safestring import SafeString, mark_safe
+
+from apps.utils.fragment_cache import FragmentCache
+
+register = template.Library()
+
+
+@register.simple_tag
+def render_project_card(project) -> SafeString:
+    """Render `partials/project_card.html` through the fragment cache."""
+    fragment_cache = FragmentCache()
+    html = fragment_cache.render(
+        fragment_cache.project_card_key(project), 'partials/project_card.html', {'project': project}
+    )
+    return mark_safe(html)  # noqa: S308
@@ -0,0 +1,118 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.management import call_command
+from django.test import TestCase
+from django.test import override_settings
+from django.urls import reverse
+
+from apps.projects.models import Project
+from apps.projects.views import ProjectListView, ProjectResourceView
+from apps.tasks.models import Task
+from apps.tasks.views import TaskCancelEditView, TaskEditFormView
+
+User = get_user_model()
+
+
+class AsyncReadViewsTest(TestCase):
+    def setUp(self):
+        # Card versions are only bumped on commit, which test transactions never do
+        caches[settings.FRAGMENT_CACHE_ALIAS].clear()
+        self.user = User.objects.create_user(email='test@example.com', password='testpass123')
+        self.project = Project.objects.create(name='Project A', user=self.user)
+        self.task = Task.objects.create(name='Task A', project=self.project)
+        self.other_user = User.objects.create_user(email='other@example.com', password='testpass123')
+
+    def test_read_views_are_async(self):
+        for view in (ProjectListView, ProjectResourceView, TaskEditFormView, TaskCancelEditView):
+            self.assertTrue(view.view_is_async, view.__name__)
+
+    async def test_project_list_view(self):
+        await self.async_client.aforce_login(self.user)
+
+        response = await self.async_client.get(reverse('projects:list'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([project.id for project in response.context['projects']], [self.project.id])
+        self.assertEqual(response.context['project_count'], 1)
+        self.assertContains(response, 'Task A')
+
+    @override_settings(REQUEST_PROFILING_ENABLED=True, SLOW_REQUEST_THRESHOLD_MS=60_000, DATABASE_REPLICAS=['default'])
+    async def test_optional_middlewares_keep_views_async(self):
+        await self.async_client.aforce_login(self.user)
+
+        # In debug, Django logs every handler it has to adapt for a sync-only middleware
+        with self.settings(DEBUG=True), self.assertNoLogs('django.request', 'DEBUG'):
+            response = await self.async_client.get(reverse('projects:list'))
+
+        self.assertContains(response, 'Task A')
+        self.assertRegex(response['Server-Timing'], r'desc="[1-9]\d* queries"')
+
+    async def test_project_card_view(self):
+        await self.async_client.aforce_login(self.user)
+
+        response = await self.async_client.get(reverse('projects:resource', args=[self.project.id]))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Project A')
+        self.assertContains(response, 'Task A')
+
+    async def test_project_views_render_fragments_off_the_event_loop(self):
+        caches = {
+            **settings.CACHES,
+            settings.FRAGMENT_CACHE_ALIAS: {
+                'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+                'LOCATION': 'test_fragment_cache',
+            },
+        }
+        with override_settings(CACHES=caches):
+            # The database backend raises SynchronousOnlyOperation if called from the event loop
+            await sync_to_async(call_command)('createcachetable', 'test_fragment_cache')
+            await self.async_client.aforce_login(self.user)
+
+            for url in (reverse('projects:list'), reverse('projects:resource', args=[self.project.id])):
+                response = await self.async_client.get(url)
+                self.assertContains(response, 'Task A')
+
+    async def test_project_card_view_denies_other_users(self):
+        await self.async_client.aforce_login(self.other_user)
+
+        response = await self.async_client.get(reverse('projects:resource', args=[self.project.id]))
+
+        self.assertEqual(response.status_code, 403)
+
+    async def test_project_writes_still_work(self):
+        await self.async_client.aforce_login(self.user)
+        url = reverse('projects:resource', args=[self.project.id])
+
+        response = await self.async_client.patch(url, 'name=Renamed', content_type='application/x-www-form-urlencoded')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((await Project.objects.aget(id=self.project.id)).name, 'Renamed')
+
+        response = await self.async_client.delete(url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(await Project.objects.live().filter(id=self.project.id).aexists())
+
+    async def test_task_cancel_edit_view(self):
+        await self.async_client.aforce_login(self.user)
+
+        response = await self.async_client.get(reverse('tasks:cancel', args=[self.task.id]))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Task A')
+
+    async def test_task_edit_form_view_denies_other_users(self):
+        await self.async_client.aforce_login(self.other_user)
+
+        response = await self.async_client.get(reverse('tasks:edit_form', args=[self.task.id]))
+
+        self.assertEqual(response.status_code, 403)
+
+    async def test_redirects_anonymous_users_to_login(self):
+        response = await self.async_client.get(reverse('projects:list'))
+
+        self.assertEqual(response.status_code, 302)
+        self.assertIn(reverse('account_login'), response.url)
@@ -0,0 +1,147 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.test import override_settings
+from django.utils import timezone
+
+from apps.accounts.tests.factories import UserFactory
+from apps.projects.dal import ProjectRepository
+from apps.projects.models import Project
+from apps.projects.services import ProjectService, PurgeService
+from apps.reminders.models import TaskReminder
+from apps.tasks.models import Task
+from apps.tasks.services import TaskService
+from apps.utils.exceptions import ObjectNotFoundError, ValidationError
+
+
+@override_settings(PURGE_BATCH_SIZE=2, SOFT_DELETE_RETENTION_HOURS=24)
+class ProjectDeletionTest(TestCase):
+    def setUp(self):
+        self.user = UserFactory()
+        self.service = ProjectService()
+        self.project = Project.objects.create(name='Doomed', user=self.user)
+        self.tasks = [Task.objects.create(name=f'Task {index}', project=self.project) for index in range(5)]
+        Task.objects.filter(id=self.tasks[0].id).update(status=Task.Status.DONE)
+        Project.objects.filter(id=self.project.id).update(open_count=4, done_count=1)
+        TaskReminder.objects.create(
+            task=self.tasks[1], kind=TaskReminder.Kind.OVERDUE, deadline=timezone.now()
+        )
+        self.kept = Project.objects.create(name='Kept', user=self.user)
+        self.kept_task = Task.objects.create(name='Kept task', project=self.kept)
+
+    def test_deleted_projects_disappear_at_once_with_their_tasks(self):
+        self.service.delete_project(self.user, self.project.id)
+
+        self.assertEqual(Task.objects.filter(project_id=self.project.id).count(), 5)
+        self.assertEqual([project.id for project in self.service.get_user_projects(self.user)], [self.kept.id])
+        self.assertEqual(self.service.count_user_projects(self.user), 1)
+        with self.assertRaises(ObjectNotFoundError):
+            self.service.get_user_project(self.user, self.project.id)
+        rows = list(self.service.project_dal.get_export_rows(self.user))
+        self.assertEqual([row['id'] for row in rows], [self.kept.id])
+
+    def test_restore_brings_the_project_back_as_it_was(self):
+        self.service.delete_project(self.user, self.project.id)
+
+        with self.assertNumQueries(5):
+            # The conditional UPDATE, the read back and the name check, in a savepoint
+            self.service.restore_project(self.user, self.project.id)
+
+        project = self.service.get_user_project_card(self.user, self.project.id)
+        self.assertEqual((project.open_count, project.done_count), (4, 1))
+        self.assertEqual(len(project.task_page), 5)
+        with self.assertRaises(ObjectNotFoundError):
+            self.service.restore_project(self.user, self.project.id)
+
+    def test_tasks_of_deleted_projects_cannot_be_changed(self):
+        task_service = TaskService()
+        self.service.delete_project(self.user, self.project.id)
+
+        with self.assertRaises(ObjectNotFoundError):
+            task_service.toggle_task_status(self.user, self.tasks[1].id)
+        with self.assertRaises(ObjectNotFoundError):
+            task_service.delete_task(self.user, self.tasks[1].id)
+        with self.assertRaises(ObjectNotFoundError):
+            task_service.bulk_complete(self.user, [task.id for task in self.tasks])
+
+        self.service.restore_project(self.user, self.project.id)
+        self.project.refresh_from_db()
+        self.assertEqual((self.project.open_count, self.project.done_count), (4, 1))
+
+    def test_restore_is_refused_for_other_users_and_after_retention(self):
+        self.service.delete_project(self.user, self.project.id)
+
+        with self.assertRaises(ObjectNotFoundError):
+            self.service.restore_project(UserFactory(), self.project.id)
+
+        Project.objects.filter(id=self.project.id).update(deleted_at=timezone.now() - timedelta(hours=25))
+        with self.assertRaises(ObjectNotFoundError):
+            self.service.restore_project(self.user, self.project.id)
+
+    def test_restore_is_refused_when_the_name_was_taken_since(self):
+        self.service.delete_project(self.user, self.project.id)
+        self.service.create_project(self.user, 'Doomed')
+
+        with self.assertRaises(ValidationError):
+            self.service.restore_project(self.user, self.project.id)
+
+        self.assertTrue(Project.objects.deleted().filter(id=self.project.id).exists())
+
+    def test_purge_deletes_old_tombstones_only(self):
+        now = timezone.now()
+        self.service.delete_project(self.user, self.project.id)
+        Project.objects.filter(id=self.project.id).update(deleted_at=now - timedelta(days=2))
+        old_task, recent_task = (Task.objects.create(name=name, project=self.kept) for name in ('Old', 'Recent'))
+        Task.objects.filter(id=old_task.id).update(deleted_at=now - timedelta(days=2))
+        Task.objects.filter(id=recent_task.id).update(deleted_at=now)
+
+        projects, tasks = PurgeService().purge_deleted(now - timedelta(days=1))
+
+        self.assertEqual((projects, tasks), (1, 1))
+        self.assertFalse(Project.objects.filter(id=self.project.id).exists())
+        self.assertFalse(Task.objects.filter(project_id=self.project.id).exists())
+        self.assertFalse(TaskReminder.objects.exists())
+        self.assertFalse(Task.objects.filter(id=old_task.id).exists())
+        self.assertTrue(Task.objects.filter(id=recent_task.id).exists())
+        self.assertTrue(Task.objects.filter(id=self.kept_task.id).exists())
+
+    def test_batches_walk_the_sort_order(self):
+        repository = ProjectRepository()
+        self.assertIsNone(repository.delete_task_batch(self.project.id, None, 2))
+
+        repository.tombstone(self.project, timezone.now())
+
+        after = repository.delete_task_batch(self.project.id, None, 2)
+        self.assertEqual(Task.objects.filter(project=self.project).count(), 3)
+        after = repository.delete_task_batch(self.project.id, after, 2)
+        after = repository.delete_task_batch(self.project.id, after, 2)
+        self.assertIsNotNone(after)
+        self.assertIsNone(repository.delete_task_batch(self.project.id, after, 2))
+        # The done task sorts last
+        self.assertEqual(after[-1], self.tasks[0].id)
+
+    def test_batches_walk_the_deleted_tasks_too(self):
+        repository = ProjectRepository()
+        now = timezone.now()
+        for offset, task in enumerate(self.tasks[:3]):
+            Task.objects.filter(id=task.id).update(deleted_at=now - timedelta(minutes=offset))
+        repository.tombstone(self.project, now)
+
+        after = repository.delete_task_batch(self.project.id, None, 5)
+        self.assertIsNone(repository.delete_task_batch(self.project.id, after, 5))
+        self.assertEqual(Task.objects.filter(project=self.project).count(), 3)
+        after = repository.delete_task_batch(self.project.id, None, 2, deleted=True)
+        self.assertEqual(after, [now - timedelta(minutes=1), self.tasks[1].id])
+        after = repository.delete_task_batch(self.project.id, after, 2, deleted=True)
+        self.assertIsNone(repository.delete_task_batch(self.project.id, after, 2, deleted=True))
+        self.assertFalse(Task.objects.filter(project=self.project).exists())
+
+    def test_leftover_tasks_go_with_the_project(self):
+        repository = ProjectRepository()
+        self.assertFalse(repository.delete_tombstoned(self.project.id))
+
+        repository.tombstone(self.project, timezone.now())
+        Task.objects.filter(id=self.tasks[2].id).update(deleted_at=timezone.now())
+
+        self.assertTrue(repository.delete_tombstoned(self.project.id))
+        self.assertFalse(Task.objects.filter(project_id=self.project.id).exists())
@@ -0,0 +1,27 @@
+import json
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from apps.accounts.tests.factories import UserFactory
+from apps.projects.models import Project
+from apps.tasks.models import Task
+
+
+class ExportUserDataManageCommandTestCase(TestCase):
+    def test_streams_user_data_to_stdout(self):
+        user = UserFactory()
+        project = Project.objects.create(name='Mine', user=user)
+        tasks = [Task.objects.create(name=f'Task {i}', project=project) for i in range(3)]
+
+        out = StringIO()
+        call_command('export_user_data', user.email, stdout=out)
+
+        records = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(len(records), 1 + len(tasks))
+        self.assertEqual({record['id'] for record in records if record['type'] == 'task'}, {task.id for task in tasks})
+
+    def test_unknown_user(self):
+        with self.assertRaises(CommandError):
+            call_command('export_user_data', 'nobody@example.com', stdout=StringIO())
@@ -0,0 +1,33 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.accounts.tests.factories import UserFactory
+from apps.jobs.models import Job
+from apps.projects.models import Project
+
+
+class PurgeDeletedManageCommandTestCase(TestCase):
+    def setUp(self):
+        user = UserFactory()
+        now = timezone.now()
+        self.old = Project.objects.create(name='Old', user=user, deleted_at=now - timedelta(hours=5))
+        self.recent = Project.objects.create(name='Recent', user=user, deleted_at=now - timedelta(hours=1))
+
+    def test_purges_rows_deleted_before_the_cutoff(self):
+        out = StringIO()
+        call_command('purge_deleted', older_than_hours=2, stdout=out)
+
+        self.assertIn('Purged 1 projects and 0 tasks', out.getvalue())
+        self.assertEqual(list(Project.objects.values_list('id', flat=True)), [self.recent.id])
+
+    def test_background_queues_a_job(self):
+        out = StringIO()
+        call_command('purge_deleted', background=True, stdout=out)
+
+        job = Job.objects.get(kind='projects.purge_deleted')
+        self.assertIn(f'queued as job {job.id}', out.getvalue())
+        self.assertEqual(Project.objects.count(), 2)
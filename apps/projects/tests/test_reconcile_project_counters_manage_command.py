@@ -0,0 +1,33 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.accounts.tests.factories import UserFactory
+from apps.projects.models import Project
+from apps.tasks.models import Task
+
+
+class ReconcileProjectCountersManageCommandTestCase(TestCase):
+    def test_repairs_drifted_counters_in_batches(self):
+        user = UserFactory()
+        project = Project.objects.create(name='Drifted', user=user)
+        empty_project = Project.objects.create(name='Empty', user=user, open_count=3)
+        in_sync_project = Project.objects.create(name='In sync', user=user, open_count=1)
+        Task.objects.create(name='Open', project=project)
+        Task.objects.create(name='Late', project=project, deadline=timezone.now() - timedelta(hours=1))
+        Task.objects.create(name='Done', project=project, status=Task.Status.DONE)
+        Task.objects.create(name='Open', project=in_sync_project)
+
+        out = StringIO()
+        call_command('reconcile_project_counters', batch_size=2, stdout=out)
+
+        self.assertIn('Project counters reconciled: 2 repaired', out.getvalue())
+        project.refresh_from_db()
+        self.assertEqual((project.open_count, project.done_count, project.overdue_count), (2, 1, 1))
+        empty_project.refresh_from_db()
+        self.assertEqual(empty_project.open_count, 0)
+        in_sync_project.refresh_from_db()
+        self.assertEqual(in_sync_project.open_count, 1)
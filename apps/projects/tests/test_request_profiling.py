@@ -0,0 +1,53 @@
+from django.contrib.auth import get_user_model
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.test import TestCase
+from django.test import override_settings
+from django.urls import reverse
+
+from apps.middleware import RequestProfilingMiddleware
+from apps.projects.models import Project
+from apps.tasks.models import Task
+
+User = get_user_model()
+
+
+class RequestProfilingMiddlewareTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='test@example.com', password='testpass123')
+        self.client.force_login(self.user)
+
+    def test_disabled_by_default(self):
+        response = self.client.get(reverse('projects:list'))
+
+        self.assertNotIn('Server-Timing', response)
+
+    @override_settings(REQUEST_PROFILING_ENABLED=True)
+    def test_adds_server_timing_and_logs_the_request(self):
+        Project.objects.create(name='Project A', user=self.user)
+
+        url = reverse('projects:list')
+        with self.assertLogs('apps.middleware', level='INFO') as logs:
+            response = self.client.get(url)
+
+        timing = response['Server-Timing']
+        for metric in ('sql;dur=', 'template;dur=', 'python;dur=', 'total;dur='):
+            self.assertIn(metric, timing)
+        self.assertRegex(timing, r'desc="[1-9]\d* queries"')
+        self.assertIn(f'path={url} status=200', logs.output[-1])
+
+    @override_settings(REQUEST_PROFILING_ENABLED=True, REQUEST_PROFILING_DUPLICATE_THRESHOLD=3)
+    def test_warns_about_repeated_statements(self):
+        project = Project.objects.create(name='Project A', user=self.user)
+        tasks = [Task.objects.create(name=f'Task {i}', project=project) for i in range(3)]
+
+        def view(request):  # noqa: ARG001
+            for task in tasks:
+                Task.objects.get(id=task.id)
+            return HttpResponse('')
+
+        with self.assertLogs('apps.middleware', level='WARNING') as logs:
+            response = RequestProfilingMiddleware(view)(RequestFactory().get('/'))
+
+        self.assertIn('desc="3 queries"', response['Server-Timing'])
+        self.assertIn('Possible N+1: statement ran 3 times in GET /', logs.output[0])
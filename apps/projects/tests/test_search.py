@@ -0,0 +1,117 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.test import override_settings
+from django.urls import reverse
+
+from apps.projects.dal import ProjectRepository
+from apps.projects.models import Project
+from apps.tasks.dal import TaskRepository
+from apps.tasks.models import Task
+from apps.utils.pagination import split_page
+from apps.utils.search import SEARCH_ORDERING, search_terms
+
+User = get_user_model()
+
+
+class SearchRepositoryTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='test@example.com', password='testpass123')
+        self.other_user = User.objects.create_user(email='other@example.com', password='testpass123')
+        self.project = Project.objects.create(name='Quarterly reports', user=self.user)
+        Project.objects.create(name='Groceries', user=self.user)
+        Project.objects.create(name='Reports', user=self.other_user)
+
+    def test_search_terms_drop_operators(self):
+        self.assertEqual(search_terms("Q3 rep:* & !'x'"), ['q3', 'rep', 'x'])
+        self.assertEqual(search_terms('  & | '), [])
+
+    def test_matches_word_prefixes_of_the_users_projects(self):
+        projects = ProjectRepository().search_by_user(self.user, 'report', None, 10)
+
+        self.assertEqual([project.id for project in projects], [self.project.id])
+        self.assertIsInstance(projects[0].rank, float)
+
+    def test_every_term_must_match(self):
+        self.assertEqual(len(ProjectRepository().search_by_user(self.user, 'quarterly rep', None, 10)), 1)
+        self.assertEqual(len(ProjectRepository().search_by_user(self.user, 'quarterly zebra', None, 10)), 0)
+        self.assertEqual(len(ProjectRepository().search_by_user(self.user, '&&', None, 10)), 0)
+
+    def test_tasks_are_scoped_to_the_user_and_carry_their_project(self):
+        task = Task.objects.create(name='Write report', project=self.project)
+        other_project = Project.objects.get(user=self.other_user)
+        Task.objects.create(name='Write report', project=other_project)
+
+        tasks = list(TaskRepository().search_by_user(self.user, 'report', None, 10))
+
+        self.assertEqual([found.id for found in tasks], [task.id])
+        with self.assertNumQueries(0):
+            self.assertEqual(tasks[0].project.name, 'Quarterly reports')
+
+    def test_pages_cover_every_match_once(self):
+        tasks = [Task.objects.create(name=f'Report {index}', project=self.project) for index in range(5)]
+        repository = TaskRepository()
+
+        found, after = [], None
+        while True:
+            page, cursor = split_page(repository.search_by_user(self.user, 'report', after, 3), 2, SEARCH_ORDERING)
+            found.extend(task.id for task in page)
+            if cursor is None:
+                break
+            after = [getattr(page[-1], field.lstrip('-')) for field in SEARCH_ORDERING]
+
+        self.assertEqual(sorted(found), [task.id for task in tasks])
+
+
+@override_settings(SEARCH_PAGE_SIZE=2, SEARCH_MIN_QUERY_LENGTH=2)
+class SearchViewTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='test@example.com', password='testpass123')
+        self.project = Project.objects.create(name='Quarterly reports', user=self.user)
+        for index in range(3):
+            Task.objects.create(name=f'Report draft {index}', project=self.project)
+        self.url = reverse('projects:search')
+
+    async def test_first_page_of_both_kinds(self):
+        await self.async_client.aforce_login(self.user)
+
+        response = await self.async_client.get(self.url, {'q': 'rep'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'partials/search_results.html')
+        projects, tasks = response.context['sections']
+        self.assertEqual([project.id for project in projects['results']], [self.project.id])
+        self.assertIsNone(projects['next_cursor'])
+        self.assertEqual(len(tasks['results']), 2)
+        self.assertIsNotNone(tasks['next_cursor'])
+        self.assertContains(response, 'Quarterly reports')
+
+    async def test_next_page_of_one_kind(self):
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(self.url, {'q': 'rep'})
+        first_page = response.context['sections'][1]
+
+        response = await self.async_client.get(
+            self.url, {'q': 'rep', 'kind': 'tasks', 'cursor': first_page['next_cursor']}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'partials/search_page.html')
+        self.assertEqual(len(response.context['results']), 1)
+        self.assertIsNone(response.context['next_cursor'])
+        seen = {task.id for task in first_page['results']}
+        self.assertNotIn(response.context['results'][0].id, seen)
+
+    async def test_short_queries_are_not_run(self):
+        await self.async_client.aforce_login(self.user)
+
+        response = await self.async_client.get(self.url, {'q': 'r'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b'')
+
+    async def test_unknown_kind_is_rejected(self):
+        await self.async_client.aforce_login(self.user)
+
+        response = await self.async_client.get(self.url, {'q': 'rep', 'kind': 'users'}, headers={'HX-Request': 'true'})
+
+        self.assertEqual(response.status_code, 400)
@@ -1,8 +1,18 @@
+import csv
+import io
+import json
+
 from django.contrib.auth import get_user_model
+from django.core.cache import caches
 from django.test import TestCase
+from django.test import override_settings
 from django.urls import reverse
 
+from apps.accounts.tests.factories import UserFactory
 from apps.projects.models import Project
+from apps.tasks.models import Task
+from apps.tasks.services import TaskService
+from apps.utils.fragment_cache import FragmentCache
 
 User = get_user_model()
 
@@ -24,6 +34,52 @@ class ProjectViewsTest(TestCase):
         self.assertTemplateUsed(response, 'home.html')
         self.assertEqual(len(response.context['projects']), 2)
 
+    @override_settings(DASHBOARD_PROJECTS_PAGE_SIZE=2, PROJECT_TASKS_PAGE_SIZE=1)
+    def test_project_list_view_paginates_projects_and_tasks(self):
+        projects = [Project.objects.create(name=f'Project {i}', user=self.user) for i in range(3)]
+        Task.objects.create(name='First', project=projects[2])
+        Task.objects.create(name='Second', project=projects[2])
+
+        response = self.client.get(self.dashboard_url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['project_count'], 3)
+        page = response.context['projects']
+        self.assertEqual([project.id for project in page], [projects[2].id, projects[1].id])
+        self.assertEqual(len(page[0].task_page), 1)
+        self.assertIsNotNone(page[0].next_task_cursor)
+        self.assertContains(response, 'hx-trigger="revealed"')
+        # Tasks can be moved to any project, not only the ones on the first page
+        self.assertContains(response, f'<option value="{projects[0].id}">Project 0</option>', html=True)
+
+        response = self.client.get(reverse('projects:page'), {'cursor': response.context['next_cursor']})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'partials/project_page.html')
+        self.assertEqual([project.id for project in response.context['projects']], [projects[0].id])
+        self.assertIsNone(response.context['next_cursor'])
+
+    def test_project_list_view_uses_fragment_cache(self):
+        caches['fragments'].clear()
+        project = Project.objects.create(name='Cached', user=self.user)
+        task = TaskService().create_task(self.user, project.id, 'Original name')
+
+        self.client.get(self.dashboard_url)
+        self.assertEqual(FragmentCache().stats(), {'hits': 0, 'misses': 2})
+
+        self.client.get(self.dashboard_url)
+        self.assertEqual(FragmentCache().stats(), {'hits': 1, 'misses': 2})
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            TaskService().update_task(self.user, task.id, title='Renamed')
+            # The card is only invalidated once the write commits
+            self.assertNotContains(self.client.get(self.dashboard_url), 'Renamed')
+        self.assertTrue(callbacks)
+        response = self.client.get(self.dashboard_url)
+
+        self.assertContains(response, 'Renamed')
+        self.assertNotContains(response, 'Original name')
+
     def test_create_project_htmx_success(self):
         data = {'name': 'New Project'}
 
@@ -80,3 +136,34 @@ class ProjectViewsTest(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.content, b'')
         self.assertFalse(Project.objects.filter(id=project.id).exists())
+
+    def test_export_streams_ndjson(self):
+        project = Project.objects.create(name='Exported', user=self.user)
+        task = Task.objects.create(name='Exported task', project=project)
+        Project.objects.create(name='Not mine', user=UserFactory())
+
+        response = self.client.get(reverse('projects:export'), {'format': 'ndjson'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        records = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+        self.assertEqual(
+            [(record['type'], record['id']) for record in records], [('project', project.id), ('task', task.id)]
+        )
+        self.assertEqual(records[1]['project_id'], project.id)
+
+    def test_export_streams_csv(self):
+        project = Project.objects.create(name='Exported, with comma', user=self.user)
+
+        response = self.client.get(reverse('projects:export'), {'format': 'csv'})
+
+        rows = list(csv.DictReader(io.StringIO(b''.join(response.streaming_content).decode())))
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        self.assertEqual(rows[0]['name'], project.name)
+        self.assertEqual(rows[0]['type'], 'project')
+
+    def test_export_rejects_unknown_format(self):
+        response = self.client.get(reverse('projects:export'), {'format': 'xml'})
+
+        self.assertEqual(response.status_code, 400)
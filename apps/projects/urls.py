@@ -6,6 +6,10 @@ app_name = 'projects'
 
 urlpatterns = [
     path('', views.ProjectListView.as_view(), name='list'),
+    path('page/', views.ProjectPageView.as_view(), name='page'),
+    path('export/', views.ProjectExportView.as_view(), name='export'),
+    path('search/', views.SearchView.as_view(), name='search'),
     path('create/', views.ProjectCreateView.as_view(), name='create'),
     path('<int:project_id>/', views.ProjectResourceView.as_view(), name='resource'),
+    path('<int:project_id>/restore/', views.ProjectRestoreView.as_view(), name='restore'),
 ]
@@ -1,6 +1,10 @@
 from typing import List, Optional, TYPE_CHECKING
 
 from apps.utils.exceptions import PermissionDeniedError, ValidationError
+from apps.utils.streaming import CONTENT_TYPES
+
+EXPORT_FORMATS = tuple(CONTENT_TYPES)
+SEARCH_KINDS = ('projects', 'tasks')
 
 if TYPE_CHECKING:
     from apps.accounts.models import User
@@ -26,8 +30,21 @@ class ProjectValidator:
 
         return name
 
+    def validate_export_format(self, fmt: str):
+        if fmt not in EXPORT_FORMATS:
+            field = 'format'
+            message = f'Unknown export format (use one of: {", ".join(EXPORT_FORMATS)})'
+            raise ValidationError(field, message)
+
+    def validate_search_kind(self, kind: str):
+        if kind not in SEARCH_KINDS:
+            field = 'kind'
+            message = f'Unknown search kind (use one of: {", ".join(SEARCH_KINDS)})'
+            raise ValidationError(field, message)
+
     def validate_ownership(self, user: 'User', project: 'Project'):
-        if project.user != user:
+        # Compare ids, so the check never loads the owner
+        if project.user_id != user.id:
             message = 'You can only access your own projects'
             raise PermissionDeniedError(message)
 
@@ -47,6 +64,12 @@ class ProjectValidator:
 
         return clean_name
 
+    def validate_restore_project(self, existing_projects_query):
+        if existing_projects_query.exists():
+            field = 'name'
+            message = 'A project with this name was created since; rename it to restore this one'
+            raise ValidationError(field, message)
+
     def validate_update_project_name(self, user: 'User', project: 'Project', name: str, existing_projects_query) -> str:
         """Complete validation for project name update."""
         self.validate_ownership(user, project)
@@ -1,10 +1,14 @@
+from asgiref.sync import sync_to_async
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.http import HttpRequest, HttpResponse, QueryDict
+from django.http import HttpRequest, HttpResponse, QueryDict, StreamingHttpResponse
 from django.shortcuts import render
 from django.views import View
 
 from apps.projects.forms import ProjectCreateForm, ProjectUpdateForm
-from apps.projects.services import ProjectService
+from apps.projects.services import ExportService, ProjectService, SearchService
+from apps.utils.fragment_cache import FragmentCache, arender
+from apps.utils.mixins import AsyncLoginRequiredMixin
+from apps.utils.streaming import NDJSON
 
 
 class BaseProjectView(LoginRequiredMixin, View):
@@ -13,16 +17,73 @@ class BaseProjectView(LoginRequiredMixin, View):
         self.service = ProjectService()
 
 
-class ProjectListView(BaseProjectView):
-    def get(self, request: HttpRequest) -> HttpResponse:
-        projects = self.service.get_user_projects_with_tasks(request.user)
+class AsyncProjectView(AsyncLoginRequiredMixin, View):
+    """Base of the read views, served on the event loop under ASGI instead of in a worker thread."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.service = ProjectService()
+
+
+class ProjectListView(AsyncProjectView):
+    async def get(self, request: HttpRequest) -> HttpResponse:
+        projects, next_cursor = await self.service.aget_dashboard_page(request.user)
         create_form = ProjectCreateForm()
-        return render(request, 'home.html', {
+        return await arender(request, 'home.html', {
             'projects': projects,
-            'create_form': create_form
+            'next_cursor': next_cursor,
+            'project_count': await self.service.acount_user_projects(request.user),
+            'project_choices': await self.service.aget_user_project_choices(request.user),
+            'create_form': create_form,
+            'fragment_cache_stats': await FragmentCache().astats() if request.user.is_staff else None,
         })
 
 
+class ProjectPageView(AsyncProjectView):
+    async def get(self, request: HttpRequest) -> HttpResponse:
+        projects, next_cursor = await self.service.aget_dashboard_page(request.user, request.GET.get('cursor'))
+        context = {'projects': projects, 'next_cursor': next_cursor}
+        return await arender(request, 'partials/project_page.html', context)
+
+
+class SearchView(AsyncLoginRequiredMixin, View):
+    async def get(self, request: HttpRequest) -> HttpResponse:
+        """
+        Answer a search-as-you-type request.
+
+        Without `kind`, the first page of both projects and tasks; with `kind` and
+        `cursor`, the next page of one of them, for its "load more" row.
+        """
+        service = SearchService()
+        query = request.GET.get('q', '')
+        kind = request.GET.get('kind')
+        if kind is not None:
+            results, next_cursor = await service.asearch(request.user, query, kind, request.GET.get('cursor'))
+            return render(request, 'partials/search_page.html', {
+                'kind': kind, 'results': results, 'next_cursor': next_cursor, 'query': query,
+            })
+
+        if not service.can_search(query):
+            return HttpResponse('')
+
+        sections = []
+        for kind in SearchService.KINDS:
+            results, next_cursor = await service.asearch(request.user, query, kind)
+            sections.append({'kind': kind, 'results': results, 'next_cursor': next_cursor})
+        return render(request, 'partials/search_results.html', {'sections': sections, 'query': query})
+
+
+class ProjectExportView(BaseProjectView):
+    def get(self, request: HttpRequest) -> StreamingHttpResponse:
+        export_format = request.GET.get('format', NDJSON)
+        export_service = ExportService()
+        lines = export_service.export_user_data(request.user, export_format)
+
+        response = StreamingHttpResponse(lines, content_type=export_service.get_content_type(export_format))
+        response['Content-Disposition'] = f'attachment; filename="taskflow-export.{export_format}"'
+        return response
+
+
 class ProjectCreateView(BaseProjectView):
     def get(self, request: HttpRequest) -> HttpResponse:
         form = ProjectCreateForm()
@@ -45,12 +106,27 @@ class ProjectCreateView(BaseProjectView):
         )
 
 
-class ProjectResourceView(BaseProjectView):
-    def get(self, request: HttpRequest, project_id: int) -> HttpResponse:
-        project = self.service.get_user_project(request.user, project_id)
-        return render(request, 'partials/project_card.html', {'project': project})
+class ProjectResourceView(AsyncProjectView):
+    """
+    Read, update or delete one project card.
 
-    def patch(self, request: HttpRequest, project_id: int) -> HttpResponse:
+    A view's handlers are either all sync or all async, so the writes, which need
+    transactions, run in a worker thread as before.
+    """
+
+    async def get(self, request: HttpRequest, project_id: int) -> HttpResponse:
+        project = await self.service.aget_user_project_card(request.user, project_id)
+        return await arender(request, 'partials/project_card.html', {'project': project})
+
+    async def patch(self, request: HttpRequest, project_id: int) -> HttpResponse:
+        return await sync_to_async(self.update)(request, project_id)
+
+    async def delete(self, request: HttpRequest, project_id: int) -> HttpResponse:
+        project = await sync_to_async(self.service.delete_project)(request.user, project_id)
+        # The card becomes an undo line until the page is reloaded
+        return render(request, 'partials/project_deleted.html', {'project': project})
+
+    def update(self, request: HttpRequest, project_id: int) -> HttpResponse:
         if request.content_type == 'application/x-www-form-urlencoded' and request.body:
             data = QueryDict(request.body)
         else:
@@ -58,14 +134,15 @@ class ProjectResourceView(BaseProjectView):
 
         form = ProjectUpdateForm(data)
         if form.is_valid():
-            project = self.service.update_project(
+            self.service.update_project(
                 user=request.user,
                 project_id=project_id,
                 name=form.cleaned_data['name']
             )
+            project = self.service.get_user_project_card(request.user, project_id)
             return render(request, 'partials/project_card.html', {'project': project})
 
-        project = self.service.get_user_project(request.user, project_id)
+        project = self.service.get_user_project_card(request.user, project_id)
         return render(
             request,
             'partials/project_card.html',
@@ -73,15 +150,18 @@ class ProjectResourceView(BaseProjectView):
             status=422,
         )
 
-    def delete(self, request: HttpRequest, project_id: int) -> HttpResponse:
-        self.service.delete_project(request.user, project_id)
-        return HttpResponse('')
+
+class ProjectRestoreView(BaseProjectView):
+    def post(self, request: HttpRequest, project_id: int) -> HttpResponse:
+        self.service.restore_project(request.user, project_id)
+        project = self.service.get_user_project_card(request.user, project_id)
+        return render(request, 'partials/project_card.html', {'project': project})
 
 
-class ProjectEditFormView(BaseProjectView):
-    def get(self, request: HttpRequest, project_id: int) -> HttpResponse:
-        project = self.service.get_user_project(request.user, project_id)
-        return render(request, 'partials/project_card.html', {
+class ProjectEditFormView(AsyncProjectView):
+    async def get(self, request: HttpRequest, project_id: int) -> HttpResponse:
+        project = await self.service.aget_user_project_card(request.user, project_id)
+        return await arender(request, 'partials/project_card.html', {
             'project': project,
             'editing_mode': True
         })
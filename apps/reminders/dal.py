@@ -0,0 +1,54 @@
+from collections.abc import Sequence
+from datetime import datetime
+
+from django.apps import apps
+from django.db.models import Exists, OuterRef, QuerySet
+
+from apps.reminders.models import TaskReminder
+from apps.utils.dal import BaseRepository
+from apps.utils.decorators import handle_dal_exceptions
+
+
+class TaskReminderRepository(BaseRepository):
+    def __init__(self):
+        super().__init__(TaskReminder)
+
+    def get_due_tasks(self, kind: str, start: datetime, end: datetime) -> QuerySet:
+        """
+        Get the unfinished live tasks of live projects with a deadline in `(start, end]` and no `kind` reminder yet.
+
+        The deadline range and status are read from the partial index `idx_task_live_deadline`.
+        """
+        Task = apps.get_model('tasks', 'Task')
+
+        sent = self.filter_by(task=OuterRef('pk'), kind=kind, deadline=OuterRef('deadline'))
+        return (
+            Task.objects.live().filter(deadline__gt=start, deadline__lte=end, project__deleted_at__isnull=True)
+            .exclude(status=Task.Status.DONE)
+            .filter(~Exists(sent))
+        )
+
+    @handle_dal_exceptions
+    def claim_due_tasks(self, kind: str, start: datetime, end: datetime, limit: int) -> list:
+        """
+        Lock up to `limit` due tasks, earliest deadline first, with their project and owner loaded.
+
+        Rows locked by other workers are skipped rather than waited for (`SKIP LOCKED`), so
+        concurrent workers split the work. Must be called in a transaction, which holds the locks.
+        """
+        tasks = list(
+            self.get_due_tasks(kind, start, end)
+            .select_related('project__user')
+            .select_for_update(skip_locked=True, of=('self',))
+            .order_by('deadline', 'id')[:limit]
+        )
+        # A worker holding a row when the query started may have reminded it before releasing the lock
+        reminded = set(self.filter_by(task__in=tasks, kind=kind).values_list('task_id', 'deadline'))
+        return [task for task in tasks if (task.id, task.deadline) not in reminded]
+
+    @handle_dal_exceptions
+    def record_sent(self, kind: str, tasks: Sequence) -> None:
+        """Record the `kind` reminders of `tasks`. Reminders already recorded are left alone by the unique key."""
+        self.model.objects.bulk_create(
+            [self.model(task=task, kind=kind, deadline=task.deadline) for task in tasks], ignore_conflicts=True
+        )
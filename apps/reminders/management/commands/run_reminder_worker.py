@@ -0,0 +1,48 @@
+import logging
+import signal
+import threading
+
+from django.conf import settings
+from django.core.management import BaseCommand
+from django.db import close_old_connections
+from django.utils import timezone
+
+from apps.reminders.services import ReminderService
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Send deadline reminders, polling until stopped (SIGINT/SIGTERM). Several workers can run at once.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Send what is due now and exit')
+        parser.add_argument(
+            '--interval', type=float, default=None, help='Seconds between passes (default: REMINDER_POLL_SECONDS)'
+        )
+
+    def handle(self, *args, **options):  # noqa: ARG002
+        service = ReminderService()
+        interval = options['interval'] if options['interval'] is not None else settings.REMINDER_POLL_SECONDS
+        stop = threading.Event()
+        if not options['once']:
+            for signum in (signal.SIGINT, signal.SIGTERM):
+                signal.signal(signum, lambda *_: stop.set())
+
+        while True:
+            # Long-running: honour CONN_MAX_AGE and drop broken connections between passes
+            close_old_connections()
+            try:
+                sent = service.run_once(timezone.now())
+            except Exception:
+                if options['once']:
+                    raise
+                # Database or delivery failure: the claimed tasks were rolled back and are retried on the next pass
+                logger.exception('Reminder pass failed, retrying in %s s', interval)
+            else:
+                if sent:
+                    self.stdout.write(f'Sent {sent} reminders')
+            if options['once'] or stop.wait(interval):
+                break
+
+        self.stdout.write(self.style.SUCCESS('Reminder worker stopped'))
@@ -0,0 +1,42 @@
+# Generated by Django 5.2 on 2026-10-18 05:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('tasks', '0006_task_name_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReminderWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('upcoming', 'Deadline coming up'), ('overdue', 'Deadline passed')], max_length=20, unique=True)),
+                ('scanned_until', models.DateTimeField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'reminders_watermark',
+            },
+        ),
+        migrations.CreateModel(
+            name='TaskReminder',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('upcoming', 'Deadline coming up'), ('overdue', 'Deadline passed')], max_length=20)),
+                ('deadline', models.DateTimeField()),
+                ('sent_at', models.DateTimeField(auto_now_add=True)),
+                ('task', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='reminders', to='tasks.task')),
+            ],
+            options={
+                'db_table': 'reminders_task_reminder',
+                'constraints': [models.UniqueConstraint(fields=('task', 'kind', 'deadline'), name='uniq_reminder_task_kind_deadline')],
+            },
+        ),
+    ]
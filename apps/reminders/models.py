@@ -0,0 +1,30 @@
+from django.db import models
+
+
+class TaskReminder(models.Model):
+    """
+    A reminder sent about one task deadline.
+
+    Unique per task, kind and deadline: a worker can never send the same reminder twice,
+    while moving the deadline arms the task again.
+    """
+
+    class Kind(models.TextChoices):
+        UPCOMING = 'upcoming', 'Deadline coming up'
+        OVERDUE = 'overdue', 'Deadline passed'
+
+    # Lookups by task are served by the unique constraint, which starts with it
+    task = models.ForeignKey('tasks.Task', on_delete=models.CASCADE, related_name='reminders', db_index=False)
+    kind = models.CharField(max_length=20, choices=Kind.choices)
+    deadline = models.DateTimeField()
+    sent_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'reminders_task_reminder'
+        constraints = [
+            models.UniqueConstraint(fields=['task', 'kind', 'deadline'], name='uniq_reminder_task_kind_deadline'),
+        ]
+
+    def __str__(self):
+        return f'{self.get_kind_display()}: task {self.task_id}'
+
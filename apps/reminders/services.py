@@ -0,0 +1,49 @@
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+from apps.reminders.dal import TaskReminderRepository
+from apps.reminders.models import TaskReminder
+from apps.reminders.sinks import ReminderSink
+
+class ReminderService:
+    """
+    Send "upcoming" reminders `REMINDER_LEAD_MINUTES` before task deadlines and "overdue" ones once they pass.
+
+    Every pass scans the whole window of each kind, from now to the lead time ahead for "upcoming"
+    and from `REMINDER_MAX_LATENESS_MINUTES` ago to now for "overdue", so a deadline created or
+    moved into a window is reminded on the next pass. Tasks already reminded are filtered out by
+    the `TaskReminder` unique key. Several workers can run at once: they claim tasks with
+    `SKIP LOCKED`. After downtime, deadlines that fell out of the overdue window are skipped rather
+    than reported late.
+    """
+
+    KINDS = (TaskReminder.Kind.UPCOMING, TaskReminder.Kind.OVERDUE)
+
+    def __init__(self, reminder_dal=None, sink: ReminderSink | None = None):
+        self.reminder_dal = reminder_dal or TaskReminderRepository()
+        self.sink = sink or import_string(settings.REMINDER_SINK)()
+
+    def run_once(self, now: datetime) -> int:
+        """Send every reminder due at `now`. Returns how many were sent."""
+        return sum(self._scan(kind, now) for kind in self.KINDS)
+
+    def _scan(self, kind: str, now: datetime) -> int:
+        if kind == TaskReminder.Kind.UPCOMING:
+            start, end = now, now + timedelta(minutes=settings.REMINDER_LEAD_MINUTES)
+        else:
+            start, end = now - timedelta(minutes=settings.REMINDER_MAX_LATENESS_MINUTES), now
+
+        batch_size = settings.REMINDER_BATCH_SIZE
+        sent = 0
+        while True:
+            with transaction.atomic():
+                tasks = self.reminder_dal.claim_due_tasks(kind, start, end, batch_size)
+                if tasks:
+                    self.reminder_dal.record_sent(kind, tasks)
+                    self.sink.send(kind, tasks)
+            sent += len(tasks)
+            if len(tasks) < batch_size:
+                return sent
@@ -0,0 +1,57 @@
+"""Destinations for deadline reminders. `REMINDER_SINK` names the one the worker uses."""
+import logging
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.utils import timezone
+
+from apps.reminders.models import TaskReminder
+
+if TYPE_CHECKING:
+    from apps.tasks.models import Task
+
+logger = logging.getLogger(__name__)
+
+
+class ReminderSink(ABC):
+    """
+    Deliver a batch of reminders of one kind.
+
+    Called inside the transaction that records them: raising rolls the batch back,
+    so it is sent again on the next pass. Tasks come with `project.user` loaded.
+    """
+
+    @abstractmethod
+    def send(self, kind: str, tasks: Sequence['Task']) -> None:
+        ...
+
+
+class EmailSink(ReminderSink):
+    """Email each task's owner, over one connection per batch (`EMAIL_BACKEND`)."""
+
+    def send(self, kind: str, tasks: Sequence['Task']) -> None:
+        messages = [
+            EmailMessage(self.subject(kind, task), self.body(kind, task), to=[task.project.user.email])
+            for task in tasks
+        ]
+        get_connection().send_messages(messages)
+
+    def subject(self, kind: str, task: 'Task') -> str:
+        state = 'is due soon' if kind == TaskReminder.Kind.UPCOMING else 'is overdue'
+        return f'{settings.ACCOUNT_EMAIL_SUBJECT_PREFIX}"{task.name}" {state}'
+
+    def body(self, kind: str, task: 'Task') -> str:
+        deadline = timezone.localtime(task.deadline).strftime('%b %d, %Y %H:%M')
+        verb = 'is due' if kind == TaskReminder.Kind.UPCOMING else 'was due'
+        return f'Your task "{task.name}" in project "{task.project.name}" {verb} on {deadline}.\n'
+
+
+class LogSink(ReminderSink):
+    """Only log the reminders, e.g. in development."""
+
+    def send(self, kind: str, tasks: Sequence['Task']) -> None:
+        for task in tasks:
+            logger.info('Reminder %s: task %s due %s (user %s)', kind, task.id, task.deadline, task.project.user_id)
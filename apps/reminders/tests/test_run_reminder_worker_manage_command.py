@@ -0,0 +1,46 @@
+from datetime import timedelta
+from io import StringIO
+from smtplib import SMTPException
+from unittest.mock import Mock, patch
+
+from django.core import mail
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.accounts.tests.factories import UserFactory
+from apps.projects.models import Project
+from apps.reminders.models import TaskReminder
+from apps.reminders.services import ReminderService
+from apps.tasks.models import Task
+
+
+class RunReminderWorkerManageCommandTestCase(TestCase):
+    def test_once_sends_due_reminders_and_exits(self):
+        user = UserFactory()
+        project = Project.objects.create(name='Launch', user=user)
+        task = Task.objects.create(name='Ship it', project=project, deadline=timezone.now() + timedelta(minutes=5))
+
+        out = StringIO()
+        call_command('run_reminder_worker', once=True, stdout=out)
+
+        self.assertIn('Sent 1 reminders', out.getvalue())
+        self.assertIn('Reminder worker stopped', out.getvalue())
+        self.assertEqual(TaskReminder.objects.get().task, task)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertIn('Ship it', mail.outbox[0].body)
+
+    def test_delivery_failures_do_not_stop_the_worker(self):
+        stop = Mock()
+        stop.wait.side_effect = [False, True]
+        with (
+            patch('apps.reminders.management.commands.run_reminder_worker.threading.Event', return_value=stop),
+            patch('apps.reminders.management.commands.run_reminder_worker.signal.signal'),
+            patch.object(ReminderService, 'run_once', side_effect=[SMTPException('Connection refused'), 2]) as run_once,
+            self.assertLogs('apps.reminders.management.commands.run_reminder_worker', 'ERROR'),
+        ):
+            out = StringIO()
+            call_command('run_reminder_worker', stdout=out)
+
+        self.assertEqual(run_once.call_count, 2)
+        self.assertIn('Sent 2 reminders', out.getvalue())
@@ -0,0 +1,102 @@
+from datetime import timedelta
+from unittest.mock import Mock
+
+from django.core import mail
+from django.test import TestCase
+from django.test import override_settings
+from django.utils import timezone
+
+from apps.accounts.tests.factories import UserFactory
+from apps.projects.models import Project
+from apps.reminders.models import TaskReminder
+from apps.reminders.services import ReminderService
+from apps.reminders.sinks import EmailSink
+from apps.tasks.models import Task
+
+
+@override_settings(
+    REMINDER_LEAD_MINUTES=60,
+    REMINDER_MAX_LATENESS_MINUTES=60,
+    REMINDER_BATCH_SIZE=2,
+    REMINDER_SINK='apps.reminders.sinks.EmailSink',
+)
+class ReminderServiceTestCase(TestCase):
+    def setUp(self):
+        self.now = timezone.now().replace(microsecond=0)
+        self.user = UserFactory()
+        self.project = Project.objects.create(name='Launch', user=self.user)
+        self.service = ReminderService()
+
+    def create_task(self, minutes: int, **fields) -> Task:
+        return Task.objects.create(
+            name=f'Due in {minutes}', project=self.project, deadline=self.now + timedelta(minutes=minutes), **fields
+        )
+
+    def test_sends_upcoming_and_overdue_reminders_once(self):
+        upcoming = [self.create_task(minutes) for minutes in (20, 40, 50)]
+        self.create_task(90)
+        self.create_task(30, status=Task.Status.DONE)
+
+        self.assertEqual(self.service.run_once(self.now), 3)
+        self.assertEqual(self.service.run_once(self.now + timedelta(minutes=1)), 0)
+
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual(mail.outbox[0].to, [self.user.email])
+        self.assertIn('is due soon', mail.outbox[0].subject)
+        self.assertEqual(
+            set(TaskReminder.objects.values_list('task_id', flat=True)), {task.id for task in upcoming}
+        )
+
+        # Once the first deadline passes, it is reminded as overdue
+        self.assertEqual(self.service.run_once(self.now + timedelta(minutes=21)), 1)
+        self.assertIn('is overdue', mail.outbox[-1].subject)
+
+    def test_moved_deadline_is_reminded_again(self):
+        task = self.create_task(10)
+        self.service.run_once(self.now)
+
+        task.deadline = self.now + timedelta(minutes=70)
+        task.save()
+
+        self.assertEqual(self.service.run_once(self.now + timedelta(minutes=15)), 1)
+        self.assertEqual(TaskReminder.objects.filter(task=task, kind=TaskReminder.Kind.UPCOMING).count(), 2)
+
+    def test_deadline_set_inside_the_window_is_reminded(self):
+        self.create_task(10)
+        self.service.run_once(self.now)
+
+        # Created after the last pass, already less than the lead time away
+        task = self.create_task(30)
+        self.assertEqual(ReminderService().run_once(self.now + timedelta(minutes=1)), 1)
+        self.assertEqual(TaskReminder.objects.get(task=task).kind, TaskReminder.Kind.UPCOMING)
+
+    def test_recording_a_reminder_twice_keeps_one(self):
+        task = self.create_task(10)
+        self.service.run_once(self.now)
+
+        # Another worker recorded it first: the unique key drops the duplicate
+        self.service.reminder_dal.record_sent(TaskReminder.Kind.UPCOMING, [task])
+        self.assertEqual(TaskReminder.objects.filter(task=task).count(), 1)
+
+    def test_skips_deadlines_missed_while_stopped(self):
+        self.create_task(10)
+        late_task = self.create_task(170)
+        self.service.run_once(self.now)
+
+        # Stopped for three hours: the overdue reminder of the first task is too late to send
+        self.assertEqual(self.service.run_once(self.now + timedelta(minutes=180)), 1)
+        overdue = TaskReminder.objects.filter(kind=TaskReminder.Kind.OVERDUE)
+        self.assertEqual([reminder.task_id for reminder in overdue], [late_task.id])
+
+    def test_failed_delivery_is_retried(self):
+        self.create_task(10)
+        sink = Mock(spec=EmailSink)
+        sink.send.side_effect = [OSError('SMTP down'), None]
+        service = ReminderService(sink=sink)
+
+        with self.assertRaises(OSError):
+            service.run_once(self.now)
+        self.assertFalse(TaskReminder.objects.exists())
+
+        self.assertEqual(service.run_once(self.now), 1)
+        self.assertEqual(sink.send.call_count, 2)
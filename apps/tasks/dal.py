@@ -1,10 +1,22 @@
+import csv
+import io
+from collections.abc import Sequence
 from datetime import datetime
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
-from django.db.models import Case, IntegerField, QuerySet, When
+from django.apps import apps
+from django.db import connection, transaction
+from django.db.models import Exists, OuterRef, Q, QuerySet
+from django.db.models.functions import Length
+from django.utils import timezone
 
 from apps.tasks.models import Task
 from apps.utils.dal import BaseRepository
+from apps.utils.decorators import handle_dal_exceptions
+from apps.utils.fragment_cache import FragmentCache
+from apps.utils.pagination import keyset_filter
+from apps.utils.ranking import key_between, spaced_keys
+from apps.utils.search import SEARCH_ORDERING, search_by_name
 
 if TYPE_CHECKING:
     from apps.accounts.models import User
@@ -12,17 +24,152 @@ if TYPE_CHECKING:
 
 
 class TaskRepository(BaseRepository):
+    PAGE_ORDERING = Task.SORTED_ORDERING
+    EXPORT_FIELDS = (
+        'id', 'project_id', 'name', 'status', 'priority', 'deadline', 'position', 'created_at', 'updated_at'
+    )
+
     def __init__(self):
         super().__init__(Task)
 
+    def get_queryset(self) -> QuerySet:
+        # Deleted tasks are hidden from every read and write until restored or purged. The tasks of
+        # deleted projects are only kept from the writes that move counters (see `_in_live_project`)
+        return self.model.objects.live()
+
+    def invalidate_cache(self, instance: Task) -> None:
+        FragmentCache().bump_project_version(instance.project_id)
+
     def get_by_id(self, task_id: int):
-        return self.model.objects.select_related('project', 'project__user').get(id=task_id)
+        return self.get_queryset().select_related('project', 'project__user').get(id=task_id)
+
+    @handle_dal_exceptions(retry=True)
+    def get_owned(self, user: 'User', task_id: int, fields: Sequence[str] = ()) -> Task | None:
+        """
+        Get a task only if it belongs to one of the user's projects, in one indexed query.
+
+        `fields` limits the columns read. Returns `None` when the task is missing or not owned.
+        """
+        tasks = self.get_all().filter(self._owned_by(user, task_id))
+        if fields:
+            tasks = tasks.only(*fields)
+        return tasks.first()
+
+    def search_by_user(self, user: 'User', text: str, after: list | None, limit: int) -> QuerySet:
+        """
+        Get one keyset page of the user's tasks whose name matches `text`, annotated with `rank`.
+
+        Each task carries the id and name of its project, for linking the result.
+        """
+        tasks = (
+            # Tasks of a tombstoned project are hidden with it; the project is joined anyway
+            search_by_name(self.filter_by(user_id=user.id, project__deleted_at__isnull=True), text)
+            .select_related('project')
+            .only('id', 'name', 'status', 'project__id', 'project__name')
+        )
+        if after is not None:
+            tasks = tasks.filter(keyset_filter(SEARCH_ORDERING, after))
+        return tasks.order_by(*SEARCH_ORDERING)[:limit]
+
+    @handle_dal_exceptions(retry=True)
+    async def aget_owned(self, user: 'User', task_id: int) -> Task | None:
+        """Async `get_owned`."""
+        return await self.get_all().filter(self._owned_by(user, task_id)).afirst()
+
+    @handle_dal_exceptions
+    def update_owned(self, user: 'User', task_id: int, condition: Q | None = None, **values: Any) -> Task | None:
+        """
+        Update a task with a single conditional `UPDATE ... WHERE id = ? AND user_id = ? RETURNING *`.
+
+        `condition` adds further guards (e.g. on the current status). Tasks of deleted projects
+        are left alone. Returns the updated task, or `None` when no row matched.
+        """
+        filters = self._owned_by(user, task_id) & Q(self._in_live_project())
+        if condition is not None:
+            filters &= condition
+
+        tasks = self.update_returning(filters, **values)
+        if not tasks:
+            return None
+
+        self.invalidate_cache(tasks[0])
+        return tasks[0]
+
+    def create(self, **kwargs: Any) -> Task:
+        if not kwargs.get('position'):
+            # New tasks go to the end of the project's active list
+            project_id = kwargs['project'].id if 'project' in kwargs else kwargs['project_id']
+            kwargs['position'] = key_between(self.get_last_position(project_id), None)
+        return super().create(**kwargs)
+
+    @handle_dal_exceptions(retry=True)
+    def lock_owned(self, user: 'User', task_ids: Sequence[int]) -> list[Task]:
+        """
+        Get and row-lock the user's tasks among `task_ids` in one query, for a bulk write.
+
+        Only the columns the bulk writes, the counters and the Undo line of deleted tasks need are
+        read, and tasks of deleted projects are left out. Call inside a transaction.
+        """
+        return list(
+            self.filter_by(id__in=task_ids, user_id=user.id)
+            .filter(self._in_live_project())
+            .order_by('id')
+            .select_for_update()
+            .only('id', 'project_id', 'name', 'status', 'deadline')
+        )
+
+    @handle_dal_exceptions(retry=True)
+    def update_many(self, tasks: Sequence[Task], **values: Any) -> int:
+        """Update `tasks` with one `UPDATE ... WHERE id IN (...)` and invalidate their projects' cards."""
+        updated = self.update_where(Q(id__in=[task.id for task in tasks]), **values)
+        self._invalidate_projects(tasks)
+        return updated
+
+    @handle_dal_exceptions(retry=True)
+    def tombstone_many(self, tasks: Sequence[Task], now: datetime) -> int:
+        """Mark `tasks` deleted with one `UPDATE ... WHERE id IN (...)` and invalidate their projects' cards."""
+        deleted = self.update_where(Q(id__in=[task.id for task in tasks]), deleted_at=now)
+        for task in tasks:
+            task.deleted_at = now
+        self._invalidate_projects(tasks)
+        return deleted
+
+    @handle_dal_exceptions
+    def insert_many(self, tasks: Sequence[Task], *, use_copy: bool = False) -> int:
+        """
+        Insert `tasks` in one statement: `COPY ... FROM STDIN` on Postgres when `use_copy` is set, else `bulk_create`.
+
+        The tasks must carry their `user_id` and `position`: neither path calls `Task.save`.
+        """
+        if use_copy and connection.vendor == 'postgresql':
+            self._copy_insert(tasks)
+        else:
+            self.model.objects.bulk_create(tasks, batch_size=len(tasks))
+        self._invalidate_projects(tasks)
+        return len(tasks)
+
+    def get_by_ids(self, task_ids: Sequence[int]) -> list[Task]:
+        return list(self.filter_by(id__in=task_ids).order_by(*self.PAGE_ORDERING))
+
+    def update(self, instance: Task, **kwargs: Any) -> Task:
+        if 'project' in kwargs:
+            # Moving a task also moves its denormalized owner
+            kwargs['user_id'] = kwargs['project'].user_id
+        return super().update(instance, **kwargs)
 
     def get_by_user(self, user: 'User') -> QuerySet:
         return self.filter_by(
-            project__user=user,
+            user=user,
         ).select_related('project')
 
+    def get_export_rows(self, user: 'User') -> QuerySet:
+        """Get the user's tasks as plain dicts, project by project in list order, for streaming with `.iterator()`."""
+        return (
+            self.filter_by(user=user, project__deleted_at__isnull=True)
+            .order_by('project_id', *self.PAGE_ORDERING)
+            .values(*self.EXPORT_FIELDS)
+        )
+
     def get_by_status(self, status: str) -> QuerySet:
         return self.filter_by(status=status).select_related('project')
 
@@ -36,28 +183,177 @@ class TaskRepository(BaseRepository):
         return self.filter_by(priority=priority).select_related('project')
 
     def get_by_status_and_user(self, status: str, user: 'User') -> QuerySet:
+        """Get the user's tasks in one status, highest priority first, from `idx_task_live_user_status`."""
         return self.filter_by(
             status=status,
-            project__user=user,
-        ).select_related('project')
+            user=user,
+        ).select_related('project').order_by('-priority', '-created_at')
 
     def get_by_priority_and_user(self, priority: int, user: 'User') -> QuerySet:
         return self.filter_by(
             priority=priority,
-            project__user=user,
+            user=user,
         ).select_related('project')
 
     def get_by_project_sorted(self, project: 'Project') -> QuerySet:
-        """Get tasks sorted with active tasks by priority, done tasks at bottom."""
-        return self.filter_by(project=project).order_by(
-            Case(
-                When(status='in_progress', then=1),
-                When(status='done', then=2),
-                output_field=IntegerField(),
-            ),
-            '-priority',
-            '-created_at',
+        """Get tasks sorted with active tasks in manual order, done tasks at bottom."""
+        return self.filter_by(project=project).order_by(*Task.SORTED_ORDERING)
+
+    def get_page_by_project(self, project: 'Project', after: list | None, limit: int) -> QuerySet:
+        """Get one keyset page of the project's tasks in the dashboard sort order."""
+        tasks = self.filter_by(project=project)
+        if after is not None:
+            tasks = tasks.filter(keyset_filter(self.PAGE_ORDERING, after))
+
+        return tasks.order_by(*self.PAGE_ORDERING)[:limit]
+
+    def get_preceding_id(self, task: Task) -> int | None:
+        """Get the id of the task sorted right before `task` in its project, or `None` if it is first."""
+        reverse_ordering = [field[1:] if field.startswith('-') else f'-{field}' for field in self.PAGE_ORDERING]
+        values = [getattr(task, field.lstrip('-')) for field in self.PAGE_ORDERING]
+        return (
+            self.filter_by(project_id=task.project_id)
+            .filter(keyset_filter(reverse_ordering, values))
+            .order_by(*reverse_ordering)
+            .values_list('id', flat=True)
+            .first()
+        )
+
+    def get_last_position(self, project_id: int) -> str | None:
+        """Get the highest position among the project's active tasks, from `idx_task_live_position`."""
+        position = (
+            self.filter_by(project_id=project_id, sort_rank=0)
+            .order_by('-position')
+            .values_list('position', flat=True)
+            .first()
+        )
+        return position or None
+
+    @handle_dal_exceptions(retry=True)
+    def get_owned_positions(self, user: 'User', task_ids: Sequence[int]) -> dict[int, Task]:
+        """Get the user's tasks among `task_ids`, with only their project and position, keyed by id."""
+        tasks = self.filter_by(id__in=task_ids, user_id=user.id).only('id', 'project_id', 'position')
+        return {task.id: task for task in tasks}
+
+    @handle_dal_exceptions(retry=True)
+    def rebalance_project(self, project_id: int) -> int:
+        """
+        Rewrite every position of a project with short, evenly spaced keys, keeping the order.
+
+        Runs in one transaction with the project's tasks locked. Returns the number of tasks.
+        """
+        with transaction.atomic():
+            tasks = list(
+                self.filter_by(project_id=project_id).order_by(*self.PAGE_ORDERING).select_for_update().only('id')
+            )
+            for task, position in zip(tasks, spaced_keys(len(tasks)), strict=True):
+                task.position = position
+            self.model.objects.bulk_update(tasks, ['position'], batch_size=1000)
+
+        FragmentCache().bump_project_version(project_id)
+        return len(tasks)
+
+    def get_project_ids_to_rebalance(self, max_length: int, after_id: int, limit: int) -> list[int]:
+        """Get the next projects above `after_id` holding a position longer than `max_length`."""
+        return list(
+            self.filter_by(project_id__gt=after_id)
+            .annotate(position_length=Length('position'))
+            .filter(position_length__gt=max_length)
+            .order_by('project_id')
+            .values_list('project_id', flat=True)
+            .distinct()[:limit]
         )
 
     def count_by_project(self, project: 'Project') -> int:
         return self.filter_by(project=project).count()
+
+    @handle_dal_exceptions(retry=True)
+    def tombstone(self, task: Task, now: datetime) -> bool:
+        """
+        Mark a task deleted with a single-row `UPDATE`, leaving its index entries in place for a restore.
+
+        Returns `False`, writing nothing, if the task is gone or its project is deleted.
+        """
+        if not self.update_where(Q(id=task.id) & Q(self._in_live_project()), deleted_at=now):
+            return False
+        task.deleted_at = now
+        self.invalidate_cache(task)
+        return True
+
+    @handle_dal_exceptions(retry=True)
+    def restore_owned(self, user: 'User', task_id: int, deleted_since: datetime) -> Task | None:
+        """
+        Undo the deletion of one of the user's tasks, if it was deleted at `deleted_since` or later.
+
+        Older deletions may already be under purge, and the tasks of a deleted project wait for
+        the project to be restored first. Returns the task, or `None` if none matched.
+        """
+        restorable = self.model.objects.deleted().filter(
+            id=task_id, user_id=user.id, deleted_at__gte=deleted_since, project__deleted_at__isnull=True
+        )
+        if not restorable.update(deleted_at=None, updated_at=timezone.now()):
+            return None
+        task = self.get_queryset().get(id=task_id)
+        self.invalidate_cache(task)
+        return task
+
+    @handle_dal_exceptions(retry=True)
+    def purge_deleted_batch(self, before: datetime, after: list | None, batch_size: int) -> tuple[list | None, int]:
+        """
+        Delete for good the next `batch_size` tasks deleted before `before`, oldest first, in one transaction.
+
+        Batches walk `idx_task_deleted` from the last purged key, so none rescans the entries
+        the previous ones left behind, and each is a short transaction that autovacuum can
+        clean up after. Returns the `(deleted_at, id)` key of the last task (`None` when done) and the number purged.
+        """
+        tasks = self.model.objects.deleted().filter(deleted_at__lt=before)
+        if after is not None:
+            tasks = tasks.filter(keyset_filter(('deleted_at', 'id'), after))
+        with transaction.atomic():
+            keys = list(tasks.order_by('deleted_at', 'id').values_list('deleted_at', 'id')[:batch_size])
+            if not keys:
+                return None, 0
+            # A bounded batch, so Django's collector only loads that many tasks to cascade to their reminders
+            _, deleted = self.model.objects.filter(id__in=[task_id for _, task_id in keys]).delete()
+        return list(keys[-1]), deleted.get('tasks.Task', 0)
+
+    def _copy_insert(self, tasks: Sequence[Task]) -> None:
+        columns = (
+            'name', 'project_id', 'user_id', 'status', 'priority', 'deadline', 'position', 'created_at', 'updated_at'
+        )
+        now = timezone.now()
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for task in tasks:
+            # An unquoted empty field is NULL in COPY's CSV format
+            deadline = task.deadline.isoformat() if task.deadline else ''
+            row = (task.name, task.project_id, task.user_id, task.status, task.priority, deadline, task.position)
+            writer.writerow((*row, now.isoformat(), now.isoformat()))
+        buffer.seek(0)
+
+        quote = connection.ops.quote_name
+        sql = (
+            f'COPY {quote(self.model._meta.db_table)} ({", ".join(quote(column) for column in columns)}) '
+            'FROM STDIN WITH (FORMAT csv)'
+        )
+        with connection.cursor() as cursor:
+            driver_cursor = cursor.cursor
+            if hasattr(driver_cursor, 'copy_expert'):  # psycopg2
+                driver_cursor.copy_expert(sql, buffer)
+            else:  # psycopg 3
+                with driver_cursor.copy(sql) as copy:
+                    copy.write(buffer.getvalue())
+
+    def _invalidate_projects(self, tasks: Sequence[Task]) -> None:
+        fragment_cache = FragmentCache()
+        for project_id in {task.project_id for task in tasks}:
+            fragment_cache.bump_project_version(project_id)
+
+    def _in_live_project(self) -> Exists:
+        # A lookup of the project by primary key rather than a join, so an `UPDATE` filtering on it
+        # stays a plain `UPDATE ... WHERE` instead of `WHERE id IN (SELECT ... JOIN ...)`
+        Project = apps.get_model('projects', 'Project')
+        return Exists(Project.objects.live().filter(id=OuterRef('project_id')))
+
+    def _owned_by(self, user: 'User', task_id: int) -> Q:
+        return Q(id=task_id, user_id=user.id)
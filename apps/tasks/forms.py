@@ -101,3 +101,50 @@ class TaskUpdateForm(forms.ModelForm):
                 }
             ),
         }
+
+
+class TaskMoveForm(forms.Form):
+    """Drop target of a dragged task: the ids of the tasks it now sits between."""
+
+    after_id = forms.IntegerField(required=False)
+    before_id = forms.IntegerField(required=False)
+
+
+class TaskIdsField(forms.Field):
+    """A list of task ids, posted as repeated `task_ids` values."""
+
+    widget = forms.MultipleHiddenInput
+
+    def to_python(self, value):
+        if not value:
+            return []
+        try:
+            return [int(task_id) for task_id in value]
+        except (TypeError, ValueError) as error:
+            message = 'Enter a list of task ids.'
+            raise forms.ValidationError(message, code='invalid') from error
+
+
+class TaskBulkForm(forms.Form):
+    """One bulk action applied to the selected tasks."""
+
+    COMPLETE = 'complete'
+    DELETE = 'delete'
+    PRIORITY = 'priority'
+    MOVE = 'move'
+
+    action = forms.ChoiceField(
+        choices=[(COMPLETE, 'Complete'), (DELETE, 'Delete'), (PRIORITY, 'Set priority'), (MOVE, 'Move')]
+    )
+    task_ids = TaskIdsField()
+    priority = forms.TypedChoiceField(choices=Task.Priority.choices, coerce=int, required=False)
+    project_id = forms.IntegerField(required=False)
+
+    def clean(self):
+        cleaned_data = super().clean()
+        action = cleaned_data.get('action')
+        if action == self.PRIORITY and not cleaned_data.get('priority'):
+            self.add_error('priority', 'Choose a priority')
+        if action == self.MOVE and not cleaned_data.get('project_id'):
+            self.add_error('project_id', 'Choose a project')
+        return cleaned_data
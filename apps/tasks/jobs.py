@@ -0,0 +1,8 @@
+"""Background job handlers of the tasks app, run by `run_job_worker`."""
+from apps.jobs.registry import register
+from apps.tasks.dal import TaskRepository
+
+
+@register('tasks.rebalance_project', label='Repairing the task order')
+def rebalance_project(project_id: int) -> dict[str, int]:
+    return {'tasks': TaskRepository().rebalance_project(project_id)}
@@ -0,0 +1,54 @@
+import sys
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import BaseCommand, CommandError
+
+from apps.tasks.services import TaskService
+from apps.utils.streaming import CONTENT_TYPES, NDJSON
+
+
+class Command(BaseCommand):
+    help = "Import tasks from a CSV or NDJSON file (the export format) into a user's projects"
+
+    def add_arguments(self, parser):
+        parser.add_argument('email', help='Email of the user who will own the tasks')
+        parser.add_argument('path', help='File to read, or - for stdin')
+        parser.add_argument('--format', choices=tuple(CONTENT_TYPES), help='Input format (default: from the extension)')
+        parser.add_argument(
+            '--batch-size', type=int, default=settings.TASK_IMPORT_BATCH_SIZE, help='Tasks inserted per transaction'
+        )
+        parser.add_argument('--no-copy', action='store_true', help='Use INSERT even where Postgres COPY is available')
+        parser.add_argument('--show-errors', type=int, default=20, help='Number of row errors to print')
+
+    def handle(self, *args, **options):  # noqa: ARG002
+        user_class = get_user_model()
+        try:
+            user = user_class.objects.get(email=options['email'])
+        except user_class.DoesNotExist as error:
+            message = f'No user with email {options["email"]}'
+            raise CommandError(message) from error
+
+        path = options['path']
+        fmt = options['format'] or (Path(path).suffix.lstrip('.').lower() if path != '-' else NDJSON)
+        if fmt not in CONTENT_TYPES:
+            message = f'Cannot tell the format of {path}, pass --format'
+            raise CommandError(message)
+
+        service = TaskService()
+        import_options = {'batch_size': options['batch_size'], 'use_copy': not options['no_copy']}
+        if path == '-':
+            report = service.import_tasks(user, sys.stdin, fmt, **import_options)
+        else:
+            with Path(path).open(newline='', encoding='utf-8') as lines:
+                report = service.import_tasks(user, lines, fmt, **import_options)
+
+        for line_number, error in report.errors[: options['show_errors']]:
+            self.stderr.write(f'Line {line_number}: {error}')
+
+        summary = (
+            f'Imported {report.created} task(s) from {report.rows} row(s) with {len(report.errors)} error(s) '
+            f'in {report.seconds:.2f}s ({report.rows_per_second:.0f} rows/s)'
+        )
+        self.stdout.write(self.style.SUCCESS(summary) if not report.errors else self.style.WARNING(summary))
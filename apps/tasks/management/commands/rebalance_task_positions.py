@@ -0,0 +1,33 @@
+from django.conf import settings
+from django.core.management import BaseCommand
+
+from apps.tasks.dal import TaskRepository
+
+
+class Command(BaseCommand):
+    help = 'Rewrite the manual task positions of projects whose keys have grown too long'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--max-length',
+            type=int,
+            default=settings.TASK_POSITION_MAX_LENGTH,
+            help='Rebalance projects holding a position longer than this',
+        )
+        parser.add_argument('--batch-size', type=int, default=100, help='Projects looked up per scan')
+
+    def handle(self, *args, **options):  # noqa: ARG002
+        repository = TaskRepository()
+        last_id = 0
+        projects = 0
+
+        while project_ids := repository.get_project_ids_to_rebalance(
+            options['max_length'], last_id, options['batch_size']
+        ):
+            for project_id in project_ids:
+                tasks = repository.rebalance_project(project_id)
+                projects += 1
+                self.stdout.write(f'Project {project_id}: {tasks} task positions rewritten')
+            last_id = project_ids[-1]
+
+        self.stdout.write(self.style.SUCCESS(f'Task positions rebalanced in {projects} project(s)'))
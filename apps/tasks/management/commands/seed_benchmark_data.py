@@ -0,0 +1,169 @@
+import argparse
+import random
+import time
+from collections.abc import Iterator
+from datetime import datetime, timedelta
+from itertools import accumulate
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from apps.projects.dal import ProjectRepository
+from apps.projects.models import Project
+from apps.tasks.dal import TaskRepository
+from apps.tasks.models import Task
+from apps.utils.ranking import iter_spaced_keys
+
+VERBS = ('Review', 'Update', 'Fix', 'Write', 'Plan', 'Test', 'Refactor', 'Document', 'Deploy', 'Call')
+NOUNS = ('report', 'budget', 'release', 'invoice', 'design', 'roadmap', 'backlog', 'contract', 'demo', 'survey')
+# Most common first: priorities are Zipf-distributed over this order
+PRIORITY_RANKS = (
+    Task.Priority.MEDIUM,
+    Task.Priority.LOW,
+    Task.Priority.HIGH,
+    Task.Priority.VERY_LOW,
+    Task.Priority.VERY_HIGH,
+)
+DONE_SHARE = 0.3
+NO_DEADLINE_SHARE = 0.4
+PAST_DEADLINE_SHARE = 0.2
+
+
+def parse_moment(value: str) -> datetime:
+    """An ISO 8601 date or datetime, in the current time zone unless it gives an offset."""
+    try:
+        moment = datetime.fromisoformat(value)
+    except ValueError as error:
+        message = f'Not an ISO 8601 date or datetime: {value!r}'
+        raise argparse.ArgumentTypeError(message) from error
+    return timezone.make_aware(moment) if timezone.is_naive(moment) else moment
+
+
+def zipf_weights(count: int, exponent: float) -> list[float]:
+    return [1 / rank**exponent for rank in range(1, count + 1)]
+
+
+def split_by_weight(total: int, weights: list[float]) -> list[int]:
+    """Split `total` into integer parts proportional to `weights`, handing the remainder to the heaviest."""
+    weight_sum = sum(weights)
+    parts = [int(total * weight / weight_sum) for weight in weights]
+    for index in range(total - sum(parts)):
+        parts[index % len(parts)] += 1
+    return parts
+
+
+class Command(BaseCommand):
+    BENCHMARK_PASSWORD = 'benchmark'  # nosec  # noqa: S105
+    help = 'Create a large, skewed and reproducible dataset of users, projects and tasks for load and benchmark tests'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10, help='Number of users to create')
+        parser.add_argument('--projects-per-user', type=int, default=5, help='Projects created for each user')
+        parser.add_argument('--tasks', type=int, default=100_000, help='Total tasks, spread over all projects')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed: the same seed gives the same data')
+        parser.add_argument(
+            '--now',
+            type=parse_moment,
+            default=None,
+            help='Moment deadlines are laid out around (default: midnight today); fix it to reproduce data another day',
+        )
+        parser.add_argument(
+            '--zipf-exponent', type=float, default=1.1, help='Skew of task counts and priorities (higher is steeper)'
+        )
+        parser.add_argument('--batch-size', type=int, default=10_000, help='Tasks inserted per transaction')
+        parser.add_argument('--no-copy', action='store_true', help='Use INSERT even where Postgres COPY is available')
+        parser.add_argument('--email-prefix', default='bench', help='Users are named <prefix><n>@example.com')
+
+    def handle(self, *args, **options):  # noqa: ARG002
+        if min(options['users'], options['projects_per_user'], options['batch_size']) < 1 or options['tasks'] < 0:
+            message = '--users, --projects-per-user and --batch-size must be positive, --tasks not negative'
+            raise CommandError(message)
+
+        started = time.perf_counter()
+        rng = random.Random(options['seed'])  # noqa: S311
+        # Deadlines are laid out around `now`: only a fixed --now gives identical rows on another day
+        now = options['now'] or timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
+
+        users = self._create_users(options['users'], options['email_prefix'])
+        projects = self._create_projects(users, options['projects_per_user'])
+
+        # Task counts follow a Zipf law over a shuffled project order, so a few projects are huge
+        counts = split_by_weight(options['tasks'], zipf_weights(len(projects), options['zipf_exponent']))
+        rng.shuffle(counts)
+
+        task_repository = TaskRepository()
+        use_copy = not options['no_copy']
+        batch = []
+        for project, count in zip(projects, counts, strict=True):
+            for task in self._generate_tasks(rng, project, count, now, options['zipf_exponent']):
+                batch.append(task)
+                if len(batch) >= options['batch_size']:
+                    self._insert(task_repository, batch, use_copy=use_copy)
+                    batch = []
+        if batch:
+            self._insert(task_repository, batch, use_copy=use_copy)
+
+        ProjectRepository().bulk_update(projects, ProjectRepository.COUNTER_FIELDS, batch_size=1000)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Created {len(users)} user(s), {len(projects)} project(s) and {options["tasks"]} task(s) '
+            f'in {time.perf_counter() - started:.2f}s (largest project: {max(counts, default=0)} tasks)'
+        ))
+
+    def _create_users(self, count: int, prefix: str) -> list:
+        user_class = get_user_model()
+        emails = [f'{prefix}{index}@example.com' for index in range(1, count + 1)]
+        if user_class.objects.filter(email__in=emails).exists():
+            message = f'Benchmark users {prefix}*@example.com already exist, pass another --email-prefix'
+            raise CommandError(message)
+
+        # Hashing is slow by design: every user shares one hash of the same password
+        password = make_password(self.BENCHMARK_PASSWORD)
+        users = [user_class(email=email, password=password, is_active=True) for email in emails]
+        return user_class.objects.bulk_create(users, batch_size=1000)
+
+    def _create_projects(self, users: list, per_user: int) -> list[Project]:
+        projects = [
+            Project(name=f'Project {index}', user_id=user.id) for user in users for index in range(1, per_user + 1)
+        ]
+        return ProjectRepository().bulk_create(projects, batch_size=1000)
+
+    def _generate_tasks(
+        self, rng: random.Random, project: Project, count: int, now: datetime, exponent: float
+    ) -> Iterator[Task]:
+        """Yield the project's tasks in list order, keeping its counters in step with what is generated."""
+        priority_weights = list(accumulate(zipf_weights(len(PRIORITY_RANKS), exponent)))
+        for index, position in enumerate(iter_spaced_keys(count), start=1):
+            status = Task.Status.DONE if rng.random() < DONE_SHARE else Task.Status.IN_PROGRESS
+
+            roll = rng.random()
+            if roll < NO_DEADLINE_SHARE:
+                deadline = None
+            elif roll < NO_DEADLINE_SHARE + PAST_DEADLINE_SHARE:
+                deadline = now - timedelta(minutes=rng.randrange(1, 90 * 24 * 60))
+            else:
+                deadline = now + timedelta(minutes=rng.randrange(1, 180 * 24 * 60))
+
+            task = Task(
+                name=f'{rng.choice(VERBS)} {rng.choice(NOUNS)} #{index}',
+                project_id=project.id,
+                user_id=project.user_id,
+                status=status,
+                priority=rng.choices(PRIORITY_RANKS, cum_weights=priority_weights)[0],
+                deadline=deadline,
+                position=position,
+            )
+
+            if status == Task.Status.DONE:
+                project.done_count += 1
+            else:
+                project.open_count += 1
+                project.overdue_count += task.is_overdue()
+            yield task
+
+    def _insert(self, repository: TaskRepository, tasks: list[Task], *, use_copy: bool) -> None:
+        with transaction.atomic():
+            repository.insert_many(tasks, use_copy=use_copy)
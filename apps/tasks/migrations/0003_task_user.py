@@ -0,0 +1,49 @@
+# Generated by Django 5.2 on 2026-10-18 04:29
+
+import django.db.models.deletion
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+BACKFILL_BATCH_SIZE = 5000
+
+
+def backfill_task_user(apps, schema_editor):  # noqa: ARG001
+    """Copy `project.user_id` into `user_id`, one primary key range per batch (and per transaction)."""
+    Task = apps.get_model('tasks', 'Task')
+    Project = apps.get_model('projects', 'Project')
+    owner = Subquery(Project.objects.filter(id=OuterRef('project_id')).values('user_id')[:1])
+    last_id = 0
+    while task_ids := list(
+        Task.objects.filter(user__isnull=True, id__gt=last_id)
+        .order_by('id')
+        .values_list('id', flat=True)[:BACKFILL_BATCH_SIZE]
+    ):
+        Task.objects.filter(id__in=task_ids).update(user_id=owner)
+        last_id = task_ids[-1]
+
+
+class Migration(migrations.Migration):
+    # Not atomic: each backfill batch commits on its own and the index is built concurrently,
+    # so tasks_task stays writable throughout
+    atomic = False
+
+    dependencies = [
+        ('projects', '0001_initial'),
+        ('tasks', '0002_alter_task_status'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='user',
+            field=models.ForeignKey(blank=True, db_index=False, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='tasks', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.RunPython(backfill_task_user, migrations.RunPython.noop),
+        AddIndexConcurrently(
+            model_name='task',
+            index=models.Index(fields=['user', 'status', '-priority', '-created_at'], name='idx_task_user_status_prio'),
+        ),
+    ]
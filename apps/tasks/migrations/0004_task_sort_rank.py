@@ -0,0 +1,22 @@
+# Generated by Django 5.2 on 2026-10-18 04:30
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Adding a stored generated column rewrites tasks_task under an ACCESS EXCLUSIVE lock, so
+    # reads and writes of tasks wait for the whole rewrite: apply it in a maintenance window.
+    dependencies = [
+        ('projects', '0001_initial'),
+        ('tasks', '0003_task_user'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='sort_rank',
+            field=models.GeneratedField(db_persist=True, expression=models.Case(models.When(status='done', then=models.Value(1)), default=models.Value(0)), output_field=models.SmallIntegerField()),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2 on 2026-10-18 04:35
+
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models, transaction
+
+from apps.utils.ranking import spaced_keys
+
+
+def backfill_positions(apps, schema_editor):
+    """Seed manual positions from the previous dashboard order, one project per transaction."""
+    Project = apps.get_model('projects', 'Project')
+    Task = apps.get_model('tasks', 'Task')
+
+    for project_id in Project.objects.order_by('id').values_list('id', flat=True).iterator():
+        with transaction.atomic():
+            tasks = list(
+                Task.objects.filter(project_id=project_id)
+                .order_by('sort_rank', '-priority', '-created_at', '-id')
+                .only('id')
+            )
+            for task, position in zip(tasks, spaced_keys(len(tasks)), strict=True):
+                task.position = position
+            Task.objects.bulk_update(tasks, ['position'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+    # Not atomic: the backfill commits one project at a time, and CREATE INDEX CONCURRENTLY
+    # cannot run inside a transaction block
+    atomic = False
+
+    dependencies = [
+        ('projects', '0002_project_task_counters'),
+        ('tasks', '0004_task_sort_rank'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='position',
+            field=models.CharField(db_collation='C', default='', editable=False, max_length=255),
+        ),
+        migrations.RunPython(backfill_positions, migrations.RunPython.noop),
+        AddIndexConcurrently(
+            model_name='task',
+            index=models.Index(fields=['project', 'sort_rank', 'position', 'id'], name='idx_task_proj_position'),
+        ),
+    ]
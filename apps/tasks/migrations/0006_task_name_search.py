@@ -0,0 +1,38 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+
+# Postgres only, so they are not declared on the model: elsewhere `apps.utils.search` uses `icontains`
+INDEXES = [
+    GinIndex(SearchVector('name', config='simple'), name='idx_task_name_tsv'),
+    GinIndex(fields=['name'], opclasses=['gin_trgm_ops'], name='idx_task_name_trgm'),
+]
+
+
+def add_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        Task = apps.get_model('tasks', 'Task')
+        for index in INDEXES:
+            schema_editor.add_index(Task, index, concurrently=True)
+
+
+def remove_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        Task = apps.get_model('tasks', 'Task')
+        for index in INDEXES:
+            schema_editor.remove_index(Task, index, concurrently=True)
+
+
+class Migration(migrations.Migration):
+    # Not atomic: the GIN indexes are built with CREATE INDEX CONCURRENTLY
+    atomic = False
+
+    dependencies = [
+        # Creates the pg_trgm extension
+        ('projects', '0003_project_name_search'),
+        ('tasks', '0005_task_position'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_indexes, remove_indexes),
+    ]
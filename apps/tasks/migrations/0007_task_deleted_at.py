@@ -0,0 +1,66 @@
+# Generated by Django 5.2 on 2026-10-18 05:16
+
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently, RemoveIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Not atomic: each index is replaced by its partial version with CONCURRENTLY, built before
+    # the old one is dropped. The nullable column itself is a catalog-only change.
+    atomic = False
+
+    dependencies = [
+        ('tasks', '0006_task_name_search'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        AddIndexConcurrently(
+            model_name='task',
+            index=models.Index(
+                condition=models.Q(('deadline__isnull', False), ('deleted_at', None)),
+                fields=['deadline', 'status'],
+                name='idx_task_live_deadline',
+            ),
+        ),
+        RemoveIndexConcurrently(
+            model_name='task',
+            name='idx_task_deadline_status',
+        ),
+        AddIndexConcurrently(
+            model_name='task',
+            index=models.Index(
+                condition=models.Q(('deleted_at', None)),
+                fields=['user', 'status', '-priority', '-created_at'],
+                name='idx_task_live_user_status',
+            ),
+        ),
+        RemoveIndexConcurrently(
+            model_name='task',
+            name='idx_task_user_status_prio',
+        ),
+        AddIndexConcurrently(
+            model_name='task',
+            index=models.Index(
+                condition=models.Q(('deleted_at', None)),
+                fields=['project', 'sort_rank', 'position', 'id'],
+                name='idx_task_live_position',
+            ),
+        ),
+        RemoveIndexConcurrently(
+            model_name='task',
+            name='idx_task_proj_position',
+        ),
+        AddIndexConcurrently(
+            model_name='task',
+            index=models.Index(
+                condition=models.Q(('deleted_at__isnull', False)), fields=['deleted_at', 'id'], name='idx_task_deleted'
+            ),
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.2 on 2026-10-18 06:02
+
+from importlib import import_module
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+# Rows written by servers that predate 0003 are filled the same way
+backfill_task_user = import_module('apps.tasks.migrations.0003_task_user').backfill_task_user
+
+
+class Migration(migrations.Migration):
+    # Not atomic: each backfill batch commits on its own. A plain AlterField would drop and re-add
+    # the foreign key and scan tasks_task under ACCESS EXCLUSIVE; the NOT VALID check is validated
+    # under SHARE UPDATE EXCLUSIVE instead, which lets writes through, and SET NOT NULL trusts it.
+    atomic = False
+
+    dependencies = [
+        ('tasks', '0007_task_deleted_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_task_user, migrations.RunPython.noop),
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name='task',
+                    name='user',
+                    field=models.ForeignKey(db_index=False, editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='tasks', to=settings.AUTH_USER_MODEL),
+                ),
+            ],
+            database_operations=[
+                migrations.RunSQL(
+                    'ALTER TABLE tasks_task ADD CONSTRAINT tasks_task_user_id_not_null '
+                    'CHECK (user_id IS NOT NULL) NOT VALID',
+                    'ALTER TABLE tasks_task DROP CONSTRAINT tasks_task_user_id_not_null',
+                ),
+                migrations.RunSQL(
+                    'ALTER TABLE tasks_task VALIDATE CONSTRAINT tasks_task_user_id_not_null', migrations.RunSQL.noop
+                ),
+                migrations.RunSQL(
+                    'ALTER TABLE tasks_task ALTER COLUMN user_id SET NOT NULL',
+                    'ALTER TABLE tasks_task ALTER COLUMN user_id DROP NOT NULL',
+                ),
+                migrations.RunSQL(
+                    'ALTER TABLE tasks_task DROP CONSTRAINT tasks_task_user_id_not_null',
+                    'ALTER TABLE tasks_task ADD CONSTRAINT tasks_task_user_id_not_null '
+                    'CHECK (user_id IS NOT NULL) NOT VALID',
+                ),
+            ],
+        ),
+    ]
@@ -1,5 +1,11 @@
+from datetime import datetime
+
+from django.conf import settings
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
+from django.utils import timezone
+
+from apps.utils.soft_delete import SoftDeleteQuerySet
 
 
 class Task(models.Model):
@@ -14,15 +20,40 @@ class Task(models.Model):
         HIGH = 4, 'High'
         VERY_HIGH = 5, 'Very High'
 
+    # Dashboard order: active tasks first, then in the user's manual (drag and drop) order.
+    # Backed by `idx_task_live_position`, so sorted lists are read straight from the index.
+    # Indexes serving the dashboard and the workers only cover live tasks, the rows `live()` selects.
+    SORTED_ORDERING = ('sort_rank', 'position', 'id')
+
     name = models.CharField(max_length=255)
     project = models.ForeignKey('projects.Project', on_delete=models.CASCADE, related_name='tasks')
+    # Denormalized `project.user`, so per-user queries don't join `tasks_project`. Set by `save()`.
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='tasks',
+        editable=False,
+        db_index=False,
+    )
     status = models.CharField(max_length=20, choices=Status.choices, default=Status.IN_PROGRESS, db_index=True)
     priority = models.IntegerField(
         choices=Priority.choices, default=Priority.MEDIUM, validators=[MinValueValidator(1), MaxValueValidator(5)]
     )
     deadline = models.DateTimeField(null=True, blank=True, db_index=True)
+    sort_rank = models.GeneratedField(
+        expression=models.Case(models.When(status='done', then=models.Value(1)), default=models.Value(0)),
+        output_field=models.SmallIntegerField(),
+        db_persist=True,
+    )
+    # Fractional rank key (see `apps.utils.ranking`): moving a task rewrites only this column.
+    # Bytewise collation, so that the database sorts keys exactly like Python does.
+    position = models.CharField(max_length=255, default='', editable=False, db_collation='C')
     created_at = models.DateTimeField(auto_now_add=True, db_index=True)
     updated_at = models.DateTimeField(auto_now=True, db_index=True)
+    # Tombstone: set when the task is deleted, so it can be restored until `purge_deleted` removes it
+    deleted_at = models.DateTimeField(null=True, blank=True)
+
+    objects = SoftDeleteQuerySet.as_manager()
 
     class Meta:
         db_table = 'tasks_task'
@@ -32,11 +63,34 @@ class Task(models.Model):
             models.Index(fields=['deadline'], name='idx_task_deadline', condition=models.Q(deadline__isnull=False)),
             models.Index(
                 fields=['deadline', 'status'],
-                name='idx_task_deadline_status',
-                condition=models.Q(deadline__isnull=False),
+                name='idx_task_live_deadline',
+                condition=models.Q(deadline__isnull=False, deleted_at=None),
             ),
             models.Index(fields=['-updated_at'], name='idx_task_updated'),
+            models.Index(
+                fields=['user', 'status', '-priority', '-created_at'],
+                name='idx_task_live_user_status',
+                condition=models.Q(deleted_at=None),
+            ),
+            models.Index(
+                fields=['project', 'sort_rank', 'position', 'id'],
+                name='idx_task_live_position',
+                condition=models.Q(deleted_at=None),
+            ),
+            # Purge order, over tombstones only
+            models.Index(
+                fields=['deleted_at', 'id'], name='idx_task_deleted', condition=models.Q(deleted_at__isnull=False)
+            ),
         ]
 
     def __str__(self):
         return f'{self.name} ({self.get_status_display()})'
+
+    def save(self, *args, **kwargs):
+        # Keep the denormalized owner in step with the project it belongs to
+        if self.project_id is not None and (self.user_id is None or Task.project.is_cached(self)):
+            self.user_id = self.project.user_id
+        super().save(*args, **kwargs)
+
+    def is_overdue(self, now: datetime | None = None) -> bool:
+        return self.status != self.Status.DONE and self.deadline is not None and self.deadline < (now or timezone.now())
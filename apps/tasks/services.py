@@ -1,19 +1,46 @@
 import logging
-from datetime import datetime
-from typing import TYPE_CHECKING
+import time
+from collections import Counter, defaultdict
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, NoReturn
 
-from django.db.models import Model, QuerySet
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, Model, Q, QuerySet, Value, When
+from django.utils import timezone
 
+from apps.jobs.services import JobService
 from apps.tasks.dal import TaskRepository
 from apps.tasks.models import Task
 from apps.tasks.validators import TaskValidator
+from apps.utils.exceptions import DALError, ObjectNotFoundError
+from apps.utils.pagination import decode_cursor, split_page
+from apps.utils.ranking import key_between
+from apps.utils.streaming import decode_lines
 
 logger = logging.getLogger(__name__)
 if TYPE_CHECKING:
     from apps.accounts.models import User
+    from apps.projects.models import Project
     from apps.projects.services import ProjectService
 
 
+@dataclass
+class ImportReport:
+    """Outcome of `TaskService.import_tasks`: rows read, tasks created and `(line, error)` pairs."""
+
+    rows: int = 0
+    created: int = 0
+    errors: list[tuple[int, str]] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
 class TaskService:
     def __init__(self, task_dal=None, project_service=None, validator=None):
         self.task_dal = task_dal or TaskRepository()
@@ -33,70 +60,415 @@ class TaskService:
         project = self.project_service.get_user_project(user, project_id)
         clean_title = self.validator.validate_create_task(title)
 
-        task = self.task_dal.create(
-            name=clean_title,
-            project=project,
-            status=Task.Status.IN_PROGRESS,
-            priority=Task.Priority.MEDIUM,
-            deadline=deadline
-        )
+        with transaction.atomic():
+            task = self.task_dal.create(
+                name=clean_title,
+                project=project,
+                status=Task.Status.IN_PROGRESS,
+                priority=Task.Priority.MEDIUM,
+                deadline=deadline
+            )
+            self._adjust_counters(project.id, after=(Task.Status.IN_PROGRESS, deadline))
 
         logger.info(r"Task created: %s \%s' by user %s", task.id, clean_title, user.id)
         return task
 
     def update_task(self, user: 'User', task_id: int, **kwargs) -> Model:
-        task = self.task_dal.get_by_id(task_id)
-
-        validated_data = self.validator.validate_update_task(
-            user, task, title=kwargs.get('title'), priority=kwargs.get('priority'), deadline=kwargs.get('deadline')
-        )
+        with transaction.atomic():
+            # Ownership first: someone else's task is refused whatever the data sent
+            previous = self._lock_owned_task(user, task_id)
+            validated_data = self.validator.validate_update_data(
+                title=kwargs.get('title'), priority=kwargs.get('priority'), deadline=kwargs.get('deadline')
+            )
+            kwargs.pop('title', None)
+            kwargs.update(validated_data)
 
-        kwargs.pop('title', None)
-        kwargs.update(validated_data)
+            updated_task = self.task_dal.update_owned(user, task_id, **kwargs)
+            if updated_task is None:
+                self._raise_inaccessible(task_id)
+            if 'deadline' in kwargs:
+                self._adjust_counters(
+                    updated_task.project_id,
+                    before=(previous.status, previous.deadline),
+                    after=(updated_task.status, updated_task.deadline),
+                )
 
-        updated_task = self.task_dal.update(task, **kwargs)
         logger.info('Task updated: %s by user %s', task_id, user.id)
         return updated_task
 
-    def delete_task(self, user: 'User', task_id: int) -> None:
-        task = self.task_dal.get_by_id(task_id)
-        self.validator.validate_delete_task(user, task)
-        self.task_dal.delete(task)
+    def delete_task(self, user: 'User', task_id: int) -> Task:
+        """Soft-delete a task: it is hidden at once and can be restored until `purge_deleted` removes it."""
+        with transaction.atomic():
+            task = self._get_owned_task(user, task_id, fields=('id', 'project_id', 'name', 'status', 'deadline'))
+            if not self.task_dal.tombstone(task, timezone.now()):
+                self._raise_inaccessible(task_id)
+            self._adjust_counters(task.project_id, before=(task.status, task.deadline))
         logger.info('Task deleted: %s by user %s', task_id, user.id)
+        return task
+
+    def restore_task(self, user: 'User', task_id: int) -> Task:
+        """Undo `delete_task`, within `SOFT_DELETE_RETENTION_HOURS` of it."""
+        deleted_since = timezone.now() - timedelta(hours=settings.SOFT_DELETE_RETENTION_HOURS)
+        with transaction.atomic():
+            task = self.task_dal.restore_owned(user, task_id, deleted_since)
+            if task is None:
+                raise ObjectNotFoundError(Task.__name__, task_id)
+            self._adjust_counters(task.project_id, after=(task.status, task.deadline))
+        logger.info('Task restored: %s by user %s', task_id, user.id)
+        return task
 
     def complete_task(self, user: 'User', task_id: int) -> Model:
-        task = self.task_dal.get_by_id(task_id)
-        self.validator.validate_complete_task(user, task)
-        return self.task_dal.update(task, status=Task.Status.DONE)
+        with transaction.atomic():
+            task = self.task_dal.update_owned(
+                user, task_id, condition=~Q(status=Task.Status.DONE), status=Task.Status.DONE
+            )
+            if task is None:
+                # Nothing written: tell "already done" apart from "not yours" / "missing"
+                current = self._get_owned_task(user, task_id, fields=('id', 'status'))
+                self.validator.validate_task_completion(current)
+            else:
+                self._adjust_counters(
+                    task.project_id, before=(Task.Status.IN_PROGRESS, task.deadline), after=(task.status, task.deadline)
+                )
+        return task
 
     def set_priority(self, user: 'User', task_id: int, priority: int) -> Model:
-        task = self.task_dal.get_by_id(task_id)
-        self.validator.validate_set_priority(user, task, priority)
-        return self.task_dal.update(task, priority=priority)
+        self.validator.validate_priority(priority)
+        task = self.task_dal.update_owned(user, task_id, priority=priority)
+        if task is None:
+            self._raise_inaccessible(task_id)
+        return task
 
     def set_deadline(self, user: 'User', task_id: int, deadline: datetime) -> Model:
-        task = self.task_dal.get_by_id(task_id)
-        self.validator.validate_set_deadline(user, task, deadline)
-        return self.task_dal.update(task, deadline=deadline)
+        self.validator.validate_deadline(deadline)
+        with transaction.atomic():
+            previous = self._lock_owned_task(user, task_id)
+            task = self.task_dal.update_owned(user, task_id, deadline=deadline)
+            self._adjust_counters(
+                task.project_id, before=(previous.status, previous.deadline), after=(task.status, task.deadline)
+            )
+        return task
 
     def get_user_tasks(self, user: 'User') -> QuerySet:
         return self.task_dal.get_by_user(user)
 
     def toggle_task_status(self, user: 'User', task_id: int) -> Model:
-        task = self.task_dal.get_by_id(task_id)
-        self.validator.validate_ownership(user, task)
+        flipped_status = Case(
+            When(status=Task.Status.DONE, then=Value(Task.Status.IN_PROGRESS)),
+            default=Value(Task.Status.DONE),
+        )
+        with transaction.atomic():
+            updated_task = self.task_dal.update_owned(user, task_id, status=flipped_status)
+            if updated_task is None:
+                self._raise_inaccessible(task_id)
 
-        new_status = Task.Status.IN_PROGRESS if task.status == Task.Status.DONE else Task.Status.DONE
-        updated_task = self.task_dal.update(task, status=new_status)
-        logger.info('Task status toggled: %s to %s by user %s', task_id, new_status, user.id)
+            previous_status = (
+                Task.Status.IN_PROGRESS if updated_task.status == Task.Status.DONE else Task.Status.DONE
+            )
+            self._adjust_counters(
+                updated_task.project_id,
+                before=(previous_status, updated_task.deadline),
+                after=(updated_task.status, updated_task.deadline),
+            )
+
+        logger.info('Task status toggled: %s to %s by user %s', task_id, updated_task.status, user.id)
         return updated_task
 
+    def move_task(self, user: 'User', task_id: int, after_id: int | None = None, before_id: int | None = None) -> Model:
+        """
+        Place a task between two tasks of its project (`None` for either end of the list).
+
+        Writes only the moved row. Neighbours out of order (a stale list on the client) are
+        refused before anything is written. If their keys leave no room (legacy rows without
+        a position), a background job rebalances the project and the move is refused until then.
+        The same job is queued once a move leaves a key longer than `TASK_POSITION_MAX_LENGTH`.
+        """
+        self.validator.validate_move_target(task_id, after_id, before_id)
+
+        project_id, lower, upper = self._move_bounds(user, task_id, after_id, before_id)
+        self.validator.validate_move_order(lower, upper)
+        try:
+            position = key_between(lower or None, upper)
+        except ValueError:
+            self._queue_rebalance(project_id)
+            self.validator.deny_move_until_rebalanced()
+
+        moved_task = self.task_dal.update_owned(user, task_id, position=position)
+        if moved_task is None:
+            self._raise_inaccessible(task_id)
+
+        if len(position) > settings.TASK_POSITION_MAX_LENGTH:
+            self._queue_rebalance(moved_task.project_id)
+        logger.info('Task moved: %s by user %s', task_id, user.id)
+        return moved_task
+
+    def bulk_complete(self, user: 'User', task_ids: Sequence[int]) -> tuple[list[Task], set[int]]:
+        """Complete many tasks with one ownership query and one `UPDATE`; already done tasks are skipped."""
+        with transaction.atomic():
+            tasks = self._lock_owned_tasks(user, task_ids)
+            pending = [task for task in tasks if task.status != Task.Status.DONE]
+            if pending:
+                self.task_dal.update_many(pending, status=Task.Status.DONE)
+                self._adjust_counters_many(
+                    (task.project_id, (task.status, task.deadline), (Task.Status.DONE, task.deadline))
+                    for task in pending
+                )
+
+        logger.info('Tasks completed in bulk: %s by user %s', len(pending), user.id)
+        return self.task_dal.get_by_ids([task.id for task in tasks]), {task.project_id for task in pending}
+
+    def bulk_delete(self, user: 'User', task_ids: Sequence[int]) -> tuple[list[Task], set[int]]:
+        """
+        Soft-delete many tasks with one ownership query and one `UPDATE`, like `delete_task` does one.
+
+        Each can be restored with `restore_task`. Returns the deleted tasks with their names only.
+        """
+        with transaction.atomic():
+            tasks = self._lock_owned_tasks(user, task_ids)
+            self.task_dal.tombstone_many(tasks, timezone.now())
+            self._adjust_counters_many((task.project_id, (task.status, task.deadline), None) for task in tasks)
+
+        logger.info('Tasks deleted in bulk: %s by user %s', len(tasks), user.id)
+        return tasks, {task.project_id for task in tasks}
+
+    def bulk_set_priority(self, user: 'User', task_ids: Sequence[int], priority: int) -> tuple[list[Task], set[int]]:
+        """Set the priority of many tasks with one ownership query and one `UPDATE`."""
+        self.validator.validate_priority(priority)
+        with transaction.atomic():
+            tasks = self._lock_owned_tasks(user, task_ids)
+            self.task_dal.update_many(tasks, priority=priority)
+
+        logger.info('Tasks reprioritized in bulk: %s by user %s', len(tasks), user.id)
+        return self.task_dal.get_by_ids([task.id for task in tasks]), set()
+
+    def bulk_move(self, user: 'User', task_ids: Sequence[int], project_id: int) -> tuple[list[Task], set[int]]:
+        """
+        Move many tasks to the end of another of the user's projects with one ownership query and one `UPDATE`.
+
+        The moved tasks keep their relative order; each gets its own position through a `CASE`.
+        """
+        target = self.project_service.get_user_project(user, project_id)
+        with transaction.atomic():
+            tasks = self._lock_owned_tasks(user, task_ids)
+            moving = [task for task in tasks if task.project_id != target.id]
+            if moving:
+                positions = []
+                position = self.task_dal.get_last_position(target.id)
+                for task in moving:
+                    position = key_between(position, None)
+                    positions.append(When(id=task.id, then=Value(position)))
+
+                self.task_dal.update_many(moving, project_id=target.id, position=Case(*positions))
+                self._adjust_counters_many(
+                    change
+                    for task in moving
+                    for change in (
+                        (task.project_id, (task.status, task.deadline), None),
+                        (target.id, None, (task.status, task.deadline)),
+                    )
+                )
+
+        logger.info('Tasks moved in bulk: %s to project %s by user %s', len(moving), target.id, user.id)
+        touched = {task.project_id for task in moving} | ({target.id} if moving else set())
+        return self.task_dal.get_by_ids([task.id for task in moving]), touched
+
+    def import_tasks(
+        self,
+        user: 'User',
+        lines: Iterable[str],
+        fmt: str,
+        *,
+        batch_size: int | None = None,
+        use_copy: bool | None = None,
+    ) -> ImportReport:
+        """
+        Import tasks from CSV or NDJSON lines (the export format) into the user's projects.
+
+        Rows are validated in memory and a bad row is reported without stopping the import.
+        Each project is resolved once: by a `project` name column (created if missing), by a
+        `project` row earlier in the file, or by the id of one of the user's projects. Valid rows
+        are inserted `batch_size` at a time, each batch in one transaction with its counters.
+        """
+        self.validator.validate_import_format(fmt)
+        batch_size = batch_size or settings.TASK_IMPORT_BATCH_SIZE
+        use_copy = settings.TASK_IMPORT_USE_COPY if use_copy is None else use_copy
+
+        report = ImportReport()
+        projects: dict[tuple[str, object], Project] = {}
+        positions: dict[int, str | None] = {}
+        batch: list[Task] = []
+        started = time.perf_counter()
+
+        for line_number, record in decode_lines(lines, fmt):
+            report.rows += 1
+            try:
+                self.validator.validate_import_record(record)
+                if record.get('type') == 'project':
+                    projects['id', str(record.get('id'))] = self._resolve_import_project(user, record, projects)
+                    continue
+                data = self.validator.validate_import_row(record)
+                project = self._resolve_import_project(user, record, projects)
+            except DALError as error:
+                report.errors.append((line_number, str(error)))
+                continue
+
+            if project.id not in positions:
+                positions[project.id] = self.task_dal.get_last_position(project.id)
+            positions[project.id] = key_between(positions[project.id], None)
+            batch.append(Task(project_id=project.id, user_id=user.id, position=positions[project.id], **data))
+
+            if len(batch) >= batch_size:
+                report.created += self._insert_import_batch(batch, use_copy=use_copy)
+                batch = []
+
+        if batch:
+            report.created += self._insert_import_batch(batch, use_copy=use_copy)
+
+        report.seconds = time.perf_counter() - started
+        logger.info(
+            'Tasks imported: %s of %s rows for user %s (%.0f rows/s)',
+            report.created, report.rows, user.id, report.rows_per_second,
+        )
+        return report
 
     def get_user_task(self, user: 'User', task_id: int) -> Model:
-        task = self.task_dal.get_by_id(task_id)
-        self.validator.validate_ownership(user, task)
+        return self._get_owned_task(user, task_id)
+
+    async def aget_user_task(self, user: 'User', task_id: int) -> Model:
+        """Async `get_user_task`."""
+        task = await self.task_dal.aget_owned(user, task_id)
+        if task is None:
+            if not await self.task_dal.aexists(id=task_id):
+                raise ObjectNotFoundError(Task.__name__, task_id)
+            self.validator.deny_access()
         return task
 
-    def get_project_tasks_sorted(self, user: 'User', project_id: int) -> QuerySet:
+    def get_task_position(self, task: Task) -> int | None:
+        """Get the id of the task that `task` now sits after in its sorted project list."""
+        return self.task_dal.get_preceding_id(task)
+
+    def get_project_tasks_page(
+        self, user: 'User', project_id: int, cursor: str | None = None
+    ) -> tuple[list[Task], str | None]:
+        """Get one page of a project's sorted tasks and the cursor of the next page."""
         project = self.project_service.get_user_project(user, project_id)
-        return self.task_dal.get_by_project_sorted(project)
+        after = decode_cursor(cursor, TaskRepository.PAGE_ORDERING, Task) if cursor else None
+        limit = settings.PROJECT_TASKS_PAGE_SIZE
+
+        tasks = self.task_dal.get_page_by_project(project, after, limit + 1)
+        return split_page(tasks, limit, TaskRepository.PAGE_ORDERING)
+
+    def _get_owned_task(self, user: 'User', task_id: int, fields: tuple[str, ...] = ()) -> Task:
+        task = self.task_dal.get_owned(user, task_id, fields=fields)
+        if task is None:
+            self._raise_inaccessible(task_id)
+        return task
+
+    def _resolve_import_project(
+        self, user: 'User', record: dict, projects: dict[tuple[str, object], 'Project']
+    ) -> 'Project':
+        if record.get('type') == 'project' or record.get('project'):
+            name = str(record.get('name') if record.get('type') == 'project' else record.get('project'))
+            key = ('name', name.strip().lower())
+            if key not in projects:
+                projects[key] = self.project_service.get_or_create_user_project(user, name)
+            return projects[key]
+
+        key = ('id', str(record.get('project_id')))
+        if key not in projects:
+            self.validator.validate_import_project_id(record.get('project_id'))
+            projects[key] = self.project_service.get_user_project(user, int(record['project_id']))
+        return projects[key]
+
+    def _insert_import_batch(self, batch: list[Task], *, use_copy: bool) -> int:
+        with transaction.atomic():
+            created = self.task_dal.insert_many(batch, use_copy=use_copy)
+            self._adjust_counters_many((task.project_id, None, (task.status, task.deadline)) for task in batch)
+        return created
+
+    def _lock_owned_tasks(self, user: 'User', task_ids: Sequence[int]) -> list[Task]:
+        task_ids = self.validator.validate_bulk_task_ids(task_ids)
+        tasks = self.task_dal.lock_owned(user, task_ids)
+        if len(tasks) != len(task_ids):
+            missing = set(task_ids) - {task.id for task in tasks}
+            if self.task_dal.exists(id__in=missing, project__deleted_at__isnull=True):
+                self.validator.deny_access()
+            raise ObjectNotFoundError(Task.__name__, min(missing))
+        return tasks
+
+    def _move_bounds(
+        self, user: 'User', task_id: int, after_id: int | None, before_id: int | None
+    ) -> tuple[int, str, str | None]:
+        """Get the task's project and the keys of its new neighbours (`''` for a row without one, `None` at the end)."""
+        neighbour_ids = [neighbour_id for neighbour_id in (after_id, before_id) if neighbour_id is not None]
+        tasks = self.task_dal.get_owned_positions(user, [task_id, *neighbour_ids])
+        if task_id not in tasks:
+            self._raise_inaccessible(task_id)
+
+        project_id = tasks[task_id].project_id
+        bounds = []
+        for neighbour_id in (after_id, before_id):
+            if neighbour_id is None:
+                bounds.append(None)
+                continue
+            neighbour = tasks.get(neighbour_id)
+            self.validator.validate_move_neighbour(neighbour, project_id)
+            bounds.append(neighbour.position)
+
+        lower, upper = bounds
+        return project_id, lower or '', upper
+
+    def _queue_rebalance(self, project_id: int) -> None:
+        """Queue a rebalance of the project's positions, unless one is already waiting to run."""
+        job = JobService().enqueue_once('tasks.rebalance_project', {'project_id': project_id})
+        logger.info('Task positions of project %s queued for rebalancing: job %s', project_id, job.id)
+
+    def _lock_owned_task(self, user: 'User', task_id: int) -> Task:
+        """Get and row-lock one of the user's tasks, with its state before a change. Call inside a transaction."""
+        tasks = self.task_dal.lock_owned(user, [task_id])
+        if not tasks:
+            self._raise_inaccessible(task_id)
+        return tasks[0]
+
+    def _adjust_counters(
+        self,
+        project_id: int,
+        before: tuple[str, datetime | None] | None = None,
+        after: tuple[str, datetime | None] | None = None,
+    ) -> None:
+        """Move a task's contribution to its project's counters from its `(status, deadline)` `before` to `after`."""
+        self._adjust_counters_many([(project_id, before, after)])
+
+    def _adjust_counters_many(
+        self, changes: Iterable[tuple[int, tuple[str, datetime | None] | None, tuple[str, datetime | None] | None]]
+    ) -> None:
+        """
+        Apply many `(project_id, before, after)` task changes with one counter update per project.
+
+        Overdue tasks move `overdue_count` only if the project counted them, which the update
+        decides against its `overdue_as_of`; deadlines still ahead cannot have been counted.
+        """
+        now = timezone.now()
+        deltas: dict[int, Counter] = defaultdict(Counter)
+        overdue_deadlines: dict[int, Counter] = defaultdict(Counter)
+        for project_id, before, after in changes:
+            for state, sign in ((after, 1), (before, -1)):
+                if state is None:
+                    continue
+                status, deadline = state
+                deltas[project_id]['done_count' if status == Task.Status.DONE else 'open_count'] += sign
+                if Task(status=status, deadline=deadline).is_overdue(now):
+                    overdue_deadlines[project_id][deadline] += sign
+
+        for project_id, project_deltas in deltas.items():
+            self.project_service.adjust_task_counters(project_id, overdue_deadlines[project_id], **project_deltas)
+
+    def _raise_inaccessible(self, task_id: int) -> NoReturn:
+        """
+        Raise the error a fetch-then-check lookup would have raised for a task the user can't reach.
+
+        The tasks of deleted projects are missing, as their projects are.
+        """
+        if not self.task_dal.exists(id=task_id, project__deleted_at__isnull=True):
+            raise ObjectNotFoundError(Task.__name__, task_id)
+        self.validator.deny_access()
@@ -0,0 +1,14 @@
+from django import template
+from django.utils.safestring import SafeString, mark_safe
+
+from apps.utils.fragment_cache import FragmentCache
+
+register = template.Library()
+
+
+@register.simple_tag
+def render_task_row(task) -> SafeString:
+    """Render `partials/task_row.html` through the fragment cache."""
+    fragment_cache = FragmentCache()
+    html = fragment_cache.render(fragment_cache.task_row_key(task), 'partials/task_row.html', {'task': task})
+    return mark_safe(html)  # noqa: S308
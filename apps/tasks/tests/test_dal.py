@@ -0,0 +1,93 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db.models import Q
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from apps.projects.models import Project
+from apps.tasks.dal import TaskRepository
+from apps.tasks.models import Task
+
+User = get_user_model()
+
+TEST_PASSWORD = 'testpass123'  # noqa: S105
+
+
+class TestTaskRepository(TestCase):
+    """Repository-level tests for write amplification and query shape."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(email='test@example.com', password=TEST_PASSWORD)
+        self.project = Project.objects.create(name='Test Project', user=self.user)
+        self.task = Task.objects.create(name='Task', project=self.project)
+        self.repository = TaskRepository()
+
+    def test_keeps_owner_in_sync_on_create(self):
+        self.assertEqual(self.task.user_id, self.user.id)
+
+    def test_update_writes_only_changed_fields(self):
+        """Test update saves the changed columns plus auto_now ones."""
+        with CaptureQueriesContext(connection) as queries:
+            self.repository.update(self.task, name='Task', priority=Task.Priority.HIGH, project=self.project)
+
+        self.assertEqual(len(queries), 1)
+        update_sql = queries[0]['sql']
+        self.assertIn('"priority"', update_sql)
+        self.assertIn('"updated_at"', update_sql)
+        self.assertNotIn('"name"', update_sql)
+        self.assertNotIn('"status"', update_sql)
+
+    def test_update_without_changes_skips_save(self):
+        """Test update is a no-op when every value already matches."""
+        with self.assertNumQueries(0):
+            self.repository.update(self.task, name='Task', status=self.task.status)
+
+    def test_update_where_updates_without_loading(self):
+        """Test update_where writes matching rows in one statement and bumps updated_at."""
+        other = Task.objects.create(name='Other', project=self.project)
+        before = self.task.updated_at
+
+        with self.assertNumQueries(1):
+            updated = self.repository.update_where(Q(id=self.task.id), status=Task.Status.DONE)
+
+        self.assertEqual(updated, 1)
+        self.task.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual(self.task.status, Task.Status.DONE)
+        self.assertGreater(self.task.updated_at, before)
+        self.assertEqual(other.status, Task.Status.IN_PROGRESS)
+        self.assertEqual(self.repository.update_where({'project': self.project}, priority=Task.Priority.LOW), 2)
+
+    def test_sort_rank_follows_status(self):
+        """Test the generated sort rank keeps done tasks below active ones, whatever their position."""
+        done = self.repository.create(name='Done', project=self.project, status=Task.Status.DONE, position='1')
+        urgent = self.repository.create(name='Urgent', project=self.project, priority=5)
+
+        ordered = list(self.repository.get_by_project_sorted(self.project))
+
+        self.assertEqual(ordered, [self.task, urgent, done])
+        self.repository.update_where(Q(id=done.id), status=Task.Status.IN_PROGRESS)
+        self.assertEqual(Task.objects.get(id=done.id).sort_rank, 0)
+
+    def test_create_appends_to_active_tasks(self):
+        """Test new tasks get a position after the last active task, ignoring done ones."""
+        first = self.repository.create(name='First', project=self.project)
+        self.repository.create(name='Done', project=self.project, status=Task.Status.DONE, position='z')
+        second = self.repository.create(name='Second', project=self.project)
+
+        self.assertLess(first.position, second.position)
+        self.assertEqual(self.repository.get_last_position(self.project.id), second.position)
+
+    def test_rebalance_project_keeps_order_with_short_keys(self):
+        """Test rebalancing rewrites long positions without changing the order."""
+        Task.objects.filter(id=self.task.id).update(position='i' * 40)
+        tasks = [self.task, *(self.repository.create(name=f'Task {i}', project=self.project) for i in range(3))]
+        before = list(self.repository.get_by_project_sorted(self.project))
+
+        self.assertEqual(self.repository.get_project_ids_to_rebalance(32, 0, 10), [self.project.id])
+        self.assertEqual(self.repository.rebalance_project(self.project.id), len(tasks))
+
+        after = list(self.repository.get_by_project_sorted(self.project))
+        self.assertEqual(after, before)
+        self.assertTrue(all(len(task.position) == 1 for task in after))
+        self.assertEqual(self.repository.get_project_ids_to_rebalance(32, 0, 10), [])
@@ -0,0 +1,111 @@
+from django.db import OperationalError, transaction
+from django.test import TransactionTestCase
+from django.test import override_settings
+
+from apps.tasks.models import Task
+from apps.utils import metrics
+from apps.utils.decorators import handle_dal_exceptions
+from apps.utils.exceptions import DALError
+
+
+def database_error(sqlstate: str | None) -> OperationalError:
+    cause = Exception('driver error')
+    cause.pgcode = sqlstate
+    error = OperationalError('driver error')
+    error.__cause__ = cause
+    return error
+
+
+class FlakyRepository:
+    model = Task
+
+    def __init__(self, *errors: Exception):
+        self.errors = list(errors)
+        self.calls = 0
+
+    @handle_dal_exceptions(retry=True)
+    def read(self) -> str:
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return 'ok'
+
+    @handle_dal_exceptions(retry=True)
+    async def aread(self) -> str:
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return 'ok'
+
+    @handle_dal_exceptions
+    def write(self) -> str:
+        return self.read()
+
+
+@override_settings(DAL_RETRY_MAX_ATTEMPTS=3, DAL_RETRY_BASE_DELAY_MS=0)
+class DALRetryTestCase(TransactionTestCase):
+    def setUp(self):
+        metrics.reset()
+        self.addCleanup(metrics.reset)
+
+    def test_retries_serialization_failures_and_deadlocks(self):
+        repository = FlakyRepository(database_error('40001'), database_error('40P01'))
+
+        self.assertEqual(repository.read(), 'ok')
+
+        self.assertEqual(repository.calls, 3)
+        operation = 'FlakyRepository.read'
+        self.assertEqual(
+            metrics.get('dal_retry_attempts_total', operation=operation, reason='serialization_failure'), 1
+        )
+        self.assertEqual(metrics.get('dal_retry_attempts_total', operation=operation, reason='deadlock'), 1)
+
+    async def test_retries_async_calls(self):
+        repository = FlakyRepository(database_error('40001'), database_error('57P01'))
+
+        self.assertEqual(await repository.aread(), 'ok')
+
+        self.assertEqual(repository.calls, 3)
+        operation = 'FlakyRepository.aread'
+        self.assertEqual(metrics.get('dal_retry_attempts_total', operation=operation, reason='connection'), 1)
+
+    def test_gives_up_after_the_last_attempt(self):
+        repository = FlakyRepository(*(database_error('40001') for _ in range(5)))
+
+        with self.assertRaises(DALError):
+            repository.read()
+
+        self.assertEqual(repository.calls, 3)
+        self.assertEqual(
+            metrics.get('dal_retry_give_ups_total', operation='FlakyRepository.read', reason='serialization_failure'),
+            1,
+        )
+
+    def test_does_not_retry_other_errors(self):
+        repository = FlakyRepository(database_error('42P01'), database_error(None))
+
+        with self.assertRaises(DALError):
+            repository.read()
+
+        self.assertEqual(repository.calls, 1)
+        self.assertEqual(metrics.snapshot(), [])
+
+    def test_does_not_retry_inside_a_transaction(self):
+        repository = FlakyRepository(database_error('40001'))
+
+        with self.assertRaises(DALError), transaction.atomic():
+            repository.read()
+
+        self.assertEqual(repository.calls, 1)
+        self.assertEqual(
+            metrics.get('dal_retry_skipped_total', operation='FlakyRepository.read', reason='serialization_failure'),
+            1,
+        )
+
+    def test_does_not_retry_calls_made_by_a_non_retrying_operation(self):
+        repository = FlakyRepository(database_error('40001'))
+
+        with self.assertRaises(DALError):
+            repository.write()
+
+        self.assertEqual(repository.calls, 1)
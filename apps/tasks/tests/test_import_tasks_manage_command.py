@@ -0,0 +1,77 @@
+import json
+from io import StringIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from apps.accounts.tests.factories import UserFactory
+from apps.projects.models import Project
+from apps.tasks.models import Task
+
+
+class ImportTasksManageCommandTestCase(TestCase):
+    def setUp(self):
+        self.user = UserFactory()
+        self.project = Project.objects.create(name='Existing', user=self.user)
+
+    def test_imports_csv_in_batches_and_reports_bad_rows(self):
+        rows = [
+            'project,name,status,priority,deadline',
+            'Existing,First,in_progress,5,',
+            'existing,Second,done,2,2020-01-01T09:00:00',
+            'New project,Third,,,',
+            'Existing,,in_progress,3,',
+            'Existing,Bad priority,in_progress,9,',
+        ]
+
+        out, err = StringIO(), StringIO()
+        with TemporaryDirectory() as directory:
+            path = Path(directory) / 'tasks.csv'
+            path.write_text('\n'.join(rows) + '\n', encoding='utf-8')
+            call_command('import_tasks', self.user.email, str(path), batch_size=2, stdout=out, stderr=err)
+
+        self.assertIn('Imported 3 task(s) from 5 row(s) with 2 error(s)', out.getvalue())
+        self.assertIn('Line 5:', err.getvalue())
+        self.assertIn('Line 6:', err.getvalue())
+
+        imported = list(Task.objects.filter(project=self.project).order_by(*Task.SORTED_ORDERING))
+        self.assertEqual([task.name for task in imported], ['First', 'Second'])
+        self.assertTrue(all(task.user_id == self.user.id for task in imported))
+        self.assertEqual(imported[1].deadline.year, 2020)
+
+        new_project = Project.objects.get(user=self.user, name='New project')
+        self.assertEqual(new_project.tasks.get().priority, Task.Priority.MEDIUM)
+
+        self.project.refresh_from_db()
+        self.assertEqual((self.project.open_count, self.project.done_count), (1, 1))
+
+    def test_imports_own_ndjson_export(self):
+        Task.objects.create(name='Exported', project=self.project)
+        export = StringIO()
+        call_command('export_user_data', self.user.email, stdout=export)
+        target_user = UserFactory()
+
+        out = StringIO()
+        with TemporaryDirectory() as directory:
+            path = Path(directory) / 'export.ndjson'
+            path.write_text(export.getvalue(), encoding='utf-8')
+            call_command('import_tasks', target_user.email, str(path), stdout=out, stderr=StringIO())
+
+        self.assertIn('Imported 1 task(s) from 2 row(s) with 0 error(s)', out.getvalue())
+        task = Task.objects.get(user=target_user)
+        self.assertEqual((task.name, task.project.name), ('Exported', 'Existing'))
+
+    def test_rejects_foreign_project_ids(self):
+        other_project = Project.objects.create(name='Theirs', user=UserFactory())
+        line = json.dumps({'project_id': other_project.id, 'name': 'Sneaky'})
+
+        out, err = StringIO(), StringIO()
+        with TemporaryDirectory() as directory:
+            path = Path(directory) / 'tasks.ndjson'
+            path.write_text(line + '\n{not json\n', encoding='utf-8')
+            call_command('import_tasks', self.user.email, str(path), stdout=out, stderr=err)
+
+        self.assertIn('with 2 error(s)', out.getvalue())
+        self.assertFalse(Task.objects.exists())
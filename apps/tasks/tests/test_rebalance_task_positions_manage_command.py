@@ -0,0 +1,30 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from apps.accounts.tests.factories import UserFactory
+from apps.projects.models import Project
+from apps.tasks.models import Task
+
+
+class RebalanceTaskPositionsManageCommandTestCase(TestCase):
+    def test_rewrites_only_projects_with_long_positions(self):
+        user = UserFactory()
+        project = Project.objects.create(name='Crowded', user=user)
+        tidy_project = Project.objects.create(name='Tidy', user=user)
+        crowded = [
+            Task.objects.create(name=f'Task {i}', project=project, position='i' * (i + 1) + 'j') for i in range(3)
+        ]
+        tidy = Task.objects.create(name='Tidy', project=tidy_project, position='i')
+
+        out = StringIO()
+        call_command('rebalance_task_positions', max_length=2, stdout=out)
+
+        self.assertIn('Task positions rebalanced in 1 project(s)', out.getvalue())
+        crowded.sort(key=lambda task: task.position)
+        positions = [Task.objects.get(id=task.id).position for task in crowded]
+        self.assertEqual(positions, sorted(positions))
+        self.assertTrue(all(len(position) == 1 for position in positions))
+        tidy.refresh_from_db()
+        self.assertEqual(tidy.position, 'i')
@@ -0,0 +1,115 @@
+from django.contrib.auth import get_user_model
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import transaction
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.test import TransactionTestCase
+from django.test import override_settings
+
+from apps.middleware import ReplicaStickinessMiddleware
+from apps.projects.dal import ProjectRepository
+from apps.projects.models import Project
+from apps.tasks.models import Task
+from apps.utils.db_router import ReplicaRouter, RoutingState, routing_state
+
+User = get_user_model()
+
+
+@override_settings(DATABASE_REPLICAS=['replica1'], REPLICA_STICKY_SECONDS=10)
+class ReplicaRouterTest(TransactionTestCase):
+    def setUp(self):
+        self.router = ReplicaRouter()
+
+    def route_reads(self, state: RoutingState | None = None) -> str | None:
+        token = routing_state.set(state)
+        try:
+            return self.router.db_for_read(Task)
+        finally:
+            routing_state.reset(token)
+
+    def test_reads_go_to_a_replica(self):
+        self.assertEqual(self.route_reads(), 'replica1')
+        self.assertEqual(self.router.db_for_read(Project), 'replica1')
+
+    def test_other_apps_are_not_routed(self):
+        self.assertIsNone(self.router.db_for_read(User))
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_reads_go_to_the_primary_without_replicas(self):
+        self.assertIsNone(self.route_reads())
+
+    def test_reads_stay_on_the_primary_in_pinned_requests_and_transactions(self):
+        self.assertEqual(self.route_reads(RoutingState(pinned=True)), 'default')
+        with transaction.atomic():
+            self.assertEqual(self.route_reads(), 'default')
+
+    def test_reads_stay_on_the_primary_after_a_write(self):
+        state = RoutingState()
+        token = routing_state.set(state)
+        try:
+            self.assertEqual(self.router.db_for_write(Task), 'default')
+        finally:
+            routing_state.reset(token)
+
+        self.assertTrue(state.wrote)
+        self.assertEqual(self.route_reads(state), 'default')
+
+    def test_project_cards_are_read_from_the_primary(self):
+        user = User.objects.create_user(email='test@example.com', password='testpass123')
+        project = Project.objects.create(name='Project A', user=user)
+        Task.objects.create(name='Task A', project=project)
+
+        # With no replica1 database configured here, any read routed to it would fail
+        card = ProjectRepository().get_by_id_with_task_page(project.id, 5)
+        page = list(ProjectRepository().get_page_by_user(user, None, 10, 5))
+
+        self.assertEqual([task.name for task in card.task_page], ['Task A'])
+        self.assertEqual([task.name for task in page[0].task_page], ['Task A'])
+
+    def test_migrations_only_run_on_the_primary(self):
+        self.assertTrue(self.router.allow_migrate('default', 'tasks'))
+        self.assertFalse(self.router.allow_migrate('replica1', 'tasks'))
+
+
+@override_settings(DATABASE_REPLICAS=['replica1'], REPLICA_STICKY_SECONDS=10)
+class ReplicaStickinessMiddlewareTest(TransactionTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.router = ReplicaRouter()
+        self.routed_to = []
+
+    def view(self, request):
+        self.routed_to.append(self.router.db_for_read(Task))
+        if request.GET.get('write'):
+            self.router.db_for_write(Task)
+        return HttpResponse('')
+
+    def call(self, request):
+        return ReplicaStickinessMiddleware(self.view)(request)
+
+    def test_is_not_used_without_replicas(self):
+        with override_settings(DATABASE_REPLICAS=[]), self.assertRaises(MiddlewareNotUsed):
+            ReplicaStickinessMiddleware(self.view)
+
+    def test_write_pins_the_user_to_the_primary(self):
+        response = self.call(self.factory.post('/tasks/?write=1'))
+
+        cookie = response.cookies[ReplicaStickinessMiddleware.COOKIE_NAME]
+        self.assertEqual(cookie['max-age'], 10)
+        self.assertTrue(cookie['httponly'])
+        self.assertEqual(self.routed_to, ['default'])
+
+        request = self.factory.get('/tasks/')
+        request.COOKIES[ReplicaStickinessMiddleware.COOKIE_NAME] = cookie.value
+        response = self.call(request)
+
+        self.assertNotIn(ReplicaStickinessMiddleware.COOKIE_NAME, response.cookies)
+        self.assertEqual(self.routed_to, ['default', 'default'])
+
+    def test_expired_or_invalid_cookies_are_ignored(self):
+        for value in ('1', 'not-a-timestamp'):
+            request = self.factory.get('/tasks/')
+            request.COOKIES[ReplicaStickinessMiddleware.COOKIE_NAME] = value
+            self.call(request)
+
+        self.assertNotIn('default', self.routed_to)
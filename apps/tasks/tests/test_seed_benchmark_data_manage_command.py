@@ -0,0 +1,87 @@
+from datetime import UTC, datetime, timedelta
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.db.models import Count, Q
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.accounts.models import User
+from apps.projects.models import Project
+from apps.tasks.models import Task
+
+
+class SeedBenchmarkDataManageCommandTestCase(TestCase):
+    def seed(self, prefix: str, *args: str, seed: int = 7) -> list[tuple]:
+        call_command(
+            'seed_benchmark_data',
+            *args,
+            users=3,
+            projects_per_user=4,
+            tasks=600,
+            seed=seed,
+            batch_size=100,
+            email_prefix=prefix,
+            stdout=StringIO(),
+        )
+        return list(
+            Task.objects.filter(user__email__startswith=prefix)
+            .order_by('project__user__email', 'project__name', *Task.SORTED_ORDERING)
+            .values_list('name', 'status', 'priority', 'deadline', 'position')
+        )
+
+    def test_creates_skewed_data_with_consistent_counters(self):
+        self.seed('a')
+
+        self.assertEqual(User.objects.filter(email__startswith='a').count(), 3)
+        projects = Project.objects.filter(user__email__startswith='a').annotate(
+            tasks_total=Count('tasks'),
+            tasks_open=Count('tasks', filter=Q(tasks__status=Task.Status.IN_PROGRESS)),
+            tasks_done=Count('tasks', filter=Q(tasks__status=Task.Status.DONE)),
+            tasks_overdue=Count(
+                'tasks', filter=Q(tasks__status=Task.Status.IN_PROGRESS, tasks__deadline__lt=timezone.now())
+            ),
+        )
+        self.assertEqual(len(projects), 12)
+        self.assertEqual(sum(project.tasks_total for project in projects), 600)
+        for project in projects:
+            self.assertEqual(project.open_count, project.tasks_open)
+            self.assertEqual(project.done_count, project.tasks_done)
+            self.assertEqual(project.overdue_count, project.tasks_overdue)
+
+        # Zipf-distributed: the largest project holds far more than an even share
+        self.assertGreater(max(project.tasks_total for project in projects), 3 * 600 / 12)
+        priorities = Task.objects.filter(user__email__startswith='a').values('priority').annotate(total=Count('id'))
+        most_common = max(priorities, key=lambda row: row['total'])['priority']
+        self.assertEqual(most_common, Task.Priority.MEDIUM)
+
+        tasks = Task.objects.filter(user__email__startswith='a')
+        self.assertTrue(tasks.filter(deadline__isnull=True).exists())
+        self.assertTrue(tasks.filter(deadline__lt=timezone.now()).exists())
+        self.assertTrue(tasks.filter(deadline__gt=timezone.now()).exists())
+
+    def test_same_seed_gives_same_data(self):
+        self.assertEqual(self.seed('a'), self.seed('b'))
+        self.assertNotEqual(self.seed('c'), self.seed('d', seed=8))
+
+    def test_deadlines_are_laid_out_around_now(self):
+        anchor = datetime(2020, 1, 1, tzinfo=UTC)
+
+        rows = self.seed('a', '--now=2020-01-01T00:00:00+00:00')
+
+        deadlines = [deadline for _, _, _, deadline, _ in rows if deadline is not None]
+        self.assertTrue(deadlines)
+        self.assertGreaterEqual(min(deadlines), anchor - timedelta(days=90))
+        self.assertLessEqual(max(deadlines), anchor + timedelta(days=180))
+        # Counted against the real time: every open task is overdue by now
+        self.assertEqual(
+            sum(Project.objects.filter(user__email__startswith='a').values_list('overdue_count', flat=True)),
+            Task.objects.filter(
+                user__email__startswith='a', status=Task.Status.IN_PROGRESS, deadline__isnull=False
+            ).count(),
+        )
+
+    def test_refuses_to_reuse_existing_users(self):
+        self.seed('a')
+        with self.assertRaises(CommandError):
+            self.seed('a')
@@ -2,12 +2,19 @@ from datetime import timedelta
 from unittest.mock import Mock
 
 from django.contrib.auth import get_user_model
+from django.db import connection
 from django.test import TestCase
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 
+from apps.jobs.models import Job
+from apps.jobs.services import JobService
+from apps.projects.models import Project
+from apps.projects.services import ProjectService
 from apps.tasks.models import Task
 from apps.tasks.services import TaskService
-from apps.utils.exceptions import BusinessRuleError, PermissionDeniedError, ValidationError
+from apps.utils.exceptions import BusinessRuleError, ObjectNotFoundError, PermissionDeniedError, ValidationError
 
 User = get_user_model()
 
@@ -66,47 +73,57 @@ class TestTaskService(TestCase):
         task_mock.id = task_id
         task_mock.status = Task.Status.DONE
 
-        self.mock_dal.get_by_id.return_value = task_mock
-        self.mock_validator.validate_complete_task.side_effect = BusinessRuleError('Task is already completed')
+        self.mock_dal.update_owned.return_value = None
+        self.mock_dal.get_owned.return_value = task_mock
+        self.mock_validator.validate_task_completion.side_effect = BusinessRuleError('Task is already completed')
 
         with self.assertRaises(BusinessRuleError):
             self.service.complete_task(self.user, task_id)
 
-        self.mock_dal.update.assert_not_called()
+        self.mock_validator.validate_task_completion.assert_called_once_with(task_mock)
 
     def test_update_task_permission_denied(self):
-        """Test update fails when user doesn't own task."""
+        """Test update fails when user doesn't own task, before the data is validated."""
         task_id = 1
-        task_mock = Mock()
-        task_mock.id = task_id
-        task_mock.project.user = Mock(id=999)
 
-        self.mock_dal.get_by_id.return_value = task_mock
-        self.mock_validator.validate_update_task.side_effect = PermissionDeniedError(
-            'You can only update tasks in your own projects'
+        self.mock_dal.lock_owned.return_value = []
+        self.mock_dal.exists.return_value = True
+        self.mock_validator.deny_access.side_effect = PermissionDeniedError(
+            'You can only access tasks in your own projects'
         )
 
         with self.assertRaises(PermissionDeniedError):
+            self.service.update_task(self.user, task_id, title='')
+
+        self.mock_dal.lock_owned.assert_called_once_with(self.user, [task_id])
+        self.mock_validator.validate_update_data.assert_not_called()
+        self.mock_dal.update_owned.assert_not_called()
+
+    def test_update_task_not_found(self):
+        """Test update of a missing task reports it as not found, not as forbidden."""
+        task_id = 1
+
+        self.mock_dal.lock_owned.return_value = []
+        self.mock_dal.exists.return_value = False
+
+        with self.assertRaises(ObjectNotFoundError):
             self.service.update_task(self.user, task_id, title='New Title')
 
-        self.mock_dal.update.assert_not_called()
+        self.mock_validator.deny_access.assert_not_called()
 
     def test_set_deadline_past_date(self):
         """Test set deadline fails with past date."""
         task_id = 1
         past_deadline = timezone.now() - timedelta(days=1)
-        task_mock = Mock()
-        task_mock.id = task_id
 
-        self.mock_dal.get_by_id.return_value = task_mock
-        self.mock_validator.validate_set_deadline.side_effect = ValidationError(
+        self.mock_validator.validate_deadline.side_effect = ValidationError(
             'deadline', 'Deadline cannot be in the past'
         )
 
         with self.assertRaises(ValidationError):
             self.service.set_deadline(self.user, task_id, past_deadline)
 
-        self.mock_dal.update.assert_not_called()
+        self.mock_dal.update_owned.assert_not_called()
 
     def test_get_user_task_success(self):
         """Test successful task retrieval with permission check."""
@@ -114,23 +131,20 @@ class TestTaskService(TestCase):
         task_mock = Mock()
         task_mock.id = task_id
 
-        self.mock_dal.get_by_id.return_value = task_mock
-        self.mock_validator.validate_ownership.return_value = None
+        self.mock_dal.get_owned.return_value = task_mock
 
         result = self.service.get_user_task(self.user, task_id)
 
-        self.mock_dal.get_by_id.assert_called_once_with(task_id)
-        self.mock_validator.validate_ownership.assert_called_once_with(self.user, task_mock)
+        self.mock_dal.get_owned.assert_called_once_with(self.user, task_id, fields=())
         self.assertEqual(result, task_mock)
 
     def test_get_user_task_permission_denied(self):
         """Test get task fails when user doesn't own task."""
         task_id = 1
-        task_mock = Mock()
-        task_mock.id = task_id
 
-        self.mock_dal.get_by_id.return_value = task_mock
-        self.mock_validator.validate_ownership.side_effect = PermissionDeniedError(
+        self.mock_dal.get_owned.return_value = None
+        self.mock_dal.exists.return_value = True
+        self.mock_validator.deny_access.side_effect = PermissionDeniedError(
             'You can only access tasks in your own projects'
         )
 
@@ -176,6 +190,9 @@ class TestTaskServiceIntegration(TestCase):
 
         with self.assertRaises(PermissionDeniedError):
             self.service.update_task(self.other_user, task.id, title='Hacked')
+        # Not a validation error, whatever was sent
+        with self.assertRaises(PermissionDeniedError):
+            self.service.update_task(self.other_user, task.id, title='', priority=99)
 
         with self.assertRaises(PermissionDeniedError):
             self.service.delete_task(self.other_user, task.id)
@@ -197,3 +214,232 @@ class TestTaskServiceIntegration(TestCase):
 
         with self.assertRaises(BusinessRuleError):
             self.service.complete_task(self.user, task.id)
+
+    def test_toggle_task_status_round_trips(self):
+        """Test toggling flips the status with one conditional UPDATE returning the task and a counter UPDATE."""
+        task = self.service.create_task(self.user, self.project.id, 'Test Task')
+
+        with CaptureQueriesContext(connection) as queries:
+            toggled = self.service.toggle_task_status(self.user, task.id)
+        statements = [query['sql'] for query in queries if 'SAVEPOINT' not in query['sql']]
+        self.assertEqual(len(statements), 2)
+        self.assertIn('RETURNING', statements[0])
+        # Neither ownership nor the live project check joins `tasks_project` into the UPDATE
+        self.assertTrue(statements[0].startswith('UPDATE "tasks_task"'))
+        self.assertNotIn('JOIN', statements[0])
+        self.assertEqual(toggled.status, Task.Status.DONE)
+
+        toggled = self.service.toggle_task_status(self.user, task.id)
+        self.assertEqual(toggled.status, Task.Status.IN_PROGRESS)
+
+        with self.assertRaises(PermissionDeniedError):
+            self.service.toggle_task_status(self.other_user, task.id)
+
+        with self.assertRaises(ObjectNotFoundError):
+            self.service.toggle_task_status(self.user, task.id + 1000)
+
+    def test_task_counters_follow_task_changes(self):
+        """Test create, toggle, complete and delete keep the project counters in step."""
+        yesterday = timezone.now() - timedelta(days=1)
+        overdue = self.service.create_task(self.user, self.project.id, 'Late', deadline=yesterday)
+        task = self.service.create_task(self.user, self.project.id, 'On time')
+        self.assertCounters(open_count=2, done_count=0, overdue_count=1)
+
+        self.service.toggle_task_status(self.user, overdue.id)
+        self.assertCounters(open_count=1, done_count=1, overdue_count=0)
+
+        self.service.toggle_task_status(self.user, overdue.id)
+        self.service.complete_task(self.user, task.id)
+        self.assertCounters(open_count=1, done_count=1, overdue_count=1)
+
+        self.service.set_deadline(self.user, overdue.id, timezone.now() + timedelta(days=1))
+        self.assertCounters(open_count=1, done_count=1, overdue_count=0)
+
+        self.service.delete_task(self.user, overdue.id)
+        self.service.delete_task(self.user, task.id)
+        self.assertCounters(open_count=0, done_count=0, overdue_count=0)
+
+    def test_deadlines_passing_unnoticed_are_not_taken_back(self):
+        """Test a deadline that passed after the last recount is neither counted nor subtracted until the next."""
+        Project.objects.filter(id=self.project.id).update(overdue_as_of=timezone.now() - timedelta(hours=2))
+        task = self.service.create_task(self.user, self.project.id, 'Slipped')
+        Task.objects.filter(id=task.id).update(deadline=timezone.now() - timedelta(hours=1))
+
+        self.service.complete_task(self.user, task.id)
+        self.assertCounters(open_count=0, done_count=1, overdue_count=0)
+
+        self.service.toggle_task_status(self.user, task.id)
+        self.assertCounters(open_count=1, done_count=0, overdue_count=0)
+
+        ProjectService().reconcile_counters(batch_size=10)
+        self.assertCounters(open_count=1, done_count=0, overdue_count=1)
+
+        self.service.set_deadline(self.user, task.id, timezone.now() + timedelta(days=1))
+        self.assertCounters(open_count=1, done_count=0, overdue_count=0)
+
+    def test_task_counters_untouched_by_rejected_changes(self):
+        task = self.service.create_task(self.user, self.project.id, 'Test Task')
+        self.service.complete_task(self.user, task.id)
+
+        with self.assertRaises(BusinessRuleError):
+            self.service.complete_task(self.user, task.id)
+        with self.assertRaises(PermissionDeniedError):
+            self.service.toggle_task_status(self.other_user, task.id)
+
+        self.assertCounters(open_count=0, done_count=1, overdue_count=0)
+
+    def test_delete_task_can_be_restored(self):
+        """Test a deleted task is hidden but kept, and a restore brings it and its counters back."""
+        task = self.service.create_task(self.user, self.project.id, 'Test Task')
+
+        self.service.delete_task(self.user, task.id)
+
+        self.assertCounters(open_count=0, done_count=0, overdue_count=0)
+        self.assertTrue(Task.objects.deleted().filter(id=task.id).exists())
+        with self.assertRaises(ObjectNotFoundError):
+            self.service.get_user_task(self.user, task.id)
+        with self.assertRaises(ObjectNotFoundError):
+            self.service.restore_task(self.other_user, task.id)
+
+        restored = self.service.restore_task(self.user, task.id)
+
+        self.assertEqual(restored.name, 'Test Task')
+        self.assertCounters(open_count=1, done_count=0, overdue_count=0)
+        self.assertEqual(self.service.get_user_task(self.user, task.id), task)
+        with self.assertRaises(ObjectNotFoundError):
+            self.service.restore_task(self.user, task.id)
+
+    def test_restore_task_refused_after_retention(self):
+        task = self.service.create_task(self.user, self.project.id, 'Test Task')
+        self.service.delete_task(self.user, task.id)
+        Task.objects.filter(id=task.id).update(deleted_at=timezone.now() - timedelta(days=30))
+
+        with self.assertRaises(ObjectNotFoundError):
+            self.service.restore_task(self.user, task.id)
+
+    def assertCounters(self, **expected):  # noqa: N802
+        self.project.refresh_from_db(fields=['open_count', 'done_count', 'overdue_count'])
+        actual = {field: getattr(self.project, field) for field in expected}
+        self.assertEqual(actual, expected)
+
+    def test_move_task_writes_one_row(self):
+        """Test moving a task rewrites only its own position."""
+        first, second, third = (self.service.create_task(self.user, self.project.id, f'Task {i}') for i in range(3))
+        positions = {task.id: task.position for task in (first, second)}
+
+        moved = self.service.move_task(self.user, third.id, after_id=None, before_id=first.id)
+
+        ordered = list(Task.objects.filter(project=self.project).order_by(*Task.SORTED_ORDERING))
+        self.assertEqual(ordered, [moved, first, second])
+        self.assertEqual({task.id: task.position for task in ordered[1:]}, positions)
+
+    def test_move_task_rebalances_in_the_background_when_no_key_fits(self):
+        """Test a move between tasks without a position queues a rebalance and is refused until it ran."""
+        tasks = [Task.objects.create(name=f'Legacy {i}', project=self.project) for i in range(3)]
+
+        with self.assertRaises(BusinessRuleError):
+            self.service.move_task(self.user, tasks[2].id, after_id=tasks[0].id, before_id=tasks[1].id)
+        self.assertFalse(any(task.position for task in Task.objects.filter(project=self.project)))
+
+        job = Job.objects.get(kind='tasks.rebalance_project')
+        self.assertEqual(job.payload, {'project_id': self.project.id})
+        JobService().run_next('worker-1')
+
+        self.service.move_task(self.user, tasks[2].id, after_id=tasks[0].id, before_id=tasks[1].id)
+        ordered = list(Task.objects.filter(project=self.project).order_by(*Task.SORTED_ORDERING))
+        self.assertEqual(ordered, [tasks[0], tasks[2], tasks[1]])
+
+    @override_settings(TASK_POSITION_MAX_LENGTH=1)
+    def test_move_task_rebalances_in_the_background_when_keys_grow_too_long(self):
+        """Test a move leaving a key over the length limit queues one rebalance, however many moves follow."""
+        first, second, third = (
+            Task.objects.create(name=f'Task {i}', project=self.project, position=position)
+            for i, position in enumerate(('a', 'b', 'c'))
+        )
+
+        self.service.move_task(self.user, third.id, after_id=first.id, before_id=second.id)
+        self.service.move_task(self.user, first.id, after_id=third.id, before_id=second.id)
+
+        job = Job.objects.get(kind='tasks.rebalance_project')
+        self.assertEqual(job.payload, {'project_id': self.project.id})
+        JobService().run_next('worker-1')
+        self.assertEqual(
+            list(Task.objects.filter(project=self.project).order_by(*Task.SORTED_ORDERING)), [third, first, second]
+        )
+        self.assertTrue(all(len(task.position) <= 1 for task in Task.objects.filter(project=self.project)))
+
+    def test_move_task_refuses_neighbours_out_of_order(self):
+        first, second, third = (self.service.create_task(self.user, self.project.id, f'Task {i}') for i in range(3))
+
+        with self.assertRaises(ValidationError):
+            self.service.move_task(self.user, first.id, after_id=third.id, before_id=second.id)
+
+        self.assertFalse(Job.objects.exists())
+        ordered = list(Task.objects.filter(project=self.project).order_by(*Task.SORTED_ORDERING))
+        self.assertEqual(ordered, [first, second, third])
+
+    def test_move_task_access_control(self):
+        task = self.service.create_task(self.user, self.project.id, 'Mine')
+        other_task = self.service.create_task(self.other_user, self.other_project.id, 'Theirs')
+
+        with self.assertRaises(PermissionDeniedError):
+            self.service.move_task(self.other_user, task.id, before_id=other_task.id)
+        with self.assertRaises(ValidationError):
+            self.service.move_task(self.user, task.id, before_id=other_task.id)
+        with self.assertRaises(ValidationError):
+            self.service.move_task(self.user, task.id, after_id=task.id)
+
+    def test_bulk_complete_uses_set_based_writes(self):
+        """Test completing many tasks locks them in one query and writes them in one UPDATE."""
+        tasks = [self.service.create_task(self.user, self.project.id, f'Task {i}') for i in range(5)]
+        self.service.complete_task(self.user, tasks[0].id)
+
+        with CaptureQueriesContext(connection) as queries:
+            completed, project_ids = self.service.bulk_complete(self.user, [task.id for task in tasks])
+        statements = [query['sql'] for query in queries if 'SAVEPOINT' not in query['sql']]
+
+        self.assertEqual(len([sql for sql in statements if sql.startswith('UPDATE "tasks_task"')]), 1)
+        self.assertEqual(len(statements), 4)
+        self.assertEqual({task.status for task in completed}, {Task.Status.DONE})
+        self.assertEqual(project_ids, {self.project.id})
+        self.assertCounters(open_count=0, done_count=5, overdue_count=0)
+
+    def test_bulk_delete_and_move_keep_counters(self):
+        """Test bulk delete and move adjust the counters of every project involved."""
+        target = Project.objects.create(name='Target Project', user=self.user)
+        tasks = [self.service.create_task(self.user, self.project.id, f'Task {i}') for i in range(4)]
+
+        moved, project_ids = self.service.bulk_move(self.user, [task.id for task in tasks[:2]], target.id)
+
+        self.assertEqual({task.project_id for task in moved}, {target.id})
+        self.assertLess(moved[0].position, moved[1].position)
+        self.assertEqual(project_ids, {self.project.id, target.id})
+        self.assertCounters(open_count=2, done_count=0, overdue_count=0)
+        target.refresh_from_db()
+        self.assertEqual(target.open_count, 2)
+
+        deleted, _ = self.service.bulk_delete(self.user, [task.id for task in tasks[2:]])
+
+        self.assertEqual(len(deleted), 2)
+        self.assertFalse(Task.objects.live().filter(project=self.project).exists())
+        self.assertCounters(open_count=0, done_count=0, overdue_count=0)
+
+        self.service.restore_task(self.user, deleted[0].id)
+        self.assertCounters(open_count=1, done_count=0, overdue_count=0)
+
+    def test_bulk_operations_reject_foreign_tasks(self):
+        """Test one foreign or missing id rejects the whole bulk operation."""
+        task = self.service.create_task(self.user, self.project.id, 'Mine')
+        other_task = self.service.create_task(self.other_user, self.other_project.id, 'Theirs')
+
+        with self.assertRaises(PermissionDeniedError):
+            self.service.bulk_set_priority(self.user, [task.id, other_task.id], Task.Priority.HIGH)
+        with self.assertRaises(ObjectNotFoundError):
+            self.service.bulk_delete(self.user, [task.id, other_task.id + 1000])
+        with self.assertRaises(PermissionDeniedError):
+            self.service.bulk_move(self.user, [task.id], self.other_project.id)
+        with self.assertRaises(ValidationError):
+            self.service.bulk_complete(self.user, [])
+
+        task.refresh_from_db()
+        self.assertEqual(task.priority, Task.Priority.MEDIUM)
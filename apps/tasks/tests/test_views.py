@@ -1,9 +1,13 @@
+import json
+
 from django.contrib.auth import get_user_model
 from django.test import TestCase
+from django.test import override_settings
 from django.urls import reverse
 
 from apps.projects.models import Project
 from apps.tasks.models import Task
+from apps.utils.pagination import encode_cursor
 
 User = get_user_model()
 
@@ -43,6 +47,116 @@ class TaskViewsTest(TestCase):
 
         self.assertEqual(response.status_code, 400)
 
+    @override_settings(PROJECT_TASKS_PAGE_SIZE=2)
+    def test_task_page_load_more(self):
+        tasks = [Task.objects.create(name=f'Task {i}', project=self.project) for i in range(3)]
+        page_url = reverse('tasks:page', kwargs={'project_id': self.project.id})
+
+        response = self.client.get(page_url, HTTP_HX_REQUEST='true')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([task.id for task in response.context['tasks']], [tasks[0].id, tasks[1].id])
+        self.assertContains(response, 'task-load-more')
+
+        response = self.client.get(page_url, {'cursor': response.context['next_cursor']}, HTTP_HX_REQUEST='true')
+
+        self.assertEqual([task.id for task in response.context['tasks']], [tasks[2].id])
+        self.assertNotContains(response, 'task-load-more')
+
+    def test_task_page_invalid_cursor(self):
+        page_url = reverse('tasks:page', kwargs={'project_id': self.project.id})
+
+        response = self.client.get(page_url, {'cursor': 'not-a-cursor'}, HTTP_HX_REQUEST='true')
+
+        self.assertEqual(response.status_code, 400)
+
+        # Well-formed, but with values that do not fit the sort columns
+        for values in (['x', 'r', 1], [0, 'r', 'x'], [0, None, 1], [{}, 'r', 1], [0, 'r', 2**64]):
+            response = self.client.get(page_url, {'cursor': encode_cursor(values)}, HTTP_HX_REQUEST='true')
+            self.assertEqual(response.status_code, 400)
+
+    def test_toggle_task_row_mode(self):
+        older = Task.objects.create(name='Older', project=self.project, position='r')
+        newer = Task.objects.create(name='Newer', project=self.project, position='i')
+        toggle_url = reverse('tasks:toggle', kwargs={'task_id': newer.id})
+
+        response = self.client.post(toggle_url, data={'render': 'row'}, HTTP_HX_REQUEST='true')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'partials/task_row.html')
+        self.assertTemplateNotUsed(response, 'partials/task_list.html')
+        moved = json.loads(response['HX-Trigger-After-Swap'])['taskMoved']
+        self.assertEqual(moved, {'taskId': newer.id, 'afterId': older.id, 'listId': f'task-list-{self.project.id}'})
+
+        response = self.client.post(toggle_url, data={'render': 'row'}, HTTP_HX_REQUEST='true')
+
+        self.assertIsNone(json.loads(response['HX-Trigger-After-Swap'])['taskMoved']['afterId'])
+
+    def test_move_task_between_neighbours(self):
+        first, second, third = (
+            Task.objects.create(name=name, project=self.project, position=position)
+            for name, position in (('First', 'a'), ('Second', 'i'), ('Third', 'r'))
+        )
+        move_url = reverse('tasks:move', kwargs={'task_id': third.id})
+
+        response = self.client.post(
+            move_url, data={'render': 'row', 'after_id': first.id, 'before_id': second.id}, HTTP_HX_REQUEST='true'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        third.refresh_from_db()
+        self.assertTrue(first.position < third.position < second.position)
+        moved = json.loads(response['HX-Trigger-After-Swap'])['taskMoved']
+        self.assertEqual(moved['afterId'], first.id)
+
+    def test_move_task_next_to_other_project_task(self):
+        task = Task.objects.create(name='Mine', project=self.project, position='i')
+        other_project = Project.objects.create(name='Other Project', user=self.user)
+        other_task = Task.objects.create(name='Other', project=other_project, position='i')
+        move_url = reverse('tasks:move', kwargs={'task_id': task.id})
+
+        response = self.client.post(move_url, data={'after_id': other_task.id}, HTTP_HX_REQUEST='true')
+
+        self.assertEqual(response.status_code, 400)
+        task.refresh_from_db()
+        self.assertEqual(task.position, 'i')
+
+    def test_bulk_complete_returns_oob_rows_and_counts(self):
+        tasks = [Task.objects.create(name=f'Task {i}', project=self.project) for i in range(2)]
+
+        response = self.client.post(
+            reverse('tasks:bulk'),
+            data={'action': 'complete', 'task_ids': [task.id for task in tasks]},
+            HTTP_HX_REQUEST='true',
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Task.objects.filter(status=Task.Status.DONE).count(), 2)
+        self.assertContains(response, 'hx-swap-oob="true"', count=3)
+        self.assertContains(response, f'id="project-counts-{self.project.id}"')
+
+    def test_bulk_delete_returns_oob_undo_rows(self):
+        task = Task.objects.create(name='Task', project=self.project)
+
+        response = self.client.post(
+            reverse('tasks:bulk'), data={'action': 'delete', 'task_ids': [task.id]}, HTTP_HX_REQUEST='true'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'hx-swap-oob="true"', count=2)
+        self.assertContains(response, reverse('tasks:restore', args=[task.id]))
+        self.assertFalse(Task.objects.live().exists())
+        self.assertTrue(Task.objects.deleted().filter(id=task.id).exists())
+
+    def test_bulk_priority_requires_priority(self):
+        task = Task.objects.create(name='Task', project=self.project)
+
+        response = self.client.post(
+            reverse('tasks:bulk'), data={'action': 'priority', 'task_ids': [task.id]}, HTTP_HX_REQUEST='true'
+        )
+
+        self.assertEqual(response.status_code, 422)
+
     def test_toggle_task_status(self):
         task = Task.objects.create(name='Task to Toggle', project=self.project)
         action_url = reverse('tasks:action', kwargs={'task_id': task.id})
@@ -6,8 +6,12 @@ app_name = 'tasks'
 
 urlpatterns = [
     path('<int:project_id>/create/', views.TaskCreateView.as_view(), name='create'),
+    path('<int:project_id>/page/', views.TaskPageView.as_view(), name='page'),
+    path('bulk/', views.TaskBulkView.as_view(), name='bulk'),
     path('<int:task_id>/', views.TaskResourceView.as_view(), name='resource'),
+    path('<int:task_id>/restore/', views.TaskRestoreView.as_view(), name='restore'),
     path('<int:task_id>/toggle/', views.TaskToggleView.as_view(), name='toggle'),
+    path('<int:task_id>/move/', views.TaskMoveView.as_view(), name='move'),
     path('<int:task_id>/edit-form/', views.TaskEditFormView.as_view(), name='edit_form'),
     path('<int:task_id>/cancel/', views.TaskCancelEditView.as_view(), name='cancel'),
 ]
@@ -1,13 +1,17 @@
+from collections.abc import Sequence
 from datetime import datetime
 from typing import TYPE_CHECKING
 
+from django.conf import settings
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 
+from apps.tasks.models import Task
 from apps.utils.exceptions import BusinessRuleError, PermissionDeniedError, ValidationError
+from apps.utils.streaming import CONTENT_TYPES
 
 if TYPE_CHECKING:
     from apps.accounts.models import User
-    from apps.tasks.models import Task
 
 
 class TaskValidator:
@@ -45,14 +49,108 @@ class TaskValidator:
 
     def validate_ownership(self, user: 'User', task: 'Task'):
         if task.project.user != user:
-            message = 'You can only access tasks in your own projects'
-            raise PermissionDeniedError(message)
+            self.deny_access()
+
+    def deny_access(self):
+        message = 'You can only access tasks in your own projects'
+        raise PermissionDeniedError(message)
 
     def validate_task_completion(self, task: 'Task'):
         if task.status == task.Status.DONE:
             message = 'Task is already completed'
             raise BusinessRuleError(message)
 
+    def validate_move_target(self, task_id: int, after_id: int | None, before_id: int | None):
+        if task_id in (after_id, before_id):
+            field = 'position'
+            message = 'A task cannot be moved next to itself'
+            raise ValidationError(field, message)
+
+    def validate_move_neighbour(self, neighbour: 'Task | None', project_id: int):
+        if neighbour is None or neighbour.project_id != project_id:
+            field = 'position'
+            message = 'Tasks can only be moved within their own project'
+            raise ValidationError(field, message)
+
+    def validate_move_order(self, lower: str, upper: str | None):
+        if lower and upper and lower > upper:
+            field = 'position'
+            message = 'The neighbouring tasks are out of order'
+            raise ValidationError(field, message)
+
+    def deny_move_until_rebalanced(self):
+        message = 'The task order of this project is being repaired, try again in a moment'
+        raise BusinessRuleError(message)
+
+    def validate_bulk_task_ids(self, task_ids: Sequence[int]) -> list[int]:
+        unique_ids = sorted(set(task_ids))
+        if not unique_ids:
+            field = 'task_ids'
+            message = 'Select at least one task'
+            raise ValidationError(field, message)
+
+        if len(unique_ids) > settings.TASK_BULK_MAX_SIZE:
+            field = 'task_ids'
+            message = f'Too many tasks selected (max {settings.TASK_BULK_MAX_SIZE})'
+            raise ValidationError(field, message)
+
+        return unique_ids
+
+    def validate_import_format(self, fmt: str):
+        if fmt not in CONTENT_TYPES:
+            field = 'format'
+            message = f'Unknown import format (use one of: {", ".join(CONTENT_TYPES)})'
+            raise ValidationError(field, message)
+
+    def validate_import_record(self, record: dict | None):
+        if record is None:
+            field = 'row'
+            message = 'Malformed row'
+            raise ValidationError(field, message)
+
+    def validate_import_project_id(self, project_id):
+        if not str(project_id or '').isdigit():
+            field = 'project'
+            message = 'Each task needs a project name or project id'
+            raise ValidationError(field, message)
+
+    def validate_import_row(self, row: dict) -> dict:
+        """
+        Validate and convert one imported task row.
+
+        Unlike interactive edits, past deadlines are accepted: imports carry history.
+        """
+        name = self.validate_title_format(str(row.get('name') or ''))
+
+        status = row.get('status') or Task.Status.IN_PROGRESS
+        if status not in Task.Status.values:
+            field = 'status'
+            message = f'Unknown status {status!r}'
+            raise ValidationError(field, message)
+
+        priority = row.get('priority') or Task.Priority.MEDIUM
+        try:
+            priority = int(priority)
+        except (TypeError, ValueError):
+            priority = None
+        self.validate_priority(priority)
+
+        deadline = row.get('deadline') or None
+        if deadline is not None:
+            deadline = self._parse_deadline(deadline)
+
+        return {'name': name, 'status': status, 'priority': priority, 'deadline': deadline}
+
+    def _parse_deadline(self, value) -> datetime:
+        parsed = parse_datetime(str(value))
+        if parsed is None:
+            field = 'deadline'
+            message = f'Invalid deadline {value!r}'
+            raise ValidationError(field, message)
+        if timezone.is_naive(parsed):
+            parsed = timezone.make_aware(parsed)
+        return parsed
+
     def validate_create_task(self, title: str) -> str:
         """Complete validation for task creation."""
         return self.validate_title_format(title)
@@ -67,7 +165,15 @@ class TaskValidator:
     ) -> dict:
         """Complete validation for task update."""
         self.validate_ownership(user, task)
+        return self.validate_update_data(title=title, priority=priority, deadline=deadline)
 
+    def validate_update_data(
+        self,
+        title: str | None = None,
+        priority: int | None = None,
+        deadline: datetime | None = None,
+    ) -> dict:
+        """Validate the fields of a task update, independently of who owns the task."""
         validated_data = {}
 
         if title is not None:
@@ -1,10 +1,16 @@
+import json
+
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.http import HttpRequest, HttpResponse, QueryDict
 from django.shortcuts import render
 from django.views import View
 
-from apps.tasks.forms import TaskCreateForm, TaskUpdateForm
+from apps.tasks.forms import TaskBulkForm, TaskCreateForm, TaskMoveForm, TaskUpdateForm
+from apps.tasks.models import Task
 from apps.tasks.services import TaskService
+from apps.utils.mixins import AsyncLoginRequiredMixin
+
+ROW_RENDER_MODE = 'row'
 
 
 class BaseTaskView(LoginRequiredMixin, View):
@@ -13,6 +19,42 @@ class BaseTaskView(LoginRequiredMixin, View):
         self.service = TaskService()
 
 
+class AsyncTaskView(AsyncLoginRequiredMixin, View):
+    """Base of the read views, served on the event loop under ASGI instead of in a worker thread."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.service = TaskService()
+
+
+def render_task_change(request: HttpRequest, service: TaskService, task: Task, data: QueryDict) -> HttpResponse:
+    """
+    Render the response to a single-task write.
+
+    With `render=row` only the changed row is returned, plus a `taskMoved` event
+    carrying the id of the row it now sits after, so the cost does not depend on
+    the project size. Otherwise the first page of the whole list is re-rendered
+    for the `morph:innerHTML` swap.
+    """
+    if data.get('render') == ROW_RENDER_MODE:
+        response = render(request, 'partials/task_row.html', {'task': task})
+        response['HX-Trigger-After-Swap'] = json.dumps({
+            'taskMoved': {
+                'taskId': task.id,
+                'afterId': service.get_task_position(task),
+                'listId': f'task-list-{task.project_id}',
+            },
+        })
+        return response
+
+    tasks, next_cursor = service.get_project_tasks_page(request.user, task.project_id)
+    return render(
+        request,
+        'partials/task_list.html',
+        {'tasks': tasks, 'project_id': task.project_id, 'next_cursor': next_cursor},
+    )
+
+
 class TaskCreateView(BaseTaskView):
     def post(self, request: HttpRequest, project_id: int) -> HttpResponse:
         form = TaskCreateForm(request.POST)
@@ -49,32 +91,93 @@ class TaskResourceView(BaseTaskView):
                 update_data['deadline'] = form.cleaned_data['deadline']
 
             task = self.service.update_task(user=request.user, task_id=task_id, **update_data)
-            tasks = self.service.get_project_tasks_sorted(request.user, task.project.id)
-            return render(request, 'partials/task_list.html', {'tasks': tasks, 'project_id': task.project.id})
+            return render_task_change(request, self.service, task, data)
 
         task = self.service.get_user_task(request.user, task_id)
         return render(request, 'partials/task_edit_form.html', {'task': task, 'form_errors': form.errors}, status=422)
 
     def delete(self, request: HttpRequest, task_id: int) -> HttpResponse:
-        self.service.delete_task(request.user, task_id)
-        return HttpResponse('')
+        task = self.service.delete_task(request.user, task_id)
+        return render(request, 'partials/task_deleted_row.html', {'task': task})
+
+
+class TaskRestoreView(BaseTaskView):
+    def post(self, request: HttpRequest, task_id: int) -> HttpResponse:
+        task = self.service.restore_task(request.user, task_id)
+        return render(request, 'partials/task_row.html', {'task': task})
 
 
 class TaskToggleView(BaseTaskView):
     def post(self, request: HttpRequest, task_id: int) -> HttpResponse:
         task = self.service.toggle_task_status(request.user, task_id)
-        tasks = self.service.get_project_tasks_sorted(request.user, task.project.id)
-        return render(request, 'partials/task_list.html', {'tasks': tasks, 'project_id': task.project.id})
+        return render_task_change(request, self.service, task, request.POST)
 
 
+class TaskMoveView(BaseTaskView):
+    def post(self, request: HttpRequest, task_id: int) -> HttpResponse:
+        form = TaskMoveForm(request.POST)
+        if not form.is_valid():
+            return HttpResponse(status=422)
+
+        task = self.service.move_task(
+            request.user,
+            task_id,
+            after_id=form.cleaned_data.get('after_id'),
+            before_id=form.cleaned_data.get('before_id'),
+        )
+        return render_task_change(request, self.service, task, request.POST)
+
+
+class TaskBulkView(BaseTaskView):
+    def post(self, request: HttpRequest) -> HttpResponse:
+        """
+        Apply one action to many tasks and answer with a single fragment of out-of-band swaps.
+
+        The fragment replaces changed rows, swaps deleted rows for their Undo line, removes
+        moved-away rows, appends them to their new list and refreshes the counters of every project involved.
+        """
+        form = TaskBulkForm(request.POST)
+        if not form.is_valid():
+            return HttpResponse(status=422)
+
+        action = form.cleaned_data['action']
+        task_ids = form.cleaned_data['task_ids']
+        context = {'tasks': [], 'removed_tasks': [], 'deleted_tasks': [], 'target_project_id': None}
+
+        if action == TaskBulkForm.COMPLETE:
+            context['tasks'], project_ids = self.service.bulk_complete(request.user, task_ids)
+        elif action == TaskBulkForm.PRIORITY:
+            priority = form.cleaned_data['priority']
+            context['tasks'], project_ids = self.service.bulk_set_priority(request.user, task_ids, priority)
+        elif action == TaskBulkForm.DELETE:
+            context['deleted_tasks'], project_ids = self.service.bulk_delete(request.user, task_ids)
+        else:
+            target_project_id = form.cleaned_data['project_id']
+            context['tasks'], project_ids = self.service.bulk_move(request.user, task_ids, target_project_id)
+            context['removed_tasks'] = context['tasks']
+            context['target_project_id'] = target_project_id
 
-class TaskEditFormView(BaseTaskView):
-    def get(self, request: HttpRequest, task_id: int) -> HttpResponse:
-        task = self.service.get_user_task(request.user, task_id)
+        context['projects'] = self.service.project_service.get_user_project_counters(request.user, project_ids)
+        return render(request, 'partials/task_bulk_result.html', context)
+
+
+class TaskPageView(BaseTaskView):
+    def get(self, request: HttpRequest, project_id: int) -> HttpResponse:
+        tasks, next_cursor = self.service.get_project_tasks_page(request.user, project_id, request.GET.get('cursor'))
+        return render(
+            request,
+            'partials/task_page.html',
+            {'tasks': tasks, 'project_id': project_id, 'next_cursor': next_cursor},
+        )
+
+
+class TaskEditFormView(AsyncTaskView):
+    async def get(self, request: HttpRequest, task_id: int) -> HttpResponse:
+        task = await self.service.aget_user_task(request.user, task_id)
         return render(request, 'partials/task_edit_form.html', {'task': task})
 
 
-class TaskCancelEditView(BaseTaskView):
-    def get(self, request: HttpRequest, task_id: int) -> HttpResponse:
-        task = self.service.get_user_task(request.user, task_id)
+class TaskCancelEditView(AsyncTaskView):
+    async def get(self, request: HttpRequest, task_id: int) -> HttpResponse:
+        task = await self.service.aget_user_task(request.user, task_id)
         return render(request, 'partials/task_row.html', {'task': task})
@@ -26,4 +26,6 @@ urlpatterns = [
     path('', ProjectListView.as_view(), name='dashboard'),
     path('projects/', include('apps.projects.urls')),
     path('tasks/', include('apps.tasks.urls')),
+    path('monitoring/', include('apps.monitoring.urls')),
+    path('jobs/', include('apps.jobs.urls')),
 ]
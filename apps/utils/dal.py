@@ -1,9 +1,12 @@
 """Base repository implementing the Repository pattern for data access."""
 from abc import ABC
+from collections.abc import Sequence
 from typing import Any
 
-from django.db import models
-from django.db.models import QuerySet
+from django.db import connections, models, router, transaction
+from django.db.models import Q, QuerySet
+from django.db.models.sql import UpdateQuery
+from django.utils import timezone
 
 from apps.utils.decorators import handle_dal_exceptions
 
@@ -19,36 +22,122 @@ class BaseRepository(ABC):
     def __init__(self, model):
         self.model = model
 
-    @handle_dal_exceptions
+    def get_queryset(self) -> QuerySet:
+        """Rows the repository's reads and writes start from. Override to hide rows, e.g. tombstones."""
+        return self.model.objects.all()
+
+    @handle_dal_exceptions(retry=True)
     def get_by_id(self, obj_id: int) -> models.Model:
         """Get a single object by its ID."""
-        return self.model.objects.get(id=obj_id)
+        return self.get_queryset().get(id=obj_id)
+
+    @handle_dal_exceptions(retry=True)
+    async def aget_by_id(self, obj_id: int) -> models.Model:
+        """Async `get_by_id`, for views running on the event loop."""
+        return await self.get_queryset().aget(id=obj_id)
 
     def get_all(self) -> QuerySet:
         """Get all objects."""
-        return self.model.objects.all()
+        return self.get_queryset()
 
     def filter_by(self, **kwargs: Any) -> QuerySet:
         """Filter objects by given criteria."""
-        return self.model.objects.filter(**kwargs)
+        return self.get_queryset().filter(**kwargs)
 
     @handle_dal_exceptions
     def create(self, **kwargs: Any) -> models.Model:
         """Create a new object."""
-        return self.model.objects.create(**kwargs)
+        instance = self.model.objects.create(**kwargs)
+        self.invalidate_cache(instance)
+        return instance
 
     @handle_dal_exceptions
+    def bulk_create(self, objects: Sequence[models.Model], batch_size: int | None = None) -> list[models.Model]:
+        """Insert many objects with multi-row `INSERT`s. Bypasses `save()` and the cache hook."""
+        return self.model.objects.bulk_create(objects, batch_size=batch_size)
+
+    @handle_dal_exceptions(retry=True)
+    def bulk_update(self, objects: Sequence[models.Model], fields: Sequence[str], batch_size: int | None = None) -> int:
+        """Write `fields` of many objects with batched `UPDATE ... CASE` statements. Bypasses the cache hook."""
+        return self.model.objects.bulk_update(objects, fields, batch_size=batch_size)
+
+    @handle_dal_exceptions(retry=True)
     def update(self, instance: models.Model, **kwargs: Any) -> models.Model:
-        """Update an existing object."""
-        for key, value in kwargs.items():
-            setattr(instance, key, value)
-        instance.save()
+        """Update an existing object, writing only the fields whose value changed."""
+        changed_fields = [key for key, value in kwargs.items() if self._has_changed(instance, key, value)]
+        if not changed_fields:
+            return instance
+
+        for key in changed_fields:
+            setattr(instance, key, kwargs[key])
+        instance.save(update_fields=[*changed_fields, *self._auto_now_fields()])
+        self.invalidate_cache(instance)
         return instance
 
+    @handle_dal_exceptions(retry=True)
+    def update_where(self, filters: Q | dict[str, Any], **values: Any) -> int:
+        """
+        Update every matching row with a single `UPDATE`, without loading them.
+
+        `auto_now` fields are bumped like `save()` would. Cached fragments are not
+        invalidated, as the rows are never loaded; callers that know the affected
+        instances should call `invalidate_cache` themselves. Returns the number of rows.
+        """
+        queryset = self.get_queryset().filter(filters) if isinstance(filters, Q) else self.filter_by(**filters)
+        return queryset.update(**self._with_auto_now(values))
+
+    @handle_dal_exceptions(retry=True)
+    def update_returning(self, filters: Q, **values: Any) -> list[models.Model]:
+        """
+        `update_where`, loading the updated rows from the same statement with `UPDATE ... RETURNING`.
+
+        On databases that can't return rows from an `UPDATE`, they are locked and read first
+        and read back after, in a transaction. Cached fragments are not invalidated.
+        """
+        queryset = self.get_queryset().filter(filters)
+        values = self._with_auto_now(values)
+        using = router.db_for_write(self.model)
+        connection = connections[using]
+        if connection.vendor == 'postgresql' or (
+            connection.vendor == 'sqlite' and connection.features.can_return_columns_from_insert
+        ):
+            query = queryset.query.chain(UpdateQuery)
+            query.add_update_values(values)
+            sql, params = query.get_compiler(using).as_sql()
+            return list(self.model.objects.raw(f'{sql} RETURNING *', params, using=using))
+
+        with transaction.atomic(using=using):
+            pks = list(queryset.using(using).select_for_update().values_list('pk', flat=True))
+            self.model.objects.using(using).filter(pk__in=pks).update(**values)
+            return list(self.model.objects.using(using).filter(pk__in=pks))
+
     def delete(self, instance: models.Model) -> None:
         """Delete an object."""
         instance.delete()
+        self.invalidate_cache(instance)
+
+    def invalidate_cache(self, instance: models.Model) -> None:  # noqa: B027
+        """Drop cached fragments that render `instance`. Called after every write."""
 
     def exists(self, **kwargs: Any) -> bool:
         """Check if objects matching the given criteria exist."""
-        return self.model.objects.filter(**kwargs).exists()
+        return self.filter_by(**kwargs).exists()
+
+    async def aexists(self, **kwargs: Any) -> bool:
+        """Async `exists`."""
+        return await self.filter_by(**kwargs).aexists()
+
+    def _has_changed(self, instance: models.Model, name: str, value: Any) -> bool:
+        # Compare foreign keys by id, so checking for a change never loads the related row
+        field = self.model._meta.get_field(name)
+        if isinstance(value, models.Model):
+            value = value.pk
+        return getattr(instance, field.attname) != value
+
+    def _with_auto_now(self, values: dict[str, Any]) -> dict[str, Any]:
+        # Bump `auto_now` fields like `save()` would
+        now = timezone.now()
+        return {**dict.fromkeys(self._auto_now_fields(), now), **values}
+
+    def _auto_now_fields(self) -> list[str]:
+        return [field.name for field in self.model._meta.concrete_fields if getattr(field, 'auto_now', False)]
@@ -0,0 +1,56 @@
+"""Database router sending reads of projects and tasks to read replicas, and everything else to the primary."""
+import random
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# Models read through ProjectRepository and TaskRepository
+ROUTED_APP_LABELS = frozenset({'projects', 'tasks'})
+
+
+@dataclass
+class RoutingState:
+    """Per-request routing flags, set up by `ReplicaStickinessMiddleware`."""
+
+    # Read from the primary for the whole request
+    pinned: bool = False
+    # A routed model was written during the request
+    wrote: bool = False
+
+
+routing_state: ContextVar[RoutingState | None] = ContextVar('routing_state', default=None)
+
+
+class ReplicaRouter:
+    """
+    Route reads of routed models to a random replica in `DATABASE_REPLICAS`.
+
+    Reads stay on the primary inside a transaction on it, in pinned requests and once the
+    current request has written, so a request always sees its own writes.
+    """
+
+    def db_for_read(self, model, **hints):  # noqa: ARG002
+        if not settings.DATABASE_REPLICAS or model._meta.app_label not in ROUTED_APP_LABELS:
+            return None
+
+        state = routing_state.get()
+        if state is not None and (state.pinned or state.wrote):
+            return DEFAULT_DB_ALIAS
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return random.choice(settings.DATABASE_REPLICAS)  # noqa: S311
+
+    def db_for_write(self, model, **hints):  # noqa: ARG002
+        state = routing_state.get()
+        if state is not None and model._meta.app_label in ROUTED_APP_LABELS:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):  # noqa: ARG002
+        # Replicas hold the same rows as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):  # noqa: ARG002
+        return db not in settings.DATABASE_REPLICAS
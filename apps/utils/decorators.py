@@ -1,40 +1,192 @@
+import asyncio
+import inspect
 import logging
-from functools import wraps
+import random
+import time
+from contextlib import suppress
+from contextvars import ContextVar
+from functools import partial, wraps
+from typing import NoReturn
 
+from asgiref.sync import sync_to_async
+
+from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist
-from django.db import DatabaseError, IntegrityError
+from django.db import DatabaseError, IntegrityError, InterfaceError, OperationalError, connections
+from django.dispatch import Signal
 
+from apps.utils import metrics
 from apps.utils.exceptions import DALError, ObjectNotFoundError, ValidationError
 
 logger = logging.getLogger(__name__)
 
+# Repository call in progress, e.g. 'TaskRepository.lock_owned', so slow statements can be traced to it
+current_dal_call: ContextVar[str | None] = ContextVar('current_dal_call', default=None)
+# Sent with `name` and `duration_ms` when a repository call takes `SLOW_DAL_CALL_THRESHOLD_MS` or longer
+slow_dal_call = Signal()
+
+SERIALIZATION_FAILURE = '40001'
+DEADLOCK_DETECTED = '40P01'
+# Connection exceptions (class 08) and server shutdowns
+CONNECTION_SQLSTATES = ('08', '57P01', '57P02', '57P03')
 
-def handle_dal_exceptions(func):
+
+def handle_dal_exceptions(func=None, *, retry: bool = False):
     """
     Decorator to handle Django ORM exceptions and translate to domain exceptions.
 
     Catches specific Django database exceptions and converts them to our
     domain-specific exceptions while preserving the original stacktrace.
+    Also names the call in `current_dal_call` and reports it through
+    `slow_dal_call` when it is slow. Works on `async def` methods too.
+
+    With `retry=True`, for idempotent operations only, serialization failures,
+    deadlocks and dropped connections are retried with jittered backoff, up to
+    `DAL_RETRY_MAX_ATTEMPTS` attempts. Calls made inside a transaction, or from
+    another repository call, are never retried: the caller owns the retry.
     """
+    if func is None:
+        return partial(handle_dal_exceptions, retry=retry)
+
+    if inspect.iscoroutinefunction(func):
+        return _async_wrapper(func, retry=retry)
 
     @wraps(func)
     def wrapper(self, *args, **kwargs):
+        name = f'{type(self).__name__}.{func.__name__}'
+        retry_here = retry and current_dal_call.get() is None
+        token = current_dal_call.set(name)
+        started = time.perf_counter()
         try:
-            return func(self, *args, **kwargs)
-        except ObjectDoesNotExist:
-            # Extract identifier from method arguments
-            identifier = args[0] if args else str(kwargs) if kwargs else 'object'
-            raise ObjectNotFoundError(self.model.__name__, identifier) from None
-        except IntegrityError as e:
-            # Database constraint violations (unique, foreign key)
-            logger.exception('Database constraint violation in %s', func.__name__)
-            error_field = 'database'
-            error_message = str(e)
-            raise ValidationError(error_field, error_message) from e
-        except DatabaseError as e:
-            # General database errors (connection, syntax, etc.)
-            logger.exception('Database error in %s', func.__name__)
-            error_message = f'Database error: {e!s}'
-            raise DALError(error_message) from e
+            attempt = 1
+            while True:
+                try:
+                    return func(self, *args, **kwargs)
+                except (DatabaseError, DALError) as e:
+                    delay = _retry_delay(e, name, attempt) if retry_here else None
+                    if delay is None:
+                        raise
+                time.sleep(delay)
+                attempt += 1
+        except (ObjectDoesNotExist, DatabaseError) as e:
+            _raise_domain_error(self, func, args, kwargs, e)
+        finally:
+            current_dal_call.reset(token)
+            duration_ms = _slow_duration_ms(started)
+            if duration_ms is not None:
+                slow_dal_call.send(sender=type(self), name=name, duration_ms=duration_ms)
 
     return wrapper
+
+
+def _async_wrapper(func, *, retry: bool):
+    @wraps(func)
+    async def wrapper(self, *args, **kwargs):
+        name = f'{type(self).__name__}.{func.__name__}'
+        retry_here = retry and current_dal_call.get() is None
+        token = current_dal_call.set(name)
+        started = time.perf_counter()
+        try:
+            attempt = 1
+            while True:
+                try:
+                    return await func(self, *args, **kwargs)
+                except (DatabaseError, DALError) as e:
+                    # Connections live in the thread the async ORM runs its queries in
+                    delay = await sync_to_async(_retry_delay)(e, name, attempt) if retry_here else None
+                    if delay is None:
+                        raise
+                await asyncio.sleep(delay)
+                attempt += 1
+        except (ObjectDoesNotExist, DatabaseError) as e:
+            _raise_domain_error(self, func, args, kwargs, e)
+        finally:
+            current_dal_call.reset(token)
+            duration_ms = _slow_duration_ms(started)
+            if duration_ms is not None:
+                # Receivers write to the database, which `asend` does from a thread
+                await slow_dal_call.asend(sender=type(self), name=name, duration_ms=duration_ms)
+
+    return wrapper
+
+
+def _raise_domain_error(repository, func, args: tuple, kwargs: dict, error: Exception) -> NoReturn:
+    if isinstance(error, ObjectDoesNotExist):
+        # Extract identifier from method arguments
+        identifier = args[0] if args else str(kwargs) if kwargs else 'object'
+        raise ObjectNotFoundError(repository.model.__name__, identifier) from None
+    if isinstance(error, IntegrityError):
+        # Database constraint violations (unique, foreign key)
+        logger.error('Database constraint violation in %s', func.__name__, exc_info=error)
+        error_field = 'database'
+        error_message = str(error)
+        raise ValidationError(error_field, error_message) from error
+    # General database errors (connection, syntax, etc.)
+    logger.error('Database error in %s', func.__name__, exc_info=error)
+    error_message = f'Database error: {error!s}'
+    raise DALError(error_message) from error
+
+
+def _slow_duration_ms(started: float) -> float | None:
+    threshold = settings.SLOW_DAL_CALL_THRESHOLD_MS
+    duration_ms = (time.perf_counter() - started) * 1000
+    return duration_ms if threshold is not None and duration_ms >= threshold else None
+
+
+def transient_reason(error: Exception) -> str | None:
+    """Get why `error` is worth retrying ('serialization_failure', 'deadlock' or 'connection'), or `None`."""
+    if isinstance(error, DALError) and isinstance(error.__cause__, DatabaseError):
+        # Translated by a nested repository call
+        error = error.__cause__
+    if not isinstance(error, DatabaseError) or isinstance(error, IntegrityError):
+        return None
+
+    # psycopg 3 names the code `sqlstate`, psycopg2 `pgcode`
+    sqlstate = getattr(error.__cause__, 'sqlstate', None) or getattr(error.__cause__, 'pgcode', None)
+    if sqlstate == SERIALIZATION_FAILURE:
+        return 'serialization_failure'
+    if sqlstate == DEADLOCK_DETECTED:
+        return 'deadlock'
+    if sqlstate is not None:
+        return 'connection' if sqlstate.startswith(CONNECTION_SQLSTATES) else None
+    # Without a code, only a connection that no longer answers counts as dropped
+    if isinstance(error, InterfaceError | OperationalError) and _close_broken_connections():
+        return 'connection'
+    return None
+
+
+def _retry_delay(error: Exception, name: str, attempt: int) -> float | None:
+    """Get how many seconds to wait before retrying after `error`, or `None` to give up."""
+    reason = transient_reason(error)
+    if reason is None:
+        return None
+
+    if any(connection.in_atomic_block for connection in connections.all(initialized_only=True)):
+        # The transaction is already aborted; only whoever opened it can run it again
+        metrics.increment('dal_retry_skipped_total', operation=name, reason=reason)
+        return None
+
+    if attempt >= settings.DAL_RETRY_MAX_ATTEMPTS:
+        metrics.increment('dal_retry_give_ups_total', operation=name, reason=reason)
+        logger.warning('Giving up on %s after %d attempts (%s): %s', name, attempt, reason, error)
+        return None
+
+    if reason == 'connection':
+        _close_broken_connections()
+    # Full jitter: a random delay up to an exponentially growing cap, so retries do not collide again
+    cap_ms = min(settings.DAL_RETRY_MAX_DELAY_MS, settings.DAL_RETRY_BASE_DELAY_MS * 2 ** (attempt - 1))
+    delay_ms = random.uniform(0, cap_ms)  # noqa: S311
+    metrics.increment('dal_retry_attempts_total', operation=name, reason=reason)
+    logger.warning('Retrying %s in %.0f ms after attempt %d (%s): %s', name, delay_ms, attempt, reason, error)
+    return delay_ms / 1000
+
+
+def _close_broken_connections() -> bool:
+    """Close the connections that no longer answer, so the next query reconnects. Returns whether any did."""
+    closed = False
+    for connection in connections.all(initialized_only=True):
+        if connection.connection is not None and not connection.in_atomic_block and not connection.is_usable():
+            with suppress(DatabaseError):
+                connection.close()
+            closed = True
+    return closed
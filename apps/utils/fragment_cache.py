@@ -0,0 +1,109 @@
+"""Versioned cache for rendered template fragments (task rows and project cards)."""
+import time
+from functools import partial
+from typing import TYPE_CHECKING, Any
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.http import HttpRequest, HttpResponse
+from django.shortcuts import render
+from django.template.loader import render_to_string
+
+if TYPE_CHECKING:
+    from django.core.cache.backends.base import BaseCache
+
+# Django's own "no token" sentinel: `{% csrf_token %}` renders nothing, without a warning.
+# Cached fragments are shared between requests, so they must not embed a per-request token;
+# HTMX sends the page's token in the X-CSRFToken header instead.
+CSRF_NOT_PROVIDED = 'NOTPROVIDED'
+
+
+async def arender(
+    request: HttpRequest, template_name: str, context: dict[str, Any] | None = None, status: int | None = None
+) -> HttpResponse:
+    """
+    `render` for async views whose templates use the fragment tags.
+
+    The tags read and fill the cache with blocking calls, which must not run on the event loop
+    (the database backend refuses to), so the template is rendered in a worker thread.
+    """
+    return await sync_to_async(render)(request, template_name, context, status=status)
+
+
+class FragmentCache:
+    """
+    Cache rendered fragments under keys that change whenever their content can change.
+
+    Task rows are keyed on `(task.id, task.updated_at)`. Project cards are keyed on a
+    per-project version number, bumped by the repositories on every write that
+    touches the project or one of its tasks; as that version is not read with the rows,
+    cards must be rendered from rows read on the primary.
+    """
+
+    HITS_KEY = 'fragments:stats:hits'
+    MISSES_KEY = 'fragments:stats:misses'
+
+    def __init__(self, alias: str | None = None):
+        self.alias = alias or settings.FRAGMENT_CACHE_ALIAS
+
+    @property
+    def cache(self) -> 'BaseCache':
+        return caches[self.alias]
+
+    def render(self, key: str, template_name: str, context: dict[str, Any]) -> str:
+        """Return the cached fragment for `key`, rendering and storing it on a miss."""
+        html = self.cache.get(key)
+        if html is not None:
+            self._count(self.HITS_KEY)
+            return html
+
+        self._count(self.MISSES_KEY)
+        html = render_to_string(template_name, {**context, 'csrf_token': CSRF_NOT_PROVIDED})
+        self.cache.set(key, html)
+        return html
+
+    def task_row_key(self, task) -> str:
+        return f'fragments:task_row:{task.id}:{task.updated_at.timestamp()}'
+
+    def project_card_key(self, project) -> str:
+        return f'fragments:project_card:{project.id}:{self.get_project_version(project.id)}'
+
+    def get_project_version(self, project_id: int) -> int:
+        return self.cache.get_or_set(self._version_key(project_id), time.time_ns, timeout=None)
+
+    def bump_project_version(self, project_id: int) -> None:
+        """
+        Invalidate every cached card of a project, once the current transaction (if any) commits.
+
+        Bumping before the commit would let a concurrent request render the rows as they were
+        and cache them under the new version, where they would stay until the next write.
+        """
+        transaction.on_commit(partial(self._bump_project_version, project_id), robust=True)
+
+    def _bump_project_version(self, project_id: int) -> None:
+        try:
+            self.cache.incr(self._version_key(project_id))
+        except ValueError:
+            # Not cached (yet or any more): a fresh time-based version cannot collide with old keys
+            self.cache.set(self._version_key(project_id), time.time_ns(), timeout=None)
+
+    def stats(self) -> dict[str, int]:
+        hits = self.cache.get(self.HITS_KEY, 0)
+        misses = self.cache.get(self.MISSES_KEY, 0)
+        return {'hits': hits, 'misses': misses}
+
+    async def astats(self) -> dict[str, int]:
+        hits = await self.cache.aget(self.HITS_KEY, 0)
+        misses = await self.cache.aget(self.MISSES_KEY, 0)
+        return {'hits': hits, 'misses': misses}
+
+    def _count(self, key: str) -> None:
+        try:
+            self.cache.incr(key)
+        except ValueError:
+            self.cache.add(key, 1, timeout=None)
+
+    def _version_key(self, project_id: int) -> str:
+        return f'fragments:project_version:{project_id}'
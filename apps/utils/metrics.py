@@ -0,0 +1,35 @@
+"""
+In-process counters for operational metrics.
+
+Counters live in the memory of each worker process and start from zero when it starts;
+scrape every worker (or aggregate the logs) for totals.
+"""
+import threading
+from collections import Counter
+
+_lock = threading.Lock()
+_counters: Counter[tuple[str, tuple[tuple[str, str], ...]]] = Counter()
+
+
+def increment(name: str, value: int = 1, **labels: str) -> None:
+    """Add `value` to the counter `name` with the given labels, e.g. `increment('x_total', reason='deadlock')`."""
+    key = (name, tuple(sorted(labels.items())))
+    with _lock:
+        _counters[key] += value
+
+
+def snapshot() -> list[dict]:
+    """Get every counter as `{'name', 'labels', 'value'}`, sorted by name and labels."""
+    with _lock:
+        items = sorted(_counters.items())
+    return [{'name': name, 'labels': dict(labels), 'value': value} for (name, labels), value in items]
+
+
+def get(name: str, **labels: str) -> int:
+    with _lock:
+        return _counters[(name, tuple(sorted(labels.items())))]
+
+
+def reset() -> None:
+    with _lock:
+        _counters.clear()
@@ -0,0 +1,17 @@
+"""View mixins shared by the apps."""
+from django.contrib.auth.mixins import AccessMixin
+
+
+class AsyncLoginRequiredMixin(AccessMixin):
+    """
+    `LoginRequiredMixin` for views whose handlers are all `async def`.
+
+    The user is loaded with `request.auser()` and put on `request.user`, so views,
+    services and templates can read it without touching the database from the event loop.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        request.user = await request.auser()
+        if not request.user.is_authenticated:
+            return self.handle_no_permission()
+        return await super().dispatch(request, *args, **kwargs)
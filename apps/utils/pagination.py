@@ -0,0 +1,94 @@
+"""Keyset (cursor) pagination helpers shared by the repositories."""
+import base64
+import binascii
+import json
+from collections.abc import Iterable, Sequence
+from datetime import datetime
+from typing import Any
+
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Field, Model, Q
+from django.utils import timezone
+
+from apps.utils.exceptions import ValidationError
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode the sort key of the last row on a page into an opaque URL-safe token."""
+    payload = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    raw = json.dumps(payload, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str, ordering: Sequence[str], model: type[Model], **annotations: Field) -> list:
+    """
+    Decode a token produced by `encode_cursor` into the sort key of `ordering` over `model`.
+
+    Each value is converted by the field it sorts on: the model's, or the one given in
+    `annotations` for an annotated name (e.g. `rank=FloatField()`). A tampered cursor is
+    refused here rather than failing in the database.
+    """
+    try:
+        values = _load_values(cursor, len(ordering))
+        return [
+            _to_python(annotations.get(name) or model._meta.get_field(name), value)
+            for name, value in zip((field.lstrip('-') for field in ordering), values, strict=True)
+        ]
+    except (binascii.Error, UnicodeDecodeError, DjangoValidationError, TypeError, ValueError) as error:
+        field = 'cursor'
+        message = 'Invalid pagination cursor'
+        raise ValidationError(field, message) from error
+
+
+def keyset_filter(ordering: Sequence[str], values: Sequence[Any]) -> Q:
+    """
+    Build a filter selecting rows that sort strictly after `values` in `ordering`.
+
+    `ordering` uses the `order_by` notation (`'-created_at'`), and must end with a
+    unique column so that the comparison is total.
+    """
+    condition = Q()
+    for position, field in enumerate(ordering):
+        name = field.lstrip('-')
+        lookup = 'lt' if field.startswith('-') else 'gt'
+        clause = Q(**{f'{name}__{lookup}': values[position]})
+        for previous_field, previous_value in zip(ordering[:position], values[:position], strict=True):
+            clause &= Q(**{previous_field.lstrip('-'): previous_value})
+        condition |= clause
+    return condition
+
+
+def _load_values(cursor: str, size: int) -> list:
+    padded = cursor + '=' * (-len(cursor) % 4)
+    values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError(values)
+    return values
+
+
+def _to_python(field: Field, value: Any) -> Any:
+    # Generated columns convert through the field they store
+    field = getattr(field, 'output_field', field)
+    if value is None or isinstance(value, list | dict):
+        raise ValueError(value)
+    value = field.to_python(value)
+    # e.g. integers out of the column's range
+    field.run_validators(value)
+    if isinstance(value, datetime) and settings.USE_TZ and timezone.is_naive(value):
+        raise ValueError(value)
+    return value
+
+
+def split_page(rows: Iterable, limit: int, ordering: Sequence[str]) -> tuple[list, str | None]:
+    """
+    Cut a `limit + 1` row fetch down to one page.
+
+    Returns the page and the cursor for the next one, or `None` on the last page.
+    """
+    rows = list(rows)
+    if len(rows) <= limit:
+        return rows, None
+
+    page = rows[:limit]
+    return page, encode_cursor([getattr(page[-1], field.lstrip('-')) for field in ordering])
@@ -0,0 +1,106 @@
+"""
+Fractional rank keys for manual ordering.
+
+A key is a base-36 fraction written without its leading `0.` (`'i'` is 18/36). Keys compare
+correctly as plain strings under a bytewise collation, and there is always room for a new
+key between two others, so moving an item rewrites only that item. Keys never end in `'0'`,
+which is what guarantees that room.
+"""
+from collections.abc import Iterator
+
+DIGITS = '0123456789abcdefghijklmnopqrstuvwxyz'
+BASE = len(DIGITS)
+# Keys added at either end of a list step by one unit at this many digits, so a list built
+# by appending stays at three characters for its first ~23k items and grows by three per ~46k after
+END_STEP_WIDTH = 3
+
+
+def key_between(before: str | None, after: str | None) -> str:
+    """
+    Get the shortest key sorting strictly between `before` and `after`.
+
+    `None` stands for the start (`before`) or the end (`after`) of the list.
+    """
+    for key in (before, after):
+        if key is not None and not _is_valid(key):
+            message = f'Invalid rank key: {key!r}'
+            raise ValueError(message)
+    if before is not None and after is not None and before >= after:
+        message = f'Rank keys out of order: {before!r} >= {after!r}'
+        raise ValueError(message)
+
+    if before is not None and after is None:
+        return _step(before, 1)
+    if before is None and after is not None:
+        return _step(after, -1)
+    return _midpoint(before or '', after)
+
+
+def spaced_keys(count: int) -> list[str]:
+    """Get `count` ascending keys of equal, minimal length, spread evenly over the whole range."""
+    return list(iter_spaced_keys(count))
+
+
+def iter_spaced_keys(count: int) -> Iterator[str]:
+    """Yield the keys of `spaced_keys` one at a time, for lists too long to hold in memory."""
+    if count <= 0:
+        return
+
+    length = 1
+    while BASE**length <= count:
+        length += 1
+
+    step = BASE**length // (count + 1)
+    for index in range(count):
+        yield _encode(step * (index + 1), length)
+
+
+def _midpoint(low: str, high: str | None) -> str:
+    if high is not None:
+        # Keep the common prefix, reading missing digits of `low` as zeros
+        prefix = 0
+        while prefix < len(high) and (low[prefix] if prefix < len(low) else '0') == high[prefix]:
+            prefix += 1
+        if prefix:
+            return high[:prefix] + _midpoint(low[prefix:], high[prefix:])
+
+    low_digit = DIGITS.index(low[0]) if low else 0
+    high_digit = DIGITS.index(high[0]) if high is not None else BASE
+    if high_digit - low_digit > 1:
+        return DIGITS[(low_digit + high_digit) // 2]
+
+    # Adjacent first digits: `high`'s first digit alone sorts below `high` if `high` continues
+    if high is not None and len(high) > 1:
+        return high[0]
+
+    return DIGITS[low_digit] + _midpoint(low[1:], None)
+
+
+def _step(key: str, direction: int) -> str:
+    """Move `key` one unit up or down, adding `END_STEP_WIDTH` more digits once a width is used up."""
+    # Round up to whole steps: stripped trailing zeros must not make the next step coarser
+    length = -(-len(key) // END_STEP_WIDTH) * END_STEP_WIDTH
+    value = _decode(key.ljust(length, '0')) + direction
+    if not 0 < value < BASE**length:
+        length += END_STEP_WIDTH
+        value = _decode(key.ljust(length, '0')) + direction
+    return _encode(value, length)
+
+
+def _decode(key: str) -> int:
+    value = 0
+    for char in key:
+        value = value * BASE + DIGITS.index(char)
+    return value
+
+
+def _encode(value: int, length: int) -> str:
+    digits = []
+    for _ in range(length):
+        value, remainder = divmod(value, BASE)
+        digits.append(DIGITS[remainder])
+    return ''.join(reversed(digits)).rstrip('0')
+
+
+def _is_valid(key: str) -> bool:
+    return bool(key) and not key.endswith('0') and all(char in DIGITS for char in key)
@@ -0,0 +1,49 @@
+"""
+Search over `name` columns, shared by the repositories.
+
+On Postgres, a name matches when its words start with every searched term (`tsvector`
+prefix query) or when it is close to the search as typed (`pg_trgm` word similarity, which
+forgives typos); both are served by the GIN indexes of the projects and tasks migrations.
+Other databases fall back to `icontains` on every term, which is only meant for tests.
+"""
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector, TrigramWordSimilarity
+from django.db import connections
+from django.db.models import Case, FloatField, Q, QuerySet, Value, When
+from django.db.models.functions import Cast
+
+SEARCH_CONFIG = 'simple'
+# Most relevant first; the id breaks ties so that keyset pages never overlap
+SEARCH_ORDERING = ('-rank', '-id')
+MAX_TERMS = 8
+
+
+def search_terms(text: str) -> list[str]:
+    """Split a search into lowercase words, dropping punctuation and tsquery operators."""
+    return re.findall(r'\w+', text.lower())[:MAX_TERMS]
+
+
+def search_by_name(queryset: QuerySet, text: str) -> QuerySet:
+    """Narrow `queryset` to rows whose `name` matches `text`, annotated with their relevance as `rank`."""
+    terms = search_terms(text)
+    if not terms:
+        return queryset.annotate(rank=Value(0.0, output_field=FloatField())).none()
+
+    if connections[queryset.db].vendor != 'postgresql':
+        condition = Q()
+        for term in terms:
+            condition &= Q(name__icontains=term)
+        return queryset.filter(condition).annotate(
+            rank=Case(When(name__istartswith=terms[0], then=Value(1.0)), default=Value(0.0), output_field=FloatField())
+        )
+
+    phrase = ' '.join(terms)
+    vector = SearchVector('name', config=SEARCH_CONFIG)
+    query = SearchQuery(' & '.join(f"'{term}':*" for term in terms), search_type='raw', config=SEARCH_CONFIG)
+    return (
+        queryset.alias(search=vector)
+        .filter(Q(search=query) | Q(name__trigram_word_similar=phrase))
+        # ts_rank and similarity are `real`: widen the sum, so the cursor round-trips it exactly
+        .annotate(rank=Cast(SearchRank(vector, query) + TrigramWordSimilarity(phrase, 'name'), FloatField()))
+    )
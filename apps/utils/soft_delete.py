@@ -0,0 +1,13 @@
+"""Soft delete: rows are tombstoned with a `deleted_at` timestamp and purged later, in batches."""
+from django.db import models
+
+
+class SoftDeleteQuerySet(models.QuerySet):
+    """Manager and queryset of models with a nullable `deleted_at` column."""
+
+    def live(self) -> 'SoftDeleteQuerySet':
+        """Rows that are not deleted; the conditions of the models' partial indexes."""
+        return self.filter(deleted_at__isnull=True)
+
+    def deleted(self) -> 'SoftDeleteQuerySet':
+        return self.filter(deleted_at__isnull=False)
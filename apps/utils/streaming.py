@@ -0,0 +1,71 @@
+"""Line-by-line NDJSON and CSV encoding and decoding for streamed exports and imports."""
+import csv
+import json
+from collections.abc import Iterable, Iterator, Sequence
+from datetime import date, datetime
+from typing import Any
+
+NDJSON = 'ndjson'
+CSV = 'csv'
+CONTENT_TYPES = {
+    NDJSON: 'application/x-ndjson',
+    CSV: 'text/csv',
+}
+
+
+class _LineBuffer:
+    """File-like object for `csv.writer` that hands back each row instead of storing it."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def encode_lines(records: Iterable[dict[str, Any]], fmt: str, fields: Sequence[str]) -> Iterator[str]:
+    """
+    Encode `records` one line at a time, so a response or file can be written as it is produced.
+
+    CSV output starts with a header of `fields`; NDJSON lines hold only `fields` too.
+    """
+    if fmt == CSV:
+        writer = csv.writer(_LineBuffer())
+        yield writer.writerow(fields)
+        for record in records:
+            yield writer.writerow([_to_text(record.get(field)) for field in fields])
+        return
+
+    for record in records:
+        yield json.dumps({field: _to_json(record.get(field)) for field in fields}, separators=(',', ':')) + '\n'
+
+
+def decode_lines(lines: Iterable[str], fmt: str) -> Iterator[tuple[int, dict[str, Any] | None]]:
+    """
+    Decode records one line at a time, in the formats written by `encode_lines`.
+
+    Yields `(line_number, record)` pairs; `record` is `None` for a line that cannot be parsed.
+    """
+    if fmt == CSV:
+        reader = csv.DictReader(lines)
+        for record in reader:
+            yield reader.line_num, record
+        return
+
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            record = None
+        yield line_number, record if isinstance(record, dict) else None
+
+
+def _to_json(value: Any) -> Any:
+    if isinstance(value, date | datetime):
+        return value.isoformat()
+    return value
+
+
+def _to_text(value: Any) -> str:
+    if value is None:
+        return ''
+    return str(_to_json(value))
@@ -53,6 +53,7 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'django.contrib.sites',
+    'django.contrib.postgres',  # Trigram lookups used by name search
     # Third party apps
     'allauth',
     'allauth.account',
@@ -60,6 +61,10 @@ INSTALLED_APPS = [
     'apps.accounts',
     'apps.projects',
     'apps.tasks',
+    'apps.benchmarks',
+    'apps.monitoring',
+    'apps.reminders',
+    'apps.jobs',
 ]
 
 # Required for django-allauth
@@ -88,6 +93,9 @@ LOGIN_REDIRECT_URL = '/'
 LOGOUT_REDIRECT_URL = '/'
 
 MIDDLEWARE = [
+    'apps.middleware.RequestProfilingMiddleware',  # No-op unless REQUEST_PROFILING_ENABLED
+    'apps.monitoring.middleware.SlowRequestMiddleware',  # No-op unless a SLOW_*_THRESHOLD_MS is set
+    'apps.middleware.ReplicaStickinessMiddleware',  # No-op without DATABASE_REPLICA_URLS
     'apps.middleware.ExceptionHandlerMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -127,8 +135,146 @@ DATA_UPLOAD_MAX_NUMBER_FIELDS = 5000
 DATABASES = {
     'default': env.db('DATABASE_URL'),
 }
+# Connection reuse. With DB_POOL each process keeps a pool of connections (Django's native pooling, psycopg 3
+# only), which replaces persistent connections. Otherwise a connection is kept for DB_CONN_MAX_AGE seconds
+# (0 closes it after every request) and checked before being reused when DB_CONN_HEALTH_CHECKS is on.
+DB_POOL = env.bool('DB_POOL', default=False)
+DATABASES['default']['CONN_MAX_AGE'] = 0 if DB_POOL else env.int('DB_CONN_MAX_AGE', default=60)
+DATABASES['default']['CONN_HEALTH_CHECKS'] = env.bool('DB_CONN_HEALTH_CHECKS', default=True)
+if DATABASES['default']['ENGINE'] == 'django.db.backends.postgresql':
+    db_options = DATABASES['default'].setdefault('OPTIONS', {})
+    db_options.setdefault('connect_timeout', env.int('DB_CONNECT_TIMEOUT', default=5))
+    # Server-side cap on any one statement, in ms (0 = none). Long migrations or commands may need it lifted.
+    DB_STATEMENT_TIMEOUT_MS = env.int('DB_STATEMENT_TIMEOUT_MS', default=0)
+    if DB_STATEMENT_TIMEOUT_MS:
+        db_options['options'] = f'-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}'
+    if DB_POOL:
+        db_options['pool'] = {
+            'min_size': env.int('DB_POOL_MIN_SIZE', default=2),
+            'max_size': env.int('DB_POOL_MAX_SIZE', default=10),
+            # Seconds a request waits for a free connection before failing
+            'timeout': env.float('DB_POOL_TIMEOUT', default=10),
+            'max_idle': env.float('DB_POOL_MAX_IDLE', default=300),
+            'max_lifetime': env.float('DB_POOL_MAX_LIFETIME', default=3600),
+        }
+# Read replicas (DATABASE_REPLICA_URLS, comma-separated). Reads of projects and tasks go to a random replica,
+# except in transactions, in requests that write, and for REPLICA_STICKY_SECONDS after a user's own write
+# (`ReplicaStickinessMiddleware`). In tests each replica mirrors the default database.
+DATABASE_REPLICAS = []
+for replica_index, replica_url in enumerate(env.list('DATABASE_REPLICA_URLS', default=[]), start=1):
+    replica = env.db_url_config(replica_url)
+    replica['OPTIONS'] = {**DATABASES['default'].get('OPTIONS', {}), **replica.get('OPTIONS', {})}
+    replica['CONN_MAX_AGE'] = DATABASES['default']['CONN_MAX_AGE']
+    replica['CONN_HEALTH_CHECKS'] = DATABASES['default']['CONN_HEALTH_CHECKS']
+    replica['TEST'] = {'MIRROR': 'default'}
+    DATABASES[f'replica{replica_index}'] = replica
+    DATABASE_REPLICAS.append(f'replica{replica_index}')
+DATABASE_ROUTERS = ['apps.utils.db_router.ReplicaRouter']
+REPLICA_STICKY_SECONDS = env.int('REPLICA_STICKY_SECONDS', default=10)
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+FRAGMENT_CACHE_ALIAS = 'fragments'
+
+CACHES = {
+    'default': env.cache('CACHE_URL', default='locmemcache://'),
+    # Rendered task rows and project cards; eviction is bounded by MAX_ENTRIES (locmem, file, db)
+    # or by the server's own policy (redis, memcached)
+    FRAGMENT_CACHE_ALIAS: env.cache('FRAGMENT_CACHE_URL', default='locmemcache://fragments'),
+}
+CACHES[FRAGMENT_CACHE_ALIAS]['TIMEOUT'] = env.int('FRAGMENT_CACHE_TIMEOUT', default=60 * 60)
+if CACHES[FRAGMENT_CACHE_ALIAS]['BACKEND'].rsplit('.', 2)[-2] in {'locmem', 'filebased', 'db'}:
+    CACHES[FRAGMENT_CACHE_ALIAS].setdefault('OPTIONS', {})['MAX_ENTRIES'] = env.int(
+        'FRAGMENT_CACHE_MAX_ENTRIES', default=10000
+    )
+
+# Dashboard pagination
+DASHBOARD_PROJECTS_PAGE_SIZE = env.int('DASHBOARD_PROJECTS_PAGE_SIZE', default=10)
+PROJECT_TASKS_PAGE_SIZE = env.int('PROJECT_TASKS_PAGE_SIZE', default=20)
+
+# Search-as-you-type: results per page and kind, and the shortest search that is run
+SEARCH_PAGE_SIZE = env.int('SEARCH_PAGE_SIZE', default=10)
+SEARCH_MIN_QUERY_LENGTH = env.int('SEARCH_MIN_QUERY_LENGTH', default=2)
+
+# Manual task order: `rebalance_task_positions` rewrites a project's keys once one grows past this length
+TASK_POSITION_MAX_LENGTH = env.int('TASK_POSITION_MAX_LENGTH', default=32)
+
+# Largest selection accepted by one bulk task operation
+TASK_BULK_MAX_SIZE = env.int('TASK_BULK_MAX_SIZE', default=1000)
+
+# Rows fetched per server-side cursor round trip by the streaming export
+EXPORT_CHUNK_SIZE = env.int('EXPORT_CHUNK_SIZE', default=2000)
+
+# Task import: rows inserted per batch (one transaction each), and whether Postgres COPY may replace INSERT
+TASK_IMPORT_BATCH_SIZE = env.int('TASK_IMPORT_BATCH_SIZE', default=1000)
+TASK_IMPORT_USE_COPY = env.bool('TASK_IMPORT_USE_COPY', default=True)
+
+# Benchmarks (`run_benchmarks`): stored results, and how far each metric may exceed its baseline (as a ratio)
+BENCHMARK_BASELINES_PATH = Path(
+    env('BENCHMARK_BASELINES_PATH', default=str(BASE_DIR / 'apps' / 'benchmarks' / 'baselines.json'))
+)
+BENCHMARK_THRESHOLDS = {
+    'p50_ms': env.float('BENCHMARK_P50_THRESHOLD', default=1.25),
+    'p95_ms': env.float('BENCHMARK_P95_THRESHOLD', default=1.5),
+    'queries': env.float('BENCHMARK_QUERIES_THRESHOLD', default=1.0),
+    'rows': env.float('BENCHMARK_ROWS_THRESHOLD', default=1.1),
+    'peak_kib': env.float('BENCHMARK_MEMORY_THRESHOLD', default=1.25),
+}
+
+# Request profiling: Server-Timing header and one log line per request, plus a warning for any
+# statement repeated this many times in one request (an N+1 pattern)
+REQUEST_PROFILING_ENABLED = env.bool('REQUEST_PROFILING_ENABLED', default=False)
+REQUEST_PROFILING_DUPLICATE_THRESHOLD = env.int('REQUEST_PROFILING_DUPLICATE_THRESHOLD', default=5)
+
+# Slow operation capture (`apps.monitoring`, viewed in the admin). A threshold left unset turns that capture off.
+# Statement parameters are stored as-is, so the records can hold user data.
+SLOW_QUERY_THRESHOLD_MS = env.float('SLOW_QUERY_THRESHOLD_MS', default=None)
+SLOW_DAL_CALL_THRESHOLD_MS = env.float('SLOW_DAL_CALL_THRESHOLD_MS', default=None)
+SLOW_REQUEST_THRESHOLD_MS = env.float('SLOW_REQUEST_THRESHOLD_MS', default=None)
+# Share of slow statements re-run under EXPLAIN (Postgres only; ANALYZE is used for SELECTs alone)
+SLOW_QUERY_EXPLAIN_SAMPLE_RATE = env.float('SLOW_QUERY_EXPLAIN_SAMPLE_RATE', default=0.0)
+# Records kept: older ones are deleted each time another tenth of this many has arrived
+SLOW_QUERY_BUFFER_SIZE = env.int('SLOW_QUERY_BUFFER_SIZE', default=500)
+
+# Retries of idempotent repository calls failing with a serialization failure, deadlock or dropped connection:
+# total attempts, and the cap of the jittered delay before retry n (base * 2**(n-1), at most the max)
+DAL_RETRY_MAX_ATTEMPTS = env.int('DAL_RETRY_MAX_ATTEMPTS', default=3)
+DAL_RETRY_BASE_DELAY_MS = env.float('DAL_RETRY_BASE_DELAY_MS', default=25)
+DAL_RETRY_MAX_DELAY_MS = env.float('DAL_RETRY_MAX_DELAY_MS', default=1000)
+
+# Deadline reminders (`run_reminder_worker`): "upcoming" REMINDER_LEAD_MINUTES before a deadline, "overdue" once it
+# has passed, skipping deadlines more than REMINDER_MAX_LATENESS_MINUTES old after downtime. Both windows are scanned
+# REMINDER_BATCH_SIZE tasks per transaction, every REMINDER_POLL_SECONDS.
+REMINDER_SINK = env('REMINDER_SINK', default='apps.reminders.sinks.EmailSink')
+REMINDER_LEAD_MINUTES = env.int('REMINDER_LEAD_MINUTES', default=60)
+REMINDER_MAX_LATENESS_MINUTES = env.int('REMINDER_MAX_LATENESS_MINUTES', default=60)
+REMINDER_BATCH_SIZE = env.int('REMINDER_BATCH_SIZE', default=100)
+REMINDER_POLL_SECONDS = env.float('REMINDER_POLL_SECONDS', default=30)
+EMAIL_BACKEND = env('EMAIL_BACKEND', default='django.core.mail.backends.smtp.EmailBackend')
+DEFAULT_FROM_EMAIL = env('DEFAULT_FROM_EMAIL', default='Task Flow <noreply@localhost>')
+
+# Background jobs (`run_job_worker`): a claimed job is leased for JOB_LEASE_SECONDS, extended every third of that
+# while it runs; workers take back expired leases every JOB_REQUEUE_INTERVAL_SECONDS. Failed runs are retried after
+# JOB_RETRY_BASE_DELAY_SECONDS * 2**(attempt-1), up to JOB_MAX_ATTEMPTS attempts. JOB_CONCURRENCY_LIMITS caps
+# running jobs per kind, as "kind=limit;kind=limit".
+# Idle workers poll every JOB_POLL_SECONDS and delete finished jobs after JOB_RETENTION_HOURS.
+JOB_LEASE_SECONDS = env.int('JOB_LEASE_SECONDS', default=600)
+JOB_REQUEUE_INTERVAL_SECONDS = env.float('JOB_REQUEUE_INTERVAL_SECONDS', default=60)
+JOB_RETRY_BASE_DELAY_SECONDS = env.float('JOB_RETRY_BASE_DELAY_SECONDS', default=10)
+JOB_MAX_ATTEMPTS = env.int('JOB_MAX_ATTEMPTS', default=3)
+JOB_CONCURRENCY_LIMITS = env.dict('JOB_CONCURRENCY_LIMITS', cast={'value': int}, default={})
+JOB_POLL_SECONDS = env.float('JOB_POLL_SECONDS', default=2)
+JOB_RETENTION_HOURS = env.int('JOB_RETENTION_HOURS', default=72)
+# How often HTMX polls a job's status
+JOB_STATUS_POLL_SECONDS = env.int('JOB_STATUS_POLL_SECONDS', default=2)
+
+# Soft delete: deleted projects and tasks can be restored for SOFT_DELETE_RETENTION_HOURS, then
+# `purge_deleted` removes them, PURGE_BATCH_SIZE rows per transaction
+SOFT_DELETE_RETENTION_HOURS = env.int('SOFT_DELETE_RETENTION_HOURS', default=72)
+PURGE_BATCH_SIZE = env.int('PURGE_BATCH_SIZE', default=1000)
+
 # Custom User Model
 AUTH_USER_MODEL = 'accounts.User'
 